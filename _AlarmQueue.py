@@ -0,0 +1,168 @@
+"""
+Module containing the queue of alarms the clocks check on every tick.
+"""
+
+
+# STDLIB IMPORTS
+from heapq import heappop, heappush
+from itertools import count
+
+
+class Alarm(object):
+    """
+    Alarm which fires once at a time, or repeatedly at an interval.
+    """
+
+    def __init__(self, time, label=None, repeat=None):
+        """
+        Instantiate an instance of Alarm.
+
+        @type time: datetime.datetime
+        @param time: Time the alarm first fires.
+
+        @type label: str
+        @param label: Description of the alarm.
+            DEFAULT: None
+
+        @type repeat: datetime.timedelta
+        @param repeat: Interval the alarm fires again at, or None to
+            fire once.
+            DEFAULT: None
+        """
+        self.time = time
+        self.label = label
+        self.repeat = repeat
+        self.cancelled = False
+
+    def __repr__(self):
+        """
+        Return a representation of the alarm, for debugging.
+
+        @rtype: str
+        """
+        return "Alarm(%r, label=%r, repeat=%r)" % (self.time, self.label,
+                                                  self.repeat)
+
+
+class AlarmQueue(object):
+    """
+    Priority queue of alarms, ordered by the time each fires next.
+
+    Only the head of the queue is looked at to find out whether any
+    alarms are due, so checking on every tick costs the same however
+    many alarms there are. Cancelled alarms are left in the queue and
+    dropped once they reach the head.
+    """
+
+    def __init__(self):
+        """
+        Instantiate an instance of AlarmQueue.
+        """
+        # heap of (time, order added, alarm); the order breaks ties
+        # between alarms due at the same time, as alarms can not be
+        # compared.
+        self._heap = []
+        self._order = count()
+
+    def __len__(self):
+        """
+        Return the number of alarms in the queue, including any which
+        have been cancelled but not yet dropped.
+
+        @rtype: int
+        """
+        return len(self._heap)
+
+    def add(self, time, label=None, repeat=None):
+        """
+        Add an alarm to the queue.
+
+        @type time: datetime.datetime
+        @param time: Time the alarm first fires.
+
+        @type label: str
+        @param label: Description of the alarm.
+            DEFAULT: None
+
+        @type repeat: datetime.timedelta
+        @param repeat: Interval the alarm fires again at, or None to
+            fire once.
+            DEFAULT: None
+
+        @rtype: Alarm
+        @return: The alarm, which can be passed to cancel.
+        """
+        alarm = Alarm(time=time, label=label, repeat=repeat)
+        self._push(alarm=alarm)
+
+        return alarm
+
+    def cancel(self, alarm):
+        """
+        Cancel an alarm so that it never fires again.
+
+        @type alarm: Alarm
+        @param alarm: Alarm returned by add.
+        """
+        alarm.cancelled = True
+
+    def get_next_time(self):
+        """
+        Return the time the next alarm fires.
+
+        @rtype: datetime.datetime
+        @return: Time of the next alarm, or None if there are none.
+        """
+        self._drop_cancelled()
+
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now):
+        """
+        Remove and return the alarms which are due, rescheduling those
+        which repeat.
+
+        A repeating alarm fires once however many of its repeats have
+        passed since the last check, and is rescheduled for its first
+        repeat after now.
+
+        @type now: datetime.datetime
+        @param now: Current time.
+
+        @rtype: [Alarm]
+        @return: Alarms which are due, in the order they were due.
+        """
+        due = []
+
+        self._drop_cancelled()
+        while self._heap and self._heap[0][0] <= now:
+            alarm = heappop(self._heap)[2]
+            due.append(alarm)
+
+            if alarm.repeat:
+                # skip straight to the first repeat after now, rather
+                # than stepping through every one which was missed.
+                missed = (now - alarm.time).total_seconds() // \
+                    alarm.repeat.total_seconds()
+                alarm.time += alarm.repeat * int(missed + 1)
+                self._push(alarm=alarm)
+
+            self._drop_cancelled()
+
+        return due
+
+    def _push(self, alarm):
+        """
+        Push an alarm on to the heap at the time it fires next.
+
+        @type alarm: Alarm
+        @param alarm: Alarm to push.
+        """
+        heappush(self._heap, (alarm.time, next(self._order), alarm))
+
+    def _drop_cancelled(self):
+        """
+        Drop any cancelled alarms from the head of the queue.
+        """
+        while self._heap and self._heap[0][2].cancelled:
+            heappop(self._heap)
@@ -0,0 +1,316 @@
+"""
+Module containing the face of the analogue clock.
+"""
+
+
+# STDLIB IMPORTS
+from math import cos, pi, sin
+
+# LOCAL IMPORTS
+from _BaseFace import BaseFace
+
+
+class AnalogueFace(BaseFace):
+    """
+    Class implementing the face of the analogue clock.
+    """
+
+    # length of the hour, minute and second hands as a proportion of
+    # the radius of the clock face.
+    _HAND_LENGTHS = (0.5, 0.75, 0.75)
+
+    # padding added around the area swept by a hand when working out
+    # which part of the canvas to redraw. Large enough to cover the
+    # width of the hour hand and the circle where the hands meet.
+    _DAMAGE_PADDING = 8
+
+    # the clock face never changes between ticks, so it is rendered
+    # once per size on to an offscreen surface.
+    _face_surface = None
+    _face_size = None
+
+    # whether the hands sweep smoothly, positioned from the fraction of
+    # the time, rather than jumping once a second and minute.
+    _sweep = False
+
+    def set_sweep(self, sweep):
+        """
+        Set whether the hands sweep smoothly round the face. The clock
+        needs to be drawn many times a second for the sweep to be
+        visible.
+
+        @type sweep: bool
+        @param sweep: If True, position the hands from the fractional
+            time, else from the whole seconds and minutes.
+        """
+        self._sweep = sweep
+
+    def copy_settings(self, face):
+        """
+        Make another analogue face display everything as this one does,
+        including whether its hands sweep.
+
+        @type face: AnalogueFace
+        @param face: Face to copy the settings to.
+        """
+        super(AnalogueFace, self).copy_settings(face=face)
+        face.set_sweep(sweep=self._sweep)
+
+    def _draw_clock(self):
+        """
+        Draw the clock.
+        """
+        self._center_x, self._center_y, self._radius, \
+            self._hand_lengths = self._get_layout()
+
+        # only render the clock face again if the face has been resized
+        # since it was last rendered.
+        face_size = (self._width, self._height)
+        if self._face_size != face_size:
+            self._face_surface = self._render_offscreen(
+                width=self._width, height=self._height,
+                draw_func=self._draw_clock_face)
+            self._face_size = face_size
+
+        self._context.set_source_surface(self._face_surface, 0, 0)
+        self._context.paint()
+
+        # painting the face leaves it as the source, so reset the
+        # colour before drawing the hands.
+        self._context.set_source_rgb(0, 0, 0)
+        self._draw_hands()
+
+    def _compute_layout(self, width, height):
+        """
+        Work out the center point and radius of the clock face, and the
+        length of each hand, for a size.
+
+        @type width: int
+        @param width: Width to lay the face out for.
+
+        @type height: int
+        @param height: Height to lay the face out for.
+
+        @rtype: (float, float, float, (float, float, float))
+        @return: Tuple containing the center point along the X and Y
+            axis, the radius of the clock face and the length of the
+            hour, minute and second hands.
+        """
+        # get the center point of the face.
+        center_x = width / 2.0
+        center_y = height / 2.0
+
+        # ensure the circle remains a circle when resizing the face,
+        # with about a 5 pixel padding from any edge.
+        radius = max(min(center_x, center_y) - 5, 1)
+
+        return (center_x, center_y, radius,
+                tuple(radius * length for length in self._HAND_LENGTHS))
+
+    def _get_hand_angles(self, time):
+        """
+        Return the angle of each of the hands for a particular time.
+
+        @type time: datetime.datetime
+        @param time: Time to get the angle of the hands for.
+
+        @rtype: (float, float, float)
+        @return: Angle, in radians clockwise from 12 o'clock, of the
+            hour, minute and second hands.
+        """
+        minute = time.minute
+        second = time.second
+
+        # when sweeping, each hand also moves by the fraction of its
+        # unit which has passed.
+        if self._sweep:
+            second += time.microsecond / 1e6
+            minute += second / 60.0
+
+        # the hour hand is rotated 30 degrees (pi/6 r) per hour + 1/2 a
+        # degree (pi/360) per minute. The minute and second hands are
+        # rotated 6 degrees (pi/30 r) per minute and second.
+        return (pi / 6 * time.hour + pi / 360 * minute,
+                pi / 30 * minute,
+                pi / 30 * second)
+
+    def get_visible_state(self, time):
+        """
+        Return the positions of the hands for a particular time.
+
+        @type time: datetime.datetime
+        @param time: Time to get the visible state for.
+
+        @rtype: (int, int, int, int)
+        @return: Hour on a 12 hour clock, minute, second, or None if the
+            second hand is hidden, and microsecond, or None unless the
+            hands sweep.
+        """
+        return (time.hour % 12, time.minute,
+                time.second if self._show_seconds else None,
+                time.microsecond if self._sweep else None)
+
+    def _get_damaged_areas(self, previous_time, current_time):
+        """
+        Return the areas swept by the hands which have moved between
+        previous_time and current_time.
+
+        @type previous_time: datetime.datetime
+        @param previous_time: Time which is currently displayed.
+
+        @type current_time: datetime.datetime
+        @param current_time: Time which is about to be displayed.
+
+        @rtype: [(int, int, int, int)]
+        @return: List of (x, y, width, height) tuples detailing the
+            areas to redraw.
+        """
+        center_x, center_y, _, hand_lengths = self._get_layout()
+        padding = self._DAMAGE_PADDING
+
+        hands = list(zip(hand_lengths,
+                         self._get_hand_angles(previous_time),
+                         self._get_hand_angles(current_time)))
+
+        # without the second hand only the hour and minute hands move.
+        if not self._show_seconds:
+            hands = hands[:2]
+
+        damaged_areas = []
+        for length, previous_angle, current_angle in hands:
+            if previous_angle == current_angle:
+                continue
+
+            # the area to redraw is the box bounding the center point
+            # and the tips of the hand in its old and new positions.
+            x_points = [center_x]
+            y_points = [center_y]
+            for angle in (previous_angle, current_angle):
+                x_points.append(center_x + length * sin(angle))
+                y_points.append(center_y + length * -cos(angle))
+
+            x_pos = int(min(x_points)) - padding
+            y_pos = int(min(y_points)) - padding
+            damaged_areas.append(
+                (x_pos, y_pos,
+                 int(max(x_points)) + padding - x_pos + 1,
+                 int(max(y_points)) + padding - y_pos + 1))
+
+        return damaged_areas
+
+    def _draw_clock_face(self):
+        """
+        Draw the clock face.
+        """
+        # clock background
+        #
+        self._context.arc(self._center_x, self._center_y, self._radius,
+                          0, 2 * pi)
+        # main circle
+        self._context.set_source_rgb(1, 1, 1)
+        self._context.fill_preserve()
+        # circle outline
+        self._context.set_source_rgb(0, 0, 0)
+        self._context.stroke()
+
+        # draw the hour ticks
+        for tick in range(12):
+            self._context.save()
+
+            # if the tick falls on a quarter, extend the line slightly.
+            if tick % 3 == 0:
+                # accentuate the quarter lines by making them slightly
+                # wider (thicker) than the others and changing the
+                # colour of the line.
+                self._context.set_line_width(4)
+                self._context.set_source_rgb(0.7, 0.2, 0.0)
+                inset = 0.2 * self._radius
+            else:
+                inset = 0.1 * self._radius
+
+            self._context.move_to(self._center_x + (self._radius - inset) * cos(tick * pi / 6),
+                                  self._center_y + (self._radius - inset) * sin(tick * pi / 6))
+            self._context.line_to(self._center_x + self._radius * cos(tick * pi / 6),
+                                  self._center_y + self._radius * sin(tick * pi / 6))
+            self._context.stroke()
+            self._context.restore()
+
+    def _draw_hands(self):
+        """
+        Draw the hands of the clock.
+        """
+        # get the hour, minute and second from the time instance
+        # variable.
+        self._draw_hour_hand()
+        self._draw_minute_hand()
+
+        if self._show_seconds:
+            self._draw_second_hand()
+
+        self._draw_hub()
+
+    def _draw_hour_hand(self):
+        """
+        Draw the hour hand.
+        """
+        angle = self._get_hand_angles(self._time)[0]
+        length = self._hand_lengths[0]
+
+        self._context.save()
+        self._context.set_line_width(2.5 * self._context.get_line_width())
+
+        # move cursor to the center of the drawing area in preparation
+        # to draw the hour hand.
+        self._context.move_to(self._center_x, self._center_y)
+        # draw the how hand.
+        self._context.line_to(self._center_x + length * sin(angle),
+                              self._center_y + length * -cos(angle))
+        self._context.stroke()
+        self._context.restore()
+
+    def _draw_minute_hand(self):
+        """
+        Draw the minute hand.
+        """
+        angle = self._get_hand_angles(self._time)[1]
+        length = self._hand_lengths[1]
+
+        self._context.save()
+        self._context.move_to(self._center_x, self._center_y)
+
+        self._context.line_to(self._center_x + length * sin(angle),
+                              self._center_y + length * -cos(angle))
+
+        self._context.stroke()
+        self._context.restore()
+
+    def _draw_second_hand(self):
+        """
+        Draw the second hand.
+        """
+        angle = self._get_hand_angles(self._time)[2]
+        length = self._hand_lengths[2]
+
+        self._context.save()
+
+        # differentiate the second hand from the minute hand by
+        # changing the colour of the line.
+        self._context.set_source_rgb(1.0, 0.0, 0.0)
+
+        self._context.move_to(self._center_x, self._center_y)
+
+        self._context.line_to(self._center_x + length * sin(angle),
+                              self._center_y + length * -cos(angle))
+
+        self._context.stroke()
+        self._context.restore()
+
+    def _draw_hub(self):
+        """
+        Draw a circle to cover up the point where all hands meet.
+        """
+        self._context.set_source_rgb(1.0, 0.0, 0.0)
+        self._context.arc(self._center_x, self._center_y, 5,
+                          0, 2 * pi)
+        self._context.fill_preserve()
+        self._context.stroke()
@@ -0,0 +1,293 @@
+"""
+Module containing the base class for the faces of the PyClock, i.e. the
+code which draws each of the clock interfaces.
+
+Faces only depend on cairo, so they can draw on to any cairo context;
+whether that belongs to a window or to an offscreen surface.
+"""
+
+
+# STDLIB IMPORTS
+from datetime import datetime
+from math import ceil, floor
+
+# THIRD PARTY IMPORTS
+from cairo import CONTENT_COLOR_ALPHA, Context
+
+
+class BaseFace(object):
+    """
+    Base class for the faces of the PyClock.
+    """
+
+    # size the face is designed to be drawn at.
+    _DEFAULT_WIDTH = 230
+    _DEFAULT_HEIGHT = 230
+
+    # colour of the LEDs, for those faces which have them. Red by
+    # default.
+    _led_red = 1.0
+    _led_green = 0.0
+    _led_blue = 0.0
+
+    # whether the seconds are displayed.
+    _show_seconds = True
+
+    # geometry of the face for the size it was last laid out at, as
+    # returned by _compute_layout.
+    _layout = None
+    _layout_size = None
+
+    def __init__(self):
+        """
+        Instantiate an instance of BaseFace.
+        """
+        super(BaseFace, self).__init__()
+
+        self._time = datetime.now()
+        self._context = None
+        self._width = self._DEFAULT_WIDTH
+        self._height = self._DEFAULT_HEIGHT
+
+    def set_led_colour(self, red, green, blue):
+        """
+        Set the colour of the LEDs.
+
+        @type red: float
+        @param red: Red component of the colour, between 0 and 1.
+
+        @type green: float
+        @param green: Green component of the colour, between 0 and 1.
+
+        @type blue: float
+        @param blue: Blue component of the colour, between 0 and 1.
+        """
+        self._led_red = red
+        self._led_green = green
+        self._led_blue = blue
+
+    def get_led_colour(self):
+        """
+        Return the colour of the LEDs.
+
+        @rtype: (float, float, float)
+        @return: Red, green and blue components, between 0 and 1.
+        """
+        return self._led_red, self._led_green, self._led_blue
+
+    def is_seconds_visible(self):
+        """
+        Return whether the seconds are displayed.
+
+        @rtype: bool
+        """
+        return self._show_seconds
+
+    def set_seconds_visible(self, visible):
+        """
+        Show or hide the seconds.
+
+        @type visible: bool
+        @param visible: If True, show the seconds.
+        """
+        self._show_seconds = visible
+
+    def set_size(self, width, height):
+        """
+        Set the size the face is drawn at, laying it out again if the
+        size has changed.
+
+        @type width: int
+        @param width: Width of the area to draw the face in.
+
+        @type height: int
+        @param height: Height of the area to draw the face in.
+        """
+        self._width = width
+        self._height = height
+        self._get_layout()
+
+    def copy_settings(self, face):
+        """
+        Make another face of the same class display everything as this
+        one does. The other face keeps its own caches, so the two can be
+        drawn at different sizes, on to different targets, without
+        throwing away each other's.
+
+        @type face: BaseFace
+        @param face: Face to copy the settings to.
+        """
+        face.set_led_colour(red=self._led_red, green=self._led_green,
+                            blue=self._led_blue)
+        face.set_seconds_visible(visible=self._show_seconds)
+
+    def render(self, context, time, width, height):
+        """
+        Draw the face on to a cairo context.
+
+        @type context: cairo.Context
+        @param context: Context to draw on to.
+
+        @type time: datetime.datetime
+        @param time: Time to display.
+
+        @type width: int
+        @param width: Width of the area to draw the face in.
+
+        @type height: int
+        @param height: Height of the area to draw the face in.
+        """
+        self._context = context
+        self._time = time
+        self.set_size(width=width, height=height)
+
+        self._draw_clock()
+
+    def get_visible_state(self, time):
+        """
+        Return what the face displays for a particular time. Two times
+        with the same visible state are drawn identically.
+
+        By default this is the time itself. Inheriting classes should
+        override this to return only what they display of the time.
+
+        @type time: datetime.datetime
+        @param time: Time to get the visible state for.
+
+        @rtype: tuple
+        """
+        return time.timetuple()[:6] + (time.microsecond, self._show_seconds)
+
+    def _draw_clock(self):
+        """
+        Draw the clock.
+
+        NEEDS IMPLEMENTING IN THE INHERITING CLASS.
+        """
+        raise NotImplementedError
+
+    def _get_layout(self):
+        """
+        Return the layout of the face for its current size, only working
+        it out again when the size has changed.
+
+        @rtype: object
+        @return: Layout as returned by _compute_layout.
+        """
+        size = (self._width, self._height)
+
+        if self._layout_size != size:
+            self._layout = self._compute_layout(width=self._width,
+                                                height=self._height)
+            self._layout_size = size
+
+        return self._layout
+
+    def _compute_layout(self, width, height):
+        """
+        Work out the geometry of the face for a size. Only called when
+        the size changes, so anything which depends on the size alone
+        should be worked out here rather than when drawing.
+
+        By default the face is drawn at its default size, scaled to fit
+        the size whilst keeping its aspect ratio and centered, i.e. the
+        transform used by _transform_to_layout and _transform_area.
+
+        @type width: int
+        @param width: Width to lay the face out for.
+
+        @type height: int
+        @param height: Height to lay the face out for.
+
+        @rtype: (float, float, float)
+        @return: Scale and the X and Y offset to draw the face at.
+        """
+        scale = min(float(width) / self._DEFAULT_WIDTH,
+                    float(height) / self._DEFAULT_HEIGHT)
+
+        return (scale, (width - self._DEFAULT_WIDTH * scale) / 2,
+                (height - self._DEFAULT_HEIGHT * scale) / 2)
+
+    def _transform_to_layout(self):
+        """
+        Transform the context so that the face can be drawn at its
+        default size and appear at the scale and offset of the default
+        layout.
+        """
+        scale, x_offset, y_offset = self._get_layout()
+
+        self._context.translate(x_offset, y_offset)
+        self._context.scale(scale, scale)
+
+    def _transform_area(self, x_pos, y_pos, width, height):
+        """
+        Transform an area of the face at its default size in to the
+        area it covers in the default layout, rounded out to whole
+        pixels.
+
+        @rtype: (int, int, int, int)
+        @return: Tuple of (x, y, width, height).
+        """
+        scale, x_offset, y_offset = self._get_layout()
+
+        left = int(floor(x_pos * scale + x_offset))
+        top = int(floor(y_pos * scale + y_offset))
+
+        return (left, top,
+                int(ceil((x_pos + width) * scale + x_offset)) - left,
+                int(ceil((y_pos + height) * scale + y_offset)) - top)
+
+    def _get_damaged_areas(self, previous_time, current_time):
+        """
+        Return the areas of the face which need redrawing because the
+        time has changed.
+
+        By default the whole face is reported as damaged. Inheriting
+        classes should override this to report only the areas affected
+        by the time fields which differ between the two times.
+
+        @type previous_time: datetime.datetime
+        @param previous_time: Time which is currently displayed.
+
+        @type current_time: datetime.datetime
+        @param current_time: Time which is about to be displayed.
+
+        @rtype: [(int, int, int, int)]
+        @return: List of (x, y, width, height) tuples detailing the
+            areas to redraw.
+        """
+        return [(0, 0, self._width, self._height)]
+
+    def _render_offscreen(self, width, height, draw_func, *args, **kwargs):
+        """
+        Render part of the clock on to an offscreen surface so that it
+        can be painted on to the canvas repeatedly without being redrawn.
+
+        Whilst draw_func is running the _context instance variable is
+        pointed at the offscreen surface, so any of the existing draw
+        methods can be used to populate it.
+
+        @type width: int
+        @param width: Width of the offscreen surface.
+
+        @type height: int
+        @param height: Height of the offscreen surface.
+
+        @type draw_func: callable
+        @param draw_func: Method used to draw on to the offscreen
+            surface. Any further arguments are passed to it.
+
+        @rtype: cairo.Surface
+        @return: Surface containing the rendered drawing.
+        """
+        surface = self._context.get_target().create_similar(
+            CONTENT_COLOR_ALPHA, int(width), int(height))
+
+        context = self._context
+        self._context = Context(surface)
+        try:
+            draw_func(*args, **kwargs)
+        finally:
+            self._context = context
+
+        return surface
@@ -1,24 +1,62 @@
 """
 Module containing the base class for the PyClock and its various
 interfaces.
+
+The base class provides the window the clock is displayed in and the
+timer which keeps it ticking, the drawing itself is done by the face
+each interface inherits from.
 """
 
 
 # STDLIB IMPORTS
-from datetime import datetime
+import logging
+from math import ceil
+import os
+from subprocess import Popen
+from timeit import default_timer
 
 # THIRD PARTY IMPORTS
-from gobject import timeout_add
+from gobject import IO_IN, io_add_watch, source_remove, timeout_add
 from gtk import DrawingArea, main_quit, WIN_POS_CENTER, Window
-from gtk.gdk import Rectangle
+from gtk.gdk import (Rectangle, Region, VISIBILITY_FULLY_OBSCURED,
+                     VISIBILITY_NOTIFY_MASK, WINDOW_STATE_ICONIFIED)
+
+# LOCAL IMPORTS
+from _AlarmQueue import AlarmQueue
+from _BaseFace import BaseFace
+from displaylist import FrameRecorder
+from _FrameScheduler import FrameScheduler
+from _FrameStats import FrameStats
+from _TickScheduler import TickScheduler
+from _TimeSource import SystemTimeSource
+
+
+_LOGGER = logging.getLogger(__name__)
 
 
-class BasePyClock(Window):
+class BasePyClock(BaseFace, Window):
     """
     Base class for PyClock.
     """
 
-    def __init__(self, title, init_width=230, init_height=230):
+    # size of the area in the top left of the canvas the performance
+    # overlay is drawn in.
+    _OVERLAY_WIDTH = 430
+    _OVERLAY_HEIGHT = 18
+
+    # when an alarm fires the canvas flashes in the colour of the LEDs;
+    # it is covered whilst the number of toggles left is odd, so an odd
+    # number covers it straight away. Toggled every _FLASH_INTERVAL
+    # milliseconds.
+    _FLASH_TOGGLES = 9
+    _FLASH_INTERVAL = 250
+
+    # longest the alarm timer waits, in seconds, before it checks the
+    # time again, so an alarm still rings on time if the time displayed
+    # jumps, e.g. once it has been corrected by a time server.
+    _ALARM_RECHECK = 60
+
+    def __init__(self, title, init_width=None, init_height=None):
         """
         Instantiate an instance of _BasePyClock.
 
@@ -27,60 +65,614 @@ class BasePyClock(Window):
 
         @type init_width: int
         @param init_width: Initial width of the window.
-            DEFAULT: 230
+            DEFAULT: Default width of the face.
 
         @type init_height: int
         @param init_height: Initial heigh of the window.
-            DEFAULT: 230
+            DEFAULT: Default height of the face.
         """
         super(BasePyClock, self).__init__()
 
         self.set_title(title=title)
-        self.resize(width=init_width, height=init_height)
+        self.resize(width=init_width or self._DEFAULT_WIDTH,
+                    height=init_height or self._DEFAULT_HEIGHT)
         self.set_position(position=WIN_POS_CENTER)
         self.connect("destroy", main_quit)
 
-        self._time = datetime.now()
-
         self._draw_area = DrawingArea()
+        self._draw_area.add_events(VISIBILITY_NOTIFY_MASK)
         self._draw_area.connect("expose-event", self._expose)
+        self._draw_area.connect("size-allocate", self._size_allocated)
+        self._draw_area.connect("visibility-notify-event",
+                                self._visibility_changed)
         self.add(self._draw_area)
 
-        timeout_add(1000, self._update)
+        # the clock only ticks whilst it can be seen; it stops whilst
+        # the window is unmapped (e.g. on another workspace), minimised
+        # or completely covered by other windows.
+        self._mapped = False
+        self._iconified = False
+        self._obscured = False
+        self.connect("map-event", self._map_changed, True)
+        self.connect("unmap-event", self._map_changed, False)
+        self.connect("window-state-event", self._window_state_changed)
+
+        # timings of each phase of the most recent frames.
+        self._stats = FrameStats()
+        self._show_overlay = False
+        self._log_interval = None
+        self._last_log = default_timer()
+
+        # ring buffer every frame is also rendered in to, if any, and
+        # the copy of the face rendered in to it, so that neither the
+        # ring nor the window throws away the caches of the other.
+        self._frame_ring = None
+        self._ring_face = None
+
+        # broadcaster the state of the clock is sent to on every tick,
+        # if any, and the watch accepting its clients.
+        self._broadcaster = None
+        self._broadcast_watch_id = None
+
+        # size of the canvas, set whenever it is allocated.
+        self._canvas_size = (self._width, self._height)
+
+        # tick on every second boundary of the wall clock, started once
+        # the window has been mapped. Replaced by a FrameScheduler when
+        # the clock is animated, or by the time source's own scheduler
+        # when it runs independently of the wall clock.
+        self._scheduler = TickScheduler(callback=self._update,
+                                        offset_func=self.get_time_offset)
+        self._frame_rate = None
+        self._epoch = 0
+
+        # where the time displayed on every tick comes from.
+        self._time_source = SystemTimeSource()
+
+        # records the frames in to display lists when set, so frames
+        # which look the same are replayed rather than drawn again.
+        self._recorder = None
+
+        # alarms checked on every tick, the command run when one fires,
+        # the commands still running and the number of times the flash
+        # still has to toggle.
+        self._alarms = AlarmQueue()
+        self._alarm_command = None
+        self._alarm_processes = []
+        self._flash_toggles = 0
+
+        # timer ringing the next alarm on time even whilst the clock is
+        # not ticking, e.g. when hidden, and the time it was armed for.
+        self._alarm_timer_id = None
+        self._alarm_timer_time = None
 
         self.show_all()
 
-    def _expose(self, *args):
+    def get_draw_area(self):
+        """
+        Return the drawing area the clock is drawn on.
+
+        @rtype: gtk.DrawingArea
+        """
+        return self._draw_area
+
+    def is_clock_visible(self):
+        """
+        Return whether the clock can currently be seen.
+
+        @rtype: bool
+        """
+        return self._mapped and not (self._iconified or self._obscured)
+
+    def get_frame_stats(self):
+        """
+        Return the timings of each phase of the most recent frames.
+
+        @rtype: dict[str, dict[str, float]]
+        @return: Dictionary as returned by FrameStats.get_stats.
+        """
+        return self._stats.get_stats()
+
+    def set_overlay_visible(self, visible):
+        """
+        Show or hide the performance overlay; the frame rate, draw time
+        and how late the timer fired, drawn in the top left of the
+        canvas.
+
+        @type visible: bool
+        @param visible: If True, show the overlay.
+        """
+        self._show_overlay = visible
+
+        if self.window:
+            self.window.invalidate_rect(
+                Rectangle(width=self._OVERLAY_WIDTH,
+                          height=self._OVERLAY_HEIGHT), True)
+
+    def set_led_colour(self, red, green, blue):
+        """
+        Set the colour of the LEDs, dropping any display lists recorded
+        in the old colour.
+
+        @type red: float
+        @param red: Red component of the colour, between 0 and 1.
+
+        @type green: float
+        @param green: Green component of the colour, between 0 and 1.
+
+        @type blue: float
+        @param blue: Blue component of the colour, between 0 and 1.
+        """
+        super(BasePyClock, self).set_led_colour(red=red, green=green,
+                                                blue=blue)
+
+        if self._recorder is not None:
+            self._recorder.clear()
+
+        if self._ring_face is not None:
+            self._ring_face.set_led_colour(red=red, green=green, blue=blue)
+
+    def set_seconds_visible(self, visible):
+        """
+        Show or hide the seconds.
+
+        Whilst the seconds are hidden the clock only ticks once a
+        minute, on a coarse timer which the main loop can fire together
+        with others.
+
+        @type visible: bool
+        @param visible: If True, show the seconds.
+        """
+        super(BasePyClock, self).set_seconds_visible(visible=visible)
+
+        if self._ring_face is not None:
+            self._ring_face.set_seconds_visible(visible=visible)
+
+        # an animated clock, or one paced by its time source, keeps its
+        # own pace.
+        if type(self._scheduler) is TickScheduler:
+            self._set_tick_interval()
+
+        self._draw_area.queue_draw()
+
+    def set_frame_rate(self, fps):
+        """
+        Draw the clock as an animation at a frame rate, rather than once
+        a tick.
+
+        The frame rate is lowered automatically whilst frames take too
+        long to draw, and late frames are dropped rather than queued.
+
+        @type fps: float
+        @param fps: Target number of frames per second, or None to go
+            back to ticking.
+        """
+        self._frame_rate = fps
+        self._replace_scheduler()
+
+    def set_tick_epoch(self, epoch):
+        """
+        Set the time the ticks are counted from. Clocks in different
+        processes given the same epoch tick together.
+
+        @type epoch: float
+        @param epoch: Time as seconds since the epoch.
+        """
+        self._epoch = epoch
+        self._replace_scheduler()
+
+    def set_time_source(self, time_source):
+        """
+        Set where the time displayed on every tick comes from.
+
+        A source which is independent of the wall clock, e.g. a
+        simulation, is ticked as fast as the clock can be drawn. The
+        clock stops ticking once the source runs out of times.
+
+        @type time_source: _TimeSource.TimeSource
+        @param time_source: Source of the time to display.
+        """
+        self._time_source = time_source
+        self._replace_scheduler()
+        self._arm_alarm_timer()
+
+    def add_alarm(self, time, label=None, repeat=None):
+        """
+        Add an alarm. When it fires the clock flashes and the alarm
+        command, if any, is run.
+
+        An alarm rings on time whether or not the clock is ticking, as
+        long as the time source follows the wall clock; otherwise it
+        rings on the first tick at or after its time.
+
+        @type time: datetime.datetime
+        @param time: Time the alarm first fires, as given by the time
+            source.
+
+        @type label: str
+        @param label: Description of the alarm.
+            DEFAULT: None
+
+        @type repeat: datetime.timedelta
+        @param repeat: Interval the alarm fires again at, or None to
+            fire once.
+            DEFAULT: None
+
+        @rtype: _AlarmQueue.Alarm
+        @return: The alarm, which can be passed to cancel_alarm.
+        """
+        alarm = self._alarms.add(time=time, label=label, repeat=repeat)
+        self._arm_alarm_timer()
+
+        return alarm
+
+    def cancel_alarm(self, alarm):
+        """
+        Cancel an alarm so that it never fires again.
+
+        @type alarm: _AlarmQueue.Alarm
+        @param alarm: Alarm returned by add_alarm.
+        """
+        self._alarms.cancel(alarm=alarm)
+        self._arm_alarm_timer()
+
+    def set_alarm_command(self, command):
+        """
+        Set a shell command to run whenever an alarm fires. The label and
+        time of the alarm are passed in the PYCLOCK_ALARM_LABEL and
+        PYCLOCK_ALARM_TIME environment variables.
+
+        @type command: str
+        @param command: Command to run, or None to run nothing.
+        """
+        self._alarm_command = command
+
+    def set_display_lists(self, enabled):
+        """
+        Draw the clock by replaying display lists of the operations
+        drawing each frame, cached by what the frame displays, rather
+        than drawing it straight on to the canvas.
+
+        @type enabled: bool
+        @param enabled: If True, draw through display lists.
+        """
+        self._recorder = FrameRecorder(face=self) if enabled else None
+        self._draw_area.queue_draw()
+
+    def get_display_list_stats(self):
+        """
+        Return how many frames have been replayed from the display list
+        cache, and how many had to be recorded.
+
+        @rtype: (int, int)
+        @return: Number of hits and misses, or None if display lists are
+            not being used.
+        """
+        if self._recorder is None:
+            return None
+
+        return self._recorder.hits, self._recorder.misses
+
+    def set_stats_log_interval(self, seconds):
+        """
+        Periodically log a summary of the frame timings.
+
+        @type seconds: float
+        @param seconds: Seconds between each log line, or None to stop
+            logging.
+        """
+        self._log_interval = seconds
+
+    def set_frame_ring(self, frame_ring):
+        """
+        Render every frame in to a ring buffer shared with other
+        processes, as well as on to the window.
+
+        Frames are rendered whether or not the window can be seen, so
+        the clock keeps ticking for as long as it has a ring. They are
+        rendered by a copy of the face, with the settings it has when
+        the ring is set; only changes to the LED colour and the seconds
+        are copied to it afterwards.
+
+        @type frame_ring: framering.FrameRingWriter
+        @param frame_ring: Ring to render the frames in to, or None to
+            stop.
+        """
+        self._frame_ring = frame_ring
+        self._ring_face = None
+
+        if frame_ring is not None:
+            self._ring_face = self._create_face_copy()
+            frame_ring.write_frame(face=self._ring_face, time=self._time)
+
+        self._update_visibility()
+
+    def set_state_broadcaster(self, broadcaster):
+        """
+        Broadcast the state of the clock on every tick to thin clients,
+        which draw the clock themselves.
+
+        The state is broadcast whether or not the window can be seen, so
+        the clock keeps ticking for as long as it has a broadcaster.
+
+        @type broadcaster: statecast.StateBroadcaster
+        @param broadcaster: Broadcaster to send the state to, or None to
+            stop.
+        """
+        if self._broadcast_watch_id is not None:
+            source_remove(self._broadcast_watch_id)
+            self._broadcast_watch_id = None
+
+        self._broadcaster = broadcaster
+
+        if broadcaster is not None:
+            self._broadcast_watch_id = io_add_watch(
+                broadcaster.fileno(), IO_IN, self._accept_state_clients)
+
+        self._update_visibility()
+
+    def get_time_offset(self):
+        """
+        Return how far the time displayed has been corrected from the
+        local clock, e.g. by synchronising with a time server.
+
+        @rtype: float
+        @return: Offset in seconds.
+        """
+        return self._time_source.get_offset()
+
+    def get_sync_status(self):
+        """
+        Return the health of the synchronisation of the time displayed
+        with a time server.
+
+        @rtype: dict[str, object]
+        @return: Status as returned by the time source, or None if the
+            time is not synchronised.
+        """
+        return self._time_source.get_sync_status()
+
+    def _accept_state_clients(self, fileno, condition):
+        """
+        Called by the main loop when clients are waiting to connect to
+        the broadcaster.
+
+        @rtype: bool
+        @return: True, to keep watching for clients.
+        """
+        self._broadcaster.accept_clients()
+
+        return True
+
+    def _create_face_copy(self):
+        """
+        Create a face of the same class as the window's, displaying
+        everything as the window does.
+
+        @rtype: BaseFace
+        """
+        # the face is the first class the window inherits from which is
+        # not itself a window.
+        for cls in type(self).__mro__:
+            if issubclass(cls, BaseFace) and not issubclass(cls,
+                                                            BasePyClock):
+                break
+
+        face = cls()
+        self.copy_settings(face=face)
+
+        return face
+
+    def _replace_scheduler(self):
+        """
+        Replace the scheduler with one suited to the time source and
+        frame rate, carrying on ticking if the old one was running.
+        """
+        running = self._scheduler.is_running()
+        self._scheduler.stop()
+
+        scheduler = self._time_source.create_scheduler(
+            callback=self._update)
+
+        if scheduler is not None:
+            self._scheduler = scheduler
+        elif self._frame_rate is None:
+            self._scheduler = TickScheduler(
+                callback=self._update, offset_func=self.get_time_offset,
+                epoch=self._epoch)
+            self._set_tick_interval()
+        else:
+            self._scheduler = FrameScheduler(
+                callback=self._update, fps=self._frame_rate,
+                offset_func=self.get_time_offset, epoch=self._epoch)
+
+        if running:
+            self._scheduler.start()
+
+    def _set_tick_interval(self):
+        """
+        Tick every second whilst the seconds are shown, else once a
+        minute on a coarse timer.
+        """
+        if self._show_seconds:
+            self._scheduler.set_interval(interval=1)
+        else:
+            self._scheduler.set_interval(interval=60, coarse=True)
+
+    def _map_changed(self, widget, event, mapped):
+        """
+        Called when the window is mapped or unmapped.
+
+        @type widget: gtk.Window
+        @param widget: Window which was mapped or unmapped.
+
+        @type event: gtk.gdk.Event
+        @param event: Map or unmap event.
+
+        @type mapped: bool
+        @param mapped: True if the window was mapped, False if it was
+            unmapped.
+        """
+        self._mapped = mapped
+        self._update_visibility()
+
+    def _window_state_changed(self, widget, event):
+        """
+        Called when the window is minimised, restored, maximised etc.
+
+        @type widget: gtk.Window
+        @param widget: Window whose state changed.
+
+        @type event: gtk.gdk.Event
+        @param event: Window state event.
+        """
+        self._iconified = bool(event.new_window_state &
+                               WINDOW_STATE_ICONIFIED)
+        self._update_visibility()
+
+    def _visibility_changed(self, widget, event):
+        """
+        Called when the drawing area becomes covered or uncovered by
+        other windows.
+
+        @type widget: gtk.DrawingArea
+        @param widget: Drawing area whose visibility changed.
+
+        @type event: gtk.gdk.Event
+        @param event: Visibility notify event.
+        """
+        self._obscured = event.state == VISIBILITY_FULLY_OBSCURED
+        self._update_visibility()
+
+    def _update_visibility(self):
+        """
+        Start or stop the scheduler to match the visibility of the clock.
+
+        When the clock becomes visible again it is brought up to date
+        straight away, rather than showing a stale time until the next
+        tick.
+        """
+        if (self.is_clock_visible() or self._frame_ring is not None or
+                self._broadcaster is not None):
+            if not self._scheduler.is_running() and \
+                    self._update() is not False:
+                self._scheduler.start()
+        else:
+            self._scheduler.stop()
+
+    def _size_allocated(self, widget, allocation):
+        """
+        Called when the canvas is given its size. Lays the face out for
+        the new size, so none of its geometry has to be worked out when
+        drawing.
+
+        @type widget: gtk.DrawingArea
+        @param widget: Drawing area which was allocated.
+
+        @type allocation: gtk.gdk.Rectangle
+        @param allocation: Position and size of the drawing area.
+        """
+        self._canvas_size = (allocation.width, allocation.height)
+        self.set_size(width=allocation.width, height=allocation.height)
+
+    def _expose(self, widget, event):
         """
         Method used to draw on to the canvas.
+
+        Drawing is clipped to the exposed region, so only the parts of
+        the canvas which have been invalidated are actually repainted.
+
+        @type widget: gtk.DrawingArea
+        @param widget: Drawing area which received the expose event.
+
+        @type event: gtk.gdk.Event
+        @param event: Expose event detailing the area to redraw.
         """
-        self._context = self._draw_area.window.cairo_create()
-        content_area = Rectangle(width=self.allocation.width,
-                                 height=self.allocation.height)
-        self._context.rectangle(content_area)
-        self._context.clip()
+        start = default_timer()
+        context = self._draw_area.window.cairo_create()
+        context.region(event.region)
+        context.clip()
+        self._stats.record(phase="context", seconds=default_timer() - start)
+
+        width, height = self._canvas_size
+
+        start = default_timer()
+        if self._recorder is None:
+            self.render(context=context, time=self._time, width=width,
+                        height=height)
+        else:
+            self._recorder.record(time=self._time, width=width,
+                                  height=height).replay(context=context)
+        self._stats.record(phase="draw", seconds=default_timer() - start)
 
-        self._draw_clock()
+        if self._flash_toggles % 2:
+            context.set_source_rgba(self._led_red, self._led_green,
+                                    self._led_blue, 0.5)
+            context.paint()
 
-    def _draw_clock(self):
+        if self._show_overlay:
+            self._draw_overlay(context=context)
+
+    def _draw_overlay(self, context):
         """
-        Draw the clock.
+        Draw the performance overlay in the top left of the canvas.
 
-        NEEDS IMPLEMENTING IN THE INHERITING CLASS.
+        @type context: cairo.Context
+        @param context: Context to draw the overlay on to.
         """
-        raise NotImplementedError
+        context.save()
+
+        context.rectangle(0, 0, self._OVERLAY_WIDTH, self._OVERLAY_HEIGHT)
+        context.set_source_rgba(0.0, 0.0, 0.0, 0.7)
+        context.fill()
+
+        context.set_source_rgb(1.0, 1.0, 1.0)
+        context.select_font_face("monospace")
+        context.set_font_size(11)
+        context.move_to(4, self._OVERLAY_HEIGHT - 5)
+        context.show_text(self._stats.format())
+
+        context.restore()
 
-    def _redraw_canvas(self):
+    def _redraw_canvas(self, previous_time):
         """
         Redraw the canvas to make it look as thought the hands are
         ticking.
+
+        Only the areas which have changed since previous_time are
+        invalidated, all in one go so that they are repainted by a
+        single expose.
+
+        @type previous_time: datetime.datetime
+        @param previous_time: Time displayed before the latest update.
         """
         if self.window:
-            dimensions = self.get_allocation()
-            rect = Rectangle(width=dimensions.width,
-                             height=dimensions.height)
-            self.window.invalidate_rect(rect, True)
-            self.window.process_updates(True)
+            start = default_timer()
+
+            damaged_areas = self._get_damaged_areas(
+                previous_time=previous_time, current_time=self._time)
+
+            region = Region()
+            for x_pos, y_pos, width, height in damaged_areas:
+                region.union_with_rect(Rectangle(x=x_pos, y=y_pos,
+                                                 width=width,
+                                                 height=height))
+
+            # the overlay changes every tick, whatever else has.
+            if self._show_overlay:
+                region.union_with_rect(
+                    Rectangle(width=self._OVERLAY_WIDTH,
+                              height=self._OVERLAY_HEIGHT))
+
+            damaged = not region.empty()
+            if damaged:
+                self.window.invalidate_region(region, True)
+
+            self._stats.record(phase="invalidate",
+                               seconds=default_timer() - start)
+
+            if damaged:
+                self.window.process_updates(True)
 
     def _update(self):
         """
@@ -88,11 +680,159 @@ class BasePyClock(Window):
         property so that the canvas willbe updated.
 
         @rtype: bool
-        @return: Return True to ensure that the timer object will fire
-            again.
+        @return: Return True to ensure that the scheduler will fire
+            again, or False once the time source has run out of times.
         """
-        self._time = datetime.now()
-        self._redraw_canvas()
+        start = default_timer()
+
+        if self._scheduler.lateness:
+            self._stats.record(phase="lateness",
+                               seconds=self._scheduler.lateness[-1])
+
+        time = self._time_source.now()
+        if time is None:
+            _LOGGER.info("%s: time source finished: %s", self.get_title(),
+                         self._stats.format())
+            return False
+
+        previous_time = self._time
+        self._time = time
+        self._redraw_canvas(previous_time=previous_time)
 
-        # returning True ensures that the timer object will fire again.
+        self._ring_due_alarms(time=time)
+
+        if self._frame_ring is not None:
+            self._frame_ring.write_frame(face=self._ring_face,
+                                         time=self._time)
+
+        if self._broadcaster is not None:
+            width, height = self._canvas_size
+            self._broadcaster.broadcast(face=self, time=self._time,
+                                        width=width, height=height)
+
+        self._stats.record(phase="update", seconds=default_timer() - start)
+
+        if (self._log_interval and
+                start - self._last_log >= self._log_interval):
+            _LOGGER.info("%s: %s", self.get_title(), self._stats.format())
+            self._last_log = start
+
+        # returning True ensures that the scheduler will fire again.
         return True
+
+    def _ring_due_alarms(self, time):
+        """
+        Ring the alarms which are due at a time, and arm the alarm timer
+        for the next one if it has changed.
+
+        @type time: datetime.datetime
+        @param time: Current time, as given by the time source.
+        """
+        # only the head of the queue is looked at unless alarms are due.
+        for alarm in self._alarms.pop_due(now=time):
+            self._ring_alarm(alarm=alarm, time=time)
+
+        if self._alarm_processes:
+            self._reap_alarm_commands()
+
+        if self._alarms.get_next_time() != self._alarm_timer_time:
+            self._arm_alarm_timer()
+
+    def _arm_alarm_timer(self):
+        """
+        Arm the alarm timer for the next alarm, replacing any timer
+        which was armed for an earlier one.
+        """
+        if self._alarm_timer_id is not None:
+            source_remove(self._alarm_timer_id)
+            self._alarm_timer_id = None
+
+        self._alarm_timer_time = self._alarms.get_next_time()
+
+        # any other time only moves on with the ticks, so is checked by
+        # them alone.
+        if (self._alarm_timer_time is None or
+                not self._time_source.follows_wall_clock()):
+            return
+
+        seconds = (self._alarm_timer_time -
+                   self._time_source.now()).total_seconds()
+        seconds = min(max(seconds, 0), self._ALARM_RECHECK)
+
+        self._alarm_timer_id = timeout_add(int(ceil(seconds * 1000)),
+                                           self._alarm_timer_fired)
+
+    def _alarm_timer_fired(self):
+        """
+        Called by the alarm timer to ring any alarms which are due and
+        arm it for the next.
+
+        @rtype: bool
+        @return: Always False, as the timer is armed afresh each time.
+        """
+        self._alarm_timer_id = None
+        self._alarm_timer_time = None
+        self._ring_due_alarms(time=self._time_source.now())
+
+        return False
+
+    def _ring_alarm(self, alarm, time):
+        """
+        Flash the clock and run the alarm command for an alarm which has
+        fired.
+
+        @type alarm: _AlarmQueue.Alarm
+        @param alarm: Alarm which has fired.
+
+        @type time: datetime.datetime
+        @param time: Time the alarm fired at.
+        """
+        _LOGGER.info("%s: alarm %s at %s", self.get_title(),
+                     alarm.label or "", time)
+
+        # an alarm which fires whilst the clock is already flashing
+        # restarts the flash, rather than starting another timer.
+        if not self._flash_toggles:
+            timeout_add(self._FLASH_INTERVAL, self._toggle_flash)
+        self._flash_toggles = self._FLASH_TOGGLES
+        self._draw_area.queue_draw()
+
+        if self._alarm_command:
+            env = dict(os.environ)
+            env["PYCLOCK_ALARM_LABEL"] = alarm.label or ""
+            env["PYCLOCK_ALARM_TIME"] = time.isoformat()
+
+            try:
+                self._alarm_processes.append(
+                    Popen(self._alarm_command, shell=True, env=env))
+            except OSError:
+                _LOGGER.exception("%s: alarm command failed",
+                                  self.get_title())
+
+    def _reap_alarm_commands(self):
+        """
+        Collect the exit status of any alarm commands which have
+        finished, so they do not linger as zombie processes.
+        """
+        running = []
+        for process in self._alarm_processes:
+            code = process.poll()
+            if code is None:
+                running.append(process)
+            elif code:
+                _LOGGER.warning("%s: alarm command exited with %d",
+                                self.get_title(), code)
+
+        self._alarm_processes = running
+
+    def _toggle_flash(self):
+        """
+        Called by the flash timer to cover or uncover the canvas.
+
+        @rtype: bool
+        @return: True until the flash has finished.
+        """
+        self._flash_toggles -= 1
+        self._draw_area.queue_draw()
+
+        return self._flash_toggles > 0
@@ -0,0 +1,277 @@
+"""
+Module containing the face of the binary clock.
+"""
+
+
+# STDLIB IMPORTS
+from math import ceil, hypot, pi
+
+# LOCAL IMPORTS
+from _BaseFace import BaseFace
+from glyphs import (BINARY_SIZE, get_led_x_pos, get_row_values,
+                    LED_RADIUS, NUM_LEDS, ROW_Y_POSITIONS)
+
+
+class BinaryFace(BaseFace):
+    """
+    Class implementing the face of the binary clock.
+    """
+
+    _DEFAULT_WIDTH, _DEFAULT_HEIGHT = BINARY_SIZE
+
+    # the positions of the LEDs are shared with the renderers which do
+    # not use cairo, so are kept in glyphs.
+    _LED_RADIUS = LED_RADIUS
+    _NUM_LEDS = NUM_LEDS
+    _ROW_Y_POSITIONS = ROW_Y_POSITIONS
+
+    # padding added around an LED, to include its outline, when working
+    # out which part of the canvas to redraw or to render a sprite.
+    _LED_PADDING = 2
+
+    # a full row of 'off' LEDs and a full row of 'on' LEDs are rendered
+    # once on to a sprite atlas, which the LEDs are then painted from.
+    # The atlas is rendered again whenever the colour or scale it was
+    # rendered for changes.
+    _atlas_surface = None
+    _atlas_key = None
+
+    def _draw_clock(self):
+        """
+        Draw the clock, i.e. the LEDs
+        """
+        # everything is positioned for the default size of the face and
+        # scaled to fit.
+        self._context.save()
+        self._transform_to_layout()
+
+        self._draw_year_leds()
+        self._draw_month_leds()
+        self._draw_day_leds()
+        self._draw_hour_leds()
+        self._draw_minute_leds()
+
+        if self._show_seconds:
+            self._draw_second_leds()
+
+        self._context.restore()
+
+    # value displayed by each row of LEDs, in the same order as
+    # _ROW_Y_POSITIONS.
+    _get_row_values = staticmethod(get_row_values)
+
+    def get_visible_state(self, time):
+        """
+        Return the values displayed by each row of LEDs for a particular
+        time.
+
+        @type time: datetime.datetime
+        @param time: Time to get the visible state for.
+
+        @rtype: (int, int, int, int, int, int)
+        @return: As returned by _get_row_values, without the seconds if
+            they are hidden.
+        """
+        values = self._get_row_values(time)
+        return values if self._show_seconds else values[:-1]
+
+    def _get_damaged_areas(self, previous_time, current_time):
+        """
+        Return the areas covered by the rows of LEDs whose value has
+        changed between previous_time and current_time.
+
+        @type previous_time: datetime.datetime
+        @param previous_time: Time which is currently displayed.
+
+        @type current_time: datetime.datetime
+        @param current_time: Time which is about to be displayed.
+
+        @rtype: [(int, int, int, int)]
+        @return: List of (x, y, width, height) tuples detailing the
+            areas to redraw.
+        """
+        padding = self._LED_PADDING
+        width = (self._get_led_x_pos(led_pos=self._NUM_LEDS - 1) +
+                 self._LED_RADIUS + padding)
+        height = 2 * (self._LED_RADIUS + padding)
+
+        # without the seconds row only the rows above it change.
+        count = len(self._ROW_Y_POSITIONS) - (0 if self._show_seconds else 1)
+
+        rows = zip(self._ROW_Y_POSITIONS[:count],
+                   self._get_row_values(previous_time),
+                   self._get_row_values(current_time))
+
+        return [self._transform_area(x_pos=0,
+                                     y_pos=y_pos - self._LED_RADIUS - padding,
+                                     width=width, height=height)
+                for y_pos, previous, current in rows
+                if previous != current]
+
+    def _draw_leds(self, value, y_pos):
+        """
+        Draw the LEDs to display the binary for a particular time
+        component, by painting each LED from the sprite atlas.
+
+        @type value: int
+        @param value: Value of the time component.
+
+        @type y_pos: int
+        @param y_pos: Center point of LED along the Y axis.
+        """
+        # sprites are rendered at the resolution of the device so that
+        # they remain sharp if the canvas has been scaled.
+        matrix = self._context.get_matrix()
+        scale = hypot(matrix.xx, matrix.yx)
+
+        atlas = self._get_atlas_surface(scale=scale)
+        sprite_size = 2 * (self._LED_RADIUS + self._LED_PADDING) * scale
+
+        # sort the LEDs in to those which are off and on by reading the
+        # bits straight from the value, most significant bit first.
+        leds = ([], [])
+        for led_pos in range(self._NUM_LEDS):
+            bit = value >> (self._NUM_LEDS - 1 - led_pos) & 1
+            leds[bit].append(led_pos)
+
+        self._context.save()
+        self._context.translate(0, y_pos - self._LED_RADIUS -
+                                self._LED_PADDING)
+        self._context.scale(1.0 / scale, 1.0 / scale)
+
+        # paint all of the LEDs in each state with a single fill, using
+        # the matching row of the atlas as the source.
+        for row, led_positions in enumerate(leds):
+            if not led_positions:
+                continue
+
+            self._context.set_source_surface(atlas, 0, -row * sprite_size)
+            for led_pos in led_positions:
+                led_x_center = self._get_led_x_pos(led_pos=led_pos) * scale
+                self._context.rectangle(led_x_center - sprite_size / 2, 0,
+                                        sprite_size, sprite_size)
+            self._context.fill()
+
+        self._context.restore()
+
+    def _get_atlas_surface(self, scale):
+        """
+        Return the sprite atlas, rendering it if the LED colour or scale
+        has changed since it was last rendered.
+
+        @type scale: float
+        @param scale: Scale to render the atlas at.
+
+        @rtype: cairo.Surface
+        @return: Surface containing a row of 'off' LEDs above a row of
+            'on' LEDs.
+        """
+        atlas_key = (self._led_red, self._led_green, self._led_blue, scale)
+
+        if self._atlas_key != atlas_key:
+            width = (self._get_led_x_pos(led_pos=self._NUM_LEDS - 1) +
+                     self._LED_RADIUS + self._LED_PADDING)
+            height = 4 * (self._LED_RADIUS + self._LED_PADDING)
+
+            self._atlas_surface = self._render_offscreen(
+                width=ceil(width * scale), height=ceil(height * scale),
+                draw_func=self._draw_atlas, scale=scale)
+            self._atlas_key = atlas_key
+
+        return self._atlas_surface
+
+    def _draw_atlas(self, scale):
+        """
+        Draw the sprite atlas; a row of 'off' LEDs above a row of 'on'
+        LEDs.
+
+        @type scale: float
+        @param scale: Scale to draw the atlas at.
+        """
+        self._context.scale(scale, scale)
+
+        row_height = 2 * (self._LED_RADIUS + self._LED_PADDING)
+
+        for row in range(2):
+            y_pos = row * row_height + self._LED_RADIUS + self._LED_PADDING
+
+            for led_pos in range(self._NUM_LEDS):
+                self._draw_led(x_pos=self._get_led_x_pos(led_pos=led_pos),
+                               y_pos=y_pos, on=bool(row))
+
+    def _draw_led(self, x_pos, y_pos, on):
+        """
+        Draw a single LED.
+
+        @type x_pos: int
+        @param x_pos: Center point of LED along the X axis.
+
+        @type y_pos: int
+        @param y_pos: Center point of LED along the Y axis.
+
+        @type on: bool
+        @param on: If True, draw the LED lit using the LED colour, else
+            draw it dimmed.
+        """
+        self._context.arc(x_pos, y_pos, self._LED_RADIUS, 0, 2 * pi)
+
+        # LED on
+        if on:
+            self._context.set_source_rgb(self._led_red, self._led_green,
+                                         self._led_blue)
+
+        # LED off
+        else:
+            self._context.set_source_rgb(self._led_red * 0.325,
+                                         self._led_green * 0.325,
+                                         self._led_blue * 0.325)
+
+        self._context.fill_preserve()
+        self._context.set_source_rgb(0.0, 0.0, 0.0)
+
+        self._context.stroke()
+
+    # center point along the X axis of each LED in a row.
+    _get_led_x_pos = staticmethod(get_led_x_pos)
+
+    def _draw_year_leds(self):
+        """
+        Draw the LEDs to display the year.
+        """
+        self._draw_leds(value=self._time.year,
+                        y_pos=self._ROW_Y_POSITIONS[0])
+
+    def _draw_month_leds(self):
+        """
+        Draw the LEDs to display the month.
+        """
+        self._draw_leds(value=self._time.month,
+                        y_pos=self._ROW_Y_POSITIONS[1])
+
+    def _draw_day_leds(self):
+        """
+        Draw the LEDs to display the day.
+        """
+        self._draw_leds(value=self._time.day,
+                        y_pos=self._ROW_Y_POSITIONS[2])
+
+    def _draw_hour_leds(self):
+        """
+        Draw the LEDs to display the hour.
+        """
+        self._draw_leds(value=self._time.hour,
+                        y_pos=self._ROW_Y_POSITIONS[3])
+
+    def _draw_minute_leds(self):
+        """
+        Draw the LEDs to display the minute.
+        """
+        self._draw_leds(value=self._time.minute,
+                        y_pos=self._ROW_Y_POSITIONS[4])
+
+    def _draw_second_leds(self):
+        """
+        Draw the LEDs to display the second.
+        """
+        self._draw_leds(value=self._time.second,
+                        y_pos=self._ROW_Y_POSITIONS[5])
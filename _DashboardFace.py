@@ -0,0 +1,279 @@
+"""
+Module containing the face of the dashboard; a grid of clock faces, each
+of which can display a different time zone.
+"""
+
+
+# STDLIB IMPORTS
+from calendar import timegm
+from datetime import timedelta
+from math import ceil, sqrt
+from time import mktime
+
+# LOCAL IMPORTS
+from _BaseFace import BaseFace
+from interfaces import load_face
+
+
+class DashboardFace(BaseFace):
+    """
+    Class implementing a face made up of a grid of other faces.
+
+    The time is only read once per tick, by whatever is displaying the
+    dashboard, and each tile shows it adjusted to its own offset from
+    UTC.
+    """
+
+    # size of each tile when the dashboard is displayed at its default
+    # size.
+    _TILE_SIZE = 230
+
+    # padding, in pixels, between each of the tiles.
+    _TILE_PADDING = 4
+
+    # face and offset from UTC of each tile, and the size of the grid
+    # they are displayed in. Set by set_tiles.
+    _tiles = ()
+    _columns = 1
+    _rows = 1
+
+    @classmethod
+    def get_grid_size(cls, count, columns=None):
+        """
+        Return the number of columns and rows in the grid of tiles.
+
+        @type count: int
+        @param count: Number of tiles.
+
+        @type columns: int
+        @param columns: Number of columns in the grid.
+            DEFAULT: Enough to make the grid roughly square.
+
+        @rtype: (int, int)
+        """
+        columns = columns or max(int(ceil(sqrt(count))), 1)
+        return columns, max(int(ceil(count / float(columns))), 1)
+
+    def set_tiles(self, tiles, columns=None):
+        """
+        Set the tiles displayed by the dashboard.
+
+        @type tiles: [(str, datetime.timedelta)]
+        @param tiles: Interface and offset from UTC of each tile, as
+            returned by interfaces.parse_tile.
+
+        @type columns: int
+        @param columns: Number of columns in the grid.
+            DEFAULT: Enough to make the grid roughly square.
+        """
+        self._tiles = []
+        for interface, offset in tiles:
+            face = load_face(name=interface)()
+            face.set_led_colour(red=self._led_red, green=self._led_green,
+                                blue=self._led_blue)
+            face.set_seconds_visible(visible=self._show_seconds)
+            self._tiles.append((face, offset))
+
+        self._columns, self._rows = self.get_grid_size(
+            count=len(self._tiles), columns=columns)
+
+        self._DEFAULT_WIDTH = self._columns * self._TILE_SIZE
+        self._DEFAULT_HEIGHT = self._rows * self._TILE_SIZE
+
+        # lay the new tiles out when the dashboard is next drawn.
+        self._layout_size = None
+
+    def set_led_colour(self, red, green, blue):
+        """
+        Set the colour of the LEDs of every tile.
+
+        @type red: float
+        @param red: Red component of the colour, between 0 and 1.
+
+        @type green: float
+        @param green: Green component of the colour, between 0 and 1.
+
+        @type blue: float
+        @param blue: Blue component of the colour, between 0 and 1.
+        """
+        super(DashboardFace, self).set_led_colour(red=red, green=green,
+                                                  blue=blue)
+
+        for face, _ in self._tiles:
+            face.set_led_colour(red=red, green=green, blue=blue)
+
+    def set_seconds_visible(self, visible):
+        """
+        Show or hide the seconds on every tile.
+
+        @type visible: bool
+        @param visible: If True, show the seconds.
+        """
+        super(DashboardFace, self).set_seconds_visible(visible=visible)
+
+        for face, _ in self._tiles:
+            face.set_seconds_visible(visible=visible)
+
+    def copy_settings(self, face):
+        """
+        Make another dashboard display the same grid of tiles as this
+        one, each with caches of its own.
+
+        @type face: DashboardFace
+        @param face: Dashboard to copy the settings to.
+        """
+        tiles = []
+        for tile, offset in self._tiles:
+            copy = type(tile)()
+            tile.copy_settings(face=copy)
+            tiles.append((copy, offset))
+
+        face._tiles = tiles
+        face._columns, face._rows = self._columns, self._rows
+        face._DEFAULT_WIDTH = self._DEFAULT_WIDTH
+        face._DEFAULT_HEIGHT = self._DEFAULT_HEIGHT
+        face._layout_size = None
+
+        super(DashboardFace, self).copy_settings(face=face)
+
+    @staticmethod
+    def _get_utc_offset(time):
+        """
+        Return the offset of the local time zone from UTC at a
+        particular time.
+
+        Worked out from the time itself rather than by reading the clock
+        again, so every tile is based on the same reading.
+
+        @type time: datetime.datetime
+        @param time: Local time.
+
+        @rtype: datetime.timedelta
+        """
+        time_tuple = time.timetuple()
+        return timedelta(seconds=timegm(time_tuple) - mktime(time_tuple))
+
+    def _get_tile_times(self, time):
+        """
+        Return the time displayed by each of the tiles.
+
+        @type time: datetime.datetime
+        @param time: Local time displayed by the dashboard.
+
+        @rtype: [datetime.datetime]
+        """
+        utc_time = time - self._get_utc_offset(time)
+
+        return [time if offset is None else utc_time + offset
+                for _, offset in self._tiles]
+
+    def _compute_layout(self, width, height):
+        """
+        Work out the position and size of each tile for a size of the
+        dashboard, and lay out each tile for its size.
+
+        @type width: int
+        @param width: Width to lay the dashboard out for.
+
+        @type height: int
+        @param height: Height to lay the dashboard out for.
+
+        @rtype: [(int, int, int, int)]
+        @return: List containing the X and Y position, width and height
+            of each tile.
+        """
+        cell_width = float(width) / self._columns
+        cell_height = float(height) / self._rows
+        tile_width = max(int(cell_width) - self._TILE_PADDING, 1)
+        tile_height = max(int(cell_height) - self._TILE_PADDING, 1)
+
+        layout = []
+        for index, (face, _) in enumerate(self._tiles):
+            row, column = divmod(index, self._columns)
+
+            # center the tile within its cell of the grid, on a whole
+            # pixel so that it stays sharp.
+            x_pos = int(column * cell_width + (cell_width - tile_width) / 2)
+            y_pos = int(row * cell_height + (cell_height - tile_height) / 2)
+
+            face.set_size(width=tile_width, height=tile_height)
+            layout.append((x_pos, y_pos, tile_width, tile_height))
+
+        return layout
+
+    def _draw_clock(self):
+        """
+        Draw each of the tiles which are within the area being redrawn.
+        """
+        clip_x1, clip_y1, clip_x2, clip_y2 = self._context.clip_extents()
+
+        tiles = zip(self._tiles, self._get_tile_times(self._time),
+                    self._get_layout())
+
+        for (face, _), time, (x_pos, y_pos, width, height) in tiles:
+            # skip tiles which are entirely outside of the area being
+            # redrawn.
+            if (x_pos > clip_x2 or y_pos > clip_y2 or
+                    x_pos + width < clip_x1 or y_pos + height < clip_y1):
+                continue
+
+            self._context.save()
+            self._context.translate(x_pos, y_pos)
+            self._context.rectangle(0, 0, width, height)
+            self._context.clip()
+
+            face.render(context=self._context, time=time, width=width,
+                        height=height)
+
+            self._context.restore()
+
+    def get_visible_state(self, time):
+        """
+        Return what each tile displays for a particular time.
+
+        @type time: datetime.datetime
+        @param time: Time to get the visible state for.
+
+        @rtype: tuple
+        """
+        return tuple(face.get_visible_state(tile_time)
+                     for (face, _), tile_time
+                     in zip(self._tiles, self._get_tile_times(time)))
+
+    def _get_damaged_areas(self, previous_time, current_time):
+        """
+        Return the areas of each tile which have changed between
+        previous_time and current_time.
+
+        @type previous_time: datetime.datetime
+        @param previous_time: Time which is currently displayed.
+
+        @type current_time: datetime.datetime
+        @param current_time: Time which is about to be displayed.
+
+        @rtype: [(int, int, int, int)]
+        @return: List of (x, y, width, height) tuples detailing the
+            areas to redraw.
+        """
+        tiles = zip(self._tiles, self._get_tile_times(previous_time),
+                    self._get_tile_times(current_time), self._get_layout())
+
+        damaged_areas = []
+        for (face, _), previous, current, layout in tiles:
+            x_pos, y_pos, tile_width, tile_height = layout
+
+            for area_x, area_y, width, height in face._get_damaged_areas(
+                    previous_time=previous, current_time=current):
+                # a tile's areas may spill past its edges, e.g. once
+                # rounded out to whole pixels, so are cut down to the
+                # tile rather than damaging its neighbours.
+                left = max(area_x, 0)
+                top = max(area_y, 0)
+                right = min(area_x + width, tile_width)
+                bottom = min(area_y + height, tile_height)
+
+                if right > left and bottom > top:
+                    damaged_areas.append((x_pos + left, y_pos + top,
+                                          right - left, bottom - top))
+
+        return damaged_areas
@@ -0,0 +1,406 @@
+"""
+Module containing the face of the digital (seven segment) clock.
+"""
+
+
+# STDLIB IMPORTS
+from math import ceil, hypot, pi
+
+# LOCAL IMPORTS
+from _BaseFace import BaseFace
+from glyphs import (DIGIT_POSITIONS, DIGITAL_SIZE, DOT_RADIUS,
+                    DOT_X_POSITIONS, DOT_Y_POSITIONS, get_led_points,
+                    SEGMENT_NAMES, SEGMENT_OFFSETS, SEGMENT_ORIENTATION,
+                    SEGMENTS)
+
+
+class DigitalFace(BaseFace):
+    """
+    Class implementing the face of the digital clock.
+    """
+
+    _DEFAULT_WIDTH, _DEFAULT_HEIGHT = DIGITAL_SIZE
+
+    # the positions of the segments and dots are shared with the
+    # renderers which do not use cairo, so are kept in glyphs.
+    _SEGMENT_NAMES = SEGMENT_NAMES
+    _SEGMENT_ORIENTATION = SEGMENT_ORIENTATION
+    _SEGMENT_OFFSETS = SEGMENT_OFFSETS
+    _DIGIT_POSITIONS = DIGIT_POSITIONS
+
+    # size of the area covered by a seven segment display, relative to
+    # the point it is drawn from, padded to include the LED outlines.
+    _DIGIT_AREA = (-12, -12, 84, 144)
+
+    _DOT_X_POSITIONS = DOT_X_POSITIONS
+    _DOT_Y_POSITIONS = DOT_Y_POSITIONS
+    _DOT_RADIUS = DOT_RADIUS
+
+    # each number is rendered once on to its own surface, which is
+    # then painted on to the canvas. The surfaces are rendered again
+    # whenever the colour or scale they were rendered for changes.
+    _glyph_surfaces = None
+    _glyph_key = None
+
+    def _draw_clock(self):
+        """
+        Draw the clock.
+        """
+        y_pos, y_pos2 = self._DOT_Y_POSITIONS
+
+        # everything is positioned for the default size of the face and
+        # scaled to fit.
+        self._context.save()
+        self._transform_to_layout()
+
+        self._draw_hour_segments()
+        self._draw_double_dots(x_pos=self._DOT_X_POSITIONS[0], y_pos=y_pos,
+                               y_pos2=y_pos2, radius=self._DOT_RADIUS)
+        self._draw_minute_segments()
+
+        if self._show_seconds:
+            self._draw_double_dots(x_pos=self._DOT_X_POSITIONS[1],
+                                   y_pos=y_pos, y_pos2=y_pos2,
+                                   radius=self._DOT_RADIUS)
+            self._draw_second_segments()
+
+        self._context.restore()
+
+    @staticmethod
+    def _get_digits(time):
+        """
+        Return the digits displayed for a particular time.
+
+        @type time: datetime.datetime
+        @param time: Time to get the digits for.
+
+        @rtype: (int, int, int, int, int, int)
+        @return: Tuple containing the tens and units of the hour,
+            minute and second, in the same order as _DIGIT_POSITIONS.
+        """
+        return (divmod(time.hour, 10) + divmod(time.minute, 10) +
+                divmod(time.second, 10))
+
+    def get_visible_state(self, time):
+        """
+        Return the digits displayed for a particular time.
+
+        @type time: datetime.datetime
+        @param time: Time to get the visible state for.
+
+        @rtype: (int, int, int, int, int, int)
+        @return: As returned by _get_digits, without the seconds if they
+            are hidden.
+        """
+        digits = self._get_digits(time)
+        return digits if self._show_seconds else digits[:4]
+
+    def _get_damaged_areas(self, previous_time, current_time):
+        """
+        Return the areas covered by the seven segment displays whose
+        digit has changed between previous_time and current_time.
+
+        @type previous_time: datetime.datetime
+        @param previous_time: Time which is currently displayed.
+
+        @type current_time: datetime.datetime
+        @param current_time: Time which is about to be displayed.
+
+        @rtype: [(int, int, int, int)]
+        @return: List of (x, y, width, height) tuples detailing the
+            areas to redraw.
+        """
+        x_offset, y_offset, width, height = self._DIGIT_AREA
+
+        # without the seconds only the hour and minute digits change.
+        count = len(self._DIGIT_POSITIONS) if self._show_seconds else 4
+
+        digits = zip(self._DIGIT_POSITIONS[:count],
+                     self._get_digits(previous_time),
+                     self._get_digits(current_time))
+
+        return [self._transform_area(x_pos=start_x + x_offset,
+                                     y_pos=start_y + y_offset, width=width,
+                                     height=height)
+                for (start_x, start_y), previous, current in digits
+                if previous != current]
+
+    def _draw_digits(self, first):
+        """
+        Draw a pair of seven segment displays.
+
+        @type first: int
+        @param first: Index of the first of the pair of digits to draw
+            within _DIGIT_POSITIONS.
+        """
+        digits = self._get_digits(self._time)
+
+        for index in (first, first + 1):
+            start_x, start_y = self._DIGIT_POSITIONS[index]
+            self._draw_seven_segment(number=digits[index], start_x=start_x,
+                                     start_y=start_y)
+
+    def _draw_hour_segments(self):
+        """
+        Draw the segments to display the hour.
+        """
+        self._draw_digits(first=0)
+
+    def _draw_minute_segments(self):
+        """
+        Draw the segments to display the minutes.
+        """
+        self._draw_digits(first=2)
+
+    def _draw_second_segments(self):
+        """
+        Draw the segments to display the seconds.
+        """
+        self._draw_digits(first=4)
+
+    def _draw_seven_segment(self, number, start_x, start_y):
+        """
+        Draw the seven segment display by painting the pre-rendered
+        glyph for the number.
+
+        @type number: int
+        @param number: Number to display on the seven segment.
+
+        @type start_x: int
+        @param start_x: Point on the X axis to start drawing the
+            display from.
+
+        @type start_y: int
+        @param start_y: Point on the Y axis to start drawing the
+            display from.
+        """
+        x_offset, y_offset = self._DIGIT_AREA[:2]
+
+        # glyphs are rendered at the resolution of the device so that
+        # they remain sharp if the canvas has been scaled.
+        matrix = self._context.get_matrix()
+        scale = hypot(matrix.xx, matrix.yx)
+
+        self._context.save()
+        self._context.translate(start_x + x_offset, start_y + y_offset)
+        self._context.scale(1.0 / scale, 1.0 / scale)
+        self._context.set_source_surface(
+            self._get_glyph_surfaces(scale=scale)[number], 0, 0)
+        self._context.paint()
+        self._context.restore()
+
+    def _get_glyph_surfaces(self, scale):
+        """
+        Return the pre-rendered glyphs for the numbers 0 to 9, rendering
+        them if the LED colour or scale has changed since they were last
+        rendered.
+
+        @type scale: float
+        @param scale: Scale to render the glyphs at.
+
+        @rtype: [cairo.Surface]
+        @return: List containing the glyph surface for each number.
+        """
+        glyph_key = (self._led_red, self._led_green, self._led_blue, scale)
+
+        if self._glyph_key != glyph_key:
+            width, height = self._DIGIT_AREA[2:]
+            self._glyph_surfaces = [
+                self._render_offscreen(width=ceil(width * scale),
+                                       height=ceil(height * scale),
+                                       draw_func=self._draw_glyph,
+                                       number=number, scale=scale)
+                for number in range(len(SEGMENTS))]
+            self._glyph_key = glyph_key
+
+        return self._glyph_surfaces
+
+    def _draw_glyph(self, number, scale):
+        """
+        Draw the glyph for a number so that it fills the area given by
+        _DIGIT_AREA.
+
+        @type number: int
+        @param number: Number to draw the glyph for.
+
+        @type scale: float
+        @param scale: Scale to draw the glyph at.
+        """
+        x_offset, y_offset = self._DIGIT_AREA[:2]
+
+        self._context.scale(scale, scale)
+        self._draw_segments(number=number, start_x=-x_offset,
+                            start_y=-y_offset)
+
+    def _draw_segments(self, number, start_x, start_y):
+        """
+        Draw each of the segments of the seven segment display.
+
+          a
+        f   b
+          g
+        e   c
+          d
+
+        @type number: int
+        @param number: Number to display on the seven segment.
+
+        @type start_x: int
+        @param start_x: Point on the X axis to start drawing the
+            display from.
+
+        @type start_y: int
+        @param start_y: Point on the Y axis to start drawing the
+            display from.
+        """
+        bitmask = SEGMENTS[number]
+
+        for bit, segment in enumerate(self._SEGMENT_NAMES):
+            on = bool(bitmask >> bit & 1)
+            x_offset, y_offset = self._SEGMENT_OFFSETS[segment]
+
+            if self._SEGMENT_ORIENTATION[segment] == 'h':
+                self._draw_h_led(start_x=(start_x + x_offset),
+                                 start_y=(start_y + y_offset),
+                                 fill=on)
+            else:
+                self._draw_v_led(start_x=(start_x + x_offset),
+                                 start_y=(start_y + y_offset),
+                                 fill=on)
+
+    def _draw_h_led(self, start_x, start_y, fill=True):
+        """
+        Draw a horizontal LED: <=>
+
+        @type start_x: int
+        @param start_x: Point on the X axis to start drawing the LED
+            from.
+
+        @type start_y: int
+        @param start_y: Point on the Y axis to start drawing the LED
+            from.
+
+        @type fill: bool
+        @param fill: If True, set the colour of the LED to the
+            colour_obj instance variable, else set the colour to black.
+        """
+        points = self._get_led_points(orientation='h', start_x=start_x,
+                                      start_y=start_y)
+
+        self._draw_segment(start_x=start_x, start_y=start_y, fill=fill,
+                       points=points)
+
+    def _draw_v_led(self, start_x, start_y, fill=True):
+        """
+        Draw a vertical LED:
+        /\
+        ||
+        \/
+
+        @type start_x: int
+        @param start_x: Point on the X axis to start drawing the LED
+            from.
+
+        @type start_y: int
+        @param start_y: Point on the Y axis to start drawing the LED
+            from.
+
+        @type fill: bool
+        @param fill: If True, set the colour of the LED to the
+            colour_obj instance variable, else set the colour to black.
+        """
+        points = self._get_led_points(orientation='v', start_x=start_x,
+                                      start_y=start_y)
+
+        self._draw_segment(start_x=start_x, start_y=start_y, fill=fill,
+                       points=points)
+
+    # corners of the polygon outlining an LED.
+    _get_led_points = staticmethod(get_led_points)
+
+    def _draw_segment(self, start_x, start_y, points, fill=True):
+        """
+        Draw the LED.
+
+        @type start_x: int
+        @param start_x: Point on the X axis to start drawing the LED
+            from.
+
+        @type start_y: int
+        @param start_y: Point on the Y axis to start drawing the LED
+            from.
+
+        @type points: ( (int, int) )
+        @param points: Tuple containg tuples of X and Y coordinates
+            which will be used to draw the polygon.
+
+        @type fill: bool
+        @param fill: If True, set the colour of the LED to the
+            colour_obj instance variable, else set the colour to black.
+
+        """
+        self._context.save()
+        # self._context.set_line_width(2.5 * self._context.get_line_width())
+
+        self._context.move_to(start_x, start_y)
+
+        for point in points:
+            self._context.line_to(point[0], point[1])
+
+        if fill:
+            self._context.set_source_rgb(self._led_red,
+                                         self._led_green,
+                                         self._led_blue)
+        else:
+            self._context.set_source_rgb(self._led_red * 0.4,
+                                         self._led_green * 0.4,
+                                         self._led_blue * 0.4)
+
+        # LED background
+        self._context.fill_preserve()
+
+        # LED outline.
+        self._context.set_source_rgb(0.0, 0.0, 0.0)
+        self._context.stroke()
+        self._context.restore()
+
+    def _draw_double_dots(self, x_pos, y_pos, y_pos2, radius):
+        """
+        Draw the double dots (:) which separate the hour, minute and
+        seconds.
+
+        @type x_pos: int
+        @param x_pos: Center point along the X axis of the circle.
+
+        @type y_pos: int
+        @param y_pos: Center point along the Y axis to draw the first
+            circle.
+
+        @type y_pos2: int
+        @param y_pos2: Center point along the Y axis to draw the second
+            circle.
+
+        @type radius: int
+        @param radius: Radius of the dots to draw.
+        """
+        self._context.save()
+
+        self._context.arc(x_pos, y_pos, radius, 0, 2 * pi)
+
+        self._context.set_source_rgb(self._led_red, self._led_green,
+                                     self._led_blue)
+        self._context.fill_preserve()
+
+        self._context.set_source_rgb(0.0, 0.0, 0.0)
+        self._context.stroke()
+
+        self._context.arc(x_pos, y_pos2, radius, 0, 2 * pi)
+
+        self._context.set_source_rgb(self._led_red, self._led_green,
+                                     self._led_blue)
+        self._context.fill_preserve()
+
+        self._context.set_source_rgb(0.0, 0.0, 0.0)
+        self._context.stroke()
+
+        self._context.restore()
@@ -0,0 +1,130 @@
+"""
+Module containing the scheduler used to draw animated clocks at a frame
+rate which adapts to how long each frame takes to draw.
+"""
+
+
+# STDLIB IMPORTS
+from timeit import default_timer
+
+# LOCAL IMPORTS
+from _TickScheduler import TickScheduler
+
+
+class FrameScheduler(TickScheduler):
+    """
+    Scheduler which calls a function for every frame of an animation,
+    aiming for a target frame rate.
+
+    The time taken by each frame is measured. If the frames take too
+    long for the target rate, or the scheduler misses frames because the
+    main loop was busy, the frame rate is lowered until the frames fit.
+    It then creeps back up towards the target whilst there is room.
+    As with TickScheduler, late frames are never queued; a single frame
+    is drawn however late the scheduler fires.
+    """
+
+    # proportion of each frame interval the drawing is allowed to take,
+    # leaving the rest of the main loop free to handle events.
+    _BUDGET = 0.5
+
+    # weight given to the latest frame when averaging the frame cost.
+    _SMOOTHING = 0.25
+
+    # factor the frame rate is raised by after each frame which fitted,
+    # until it reaches the target again.
+    _RECOVERY = 1.1
+
+    def __init__(self, callback, fps=30, min_fps=1, history=60,
+                 offset_func=None, epoch=0):
+        """
+        Instantiate an instance of FrameScheduler.
+
+        @type callback: callable
+        @param callback: Function called for every frame. If it returns
+            False the scheduler is stopped.
+
+        @type fps: float
+        @param fps: Target number of frames per second.
+            DEFAULT: 30
+
+        @type min_fps: float
+        @param min_fps: Lowest the frame rate is allowed to drop to.
+            DEFAULT: 1
+
+        @type history: int
+        @param history: Number of frames to keep the lateness of.
+            DEFAULT: 60
+
+        @type offset_func: callable
+        @param offset_func: Function returning how many seconds the time
+            displayed is ahead of the local clock.
+            DEFAULT: None
+
+        @type epoch: float
+        @param epoch: Time, as seconds since the epoch, the frames are
+            counted from.
+            DEFAULT: 0
+        """
+        super(FrameScheduler, self).__init__(callback=self._run_frame,
+                                             interval=1.0 / fps,
+                                             history=history,
+                                             offset_func=offset_func,
+                                             epoch=epoch)
+
+        self._frame_callback = callback
+        self._target_fps = fps
+        self._min_fps = min(min_fps, fps)
+        self._last_missed = 0
+
+        # current frame rate and the average time, in seconds, taken to
+        # run the callback.
+        self.fps = fps
+        self.frame_cost = 0.0
+
+    def _run_frame(self):
+        """
+        Run the callback for a frame, timing it and adapting the frame
+        rate to the time taken.
+
+        @rtype: bool
+        @return: Value returned by the callback.
+        """
+        start = default_timer()
+        result = self._frame_callback()
+        cost = default_timer() - start
+
+        if self.frame_cost:
+            self.frame_cost += self._SMOOTHING * (cost - self.frame_cost)
+        else:
+            self.frame_cost = cost
+
+        overran = self.missed_ticks > self._last_missed
+        self._last_missed = self.missed_ticks
+
+        self._adapt(overran=overran)
+
+        return result
+
+    def _adapt(self, overran):
+        """
+        Work out the frame rate for the next frame.
+
+        @type overran: bool
+        @param overran: Whether the scheduler fired too late for the
+            last frame and skipped any.
+        """
+        # the fastest rate at which frames still fit in the budget.
+        sustainable = self._BUDGET / max(self.frame_cost, 1e-6)
+
+        # frames were skipped, which the frame cost alone may not
+        # explain, e.g. the main loop was busy with something else.
+        if overran:
+            sustainable = min(sustainable, self.fps / 2.0)
+
+        fps = min(self.fps * self._RECOVERY, sustainable)
+        self.fps = max(self._min_fps, min(fps, self._target_fps))
+
+        # the callback runs before the next frame is scheduled, so the
+        # new interval applies straight away.
+        self._interval = 1.0 / self.fps
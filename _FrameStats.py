@@ -0,0 +1,122 @@
+"""
+Module containing the class used to record how long each phase of
+drawing a frame takes.
+"""
+
+
+# STDLIB IMPORTS
+from array import array
+from timeit import default_timer
+
+
+class FrameStats(object):
+    """
+    Fixed-size ring buffer of timings for each phase of a frame.
+
+    Once the buffer is full the oldest timings are overwritten, so the
+    memory used stays the same however long the clock runs for.
+    """
+
+    # phases which are timed:
+    #   update     - the timer callback, including any repaint it causes.
+    #   invalidate - working out and invalidating the damaged areas.
+    #   context    - creating and clipping the cairo context on expose.
+    #   draw       - drawing the clock.
+    #   lateness   - how late the timer fired.
+    PHASES = ("update", "invalidate", "context", "draw", "lateness")
+
+    def __init__(self, size=120):
+        """
+        Instantiate an instance of FrameStats.
+
+        @type size: int
+        @param size: Number of timings to keep for each phase.
+            DEFAULT: 120
+        """
+        self._size = size
+        self._timings = dict((phase, array("d", [0.0] * size))
+                             for phase in self.PHASES)
+        self._counts = dict((phase, 0) for phase in self.PHASES)
+
+        # time each frame was drawn, used to work out the frame rate.
+        self._frame_times = array("d", [0.0] * size)
+        self._frame_count = 0
+
+    def record(self, phase, seconds):
+        """
+        Record how long a phase took.
+
+        @type phase: str
+        @param phase: One of PHASES.
+
+        @type seconds: float
+        @param seconds: Time the phase took, in seconds.
+        """
+        count = self._counts[phase]
+        self._timings[phase][count % self._size] = seconds
+        self._counts[phase] = count + 1
+
+        if phase == "draw":
+            self._frame_times[self._frame_count % self._size] = \
+                default_timer()
+            self._frame_count += 1
+
+    def get_fps(self):
+        """
+        Return the rate frames have been drawn at, over the frames held
+        in the buffer.
+
+        @rtype: float
+        """
+        count = min(self._frame_count, self._size)
+        if count < 2:
+            return 0.0
+
+        last = self._frame_times[(self._frame_count - 1) % self._size]
+        first = self._frame_times[(self._frame_count - count) % self._size]
+
+        return (count - 1) / (last - first) if last > first else 0.0
+
+    def get_stats(self):
+        """
+        Return the statistics for each phase over the timings held in the
+        buffer.
+
+        @rtype: dict[str, dict[str, float]]
+        @return: Dictionary keyed on phase, containing the count of
+            timings recorded in total and the last, average and maximum
+            time in milliseconds. Also contains the frame rate under the
+            'fps' key.
+        """
+        stats = {"fps": self.get_fps()}
+
+        for phase in self.PHASES:
+            count = self._counts[phase]
+            held = min(count, self._size)
+            timings = self._timings[phase][:held]
+
+            if held:
+                last = self._timings[phase][(count - 1) % self._size]
+                stats[phase] = {"count": count,
+                                "last": last * 1000,
+                                "avg": sum(timings) / held * 1000,
+                                "max": max(timings) * 1000}
+            else:
+                stats[phase] = {"count": 0, "last": 0.0, "avg": 0.0,
+                                "max": 0.0}
+
+        return stats
+
+    def format(self):
+        """
+        Return a one line summary of the statistics.
+
+        @rtype: str
+        """
+        stats = self.get_stats()
+
+        return ("fps %.1f | draw last %.2f avg %.2f max %.2f ms | "
+                "update %.2f ms | late %.1f ms" % (
+                    stats["fps"], stats["draw"]["last"],
+                    stats["draw"]["avg"], stats["draw"]["max"],
+                    stats["update"]["avg"], stats["lateness"]["last"]))
@@ -0,0 +1,78 @@
+"""
+Module containing the scheduler used to tick the clocks as fast as they
+can be drawn.
+"""
+
+
+# STDLIB IMPORTS
+from collections import deque
+
+# THIRD PARTY IMPORTS
+from gobject import idle_add, source_remove
+
+
+class IdleScheduler(object):
+    """
+    Scheduler which calls a function whenever the main loop is idle, so
+    a clock showing a simulated time ticks as fast as it can be drawn
+    whilst still handling events between ticks.
+
+    Has the same interface as TickScheduler, so that the two can be
+    swapped.
+    """
+
+    def __init__(self, callback, history=60):
+        """
+        Instantiate an instance of IdleScheduler.
+
+        @type callback: callable
+        @param callback: Function called on every tick. If it returns
+            False the scheduler is stopped.
+
+        @type history: int
+        @param history: Kept for compatibility with TickScheduler.
+            DEFAULT: 60
+        """
+        self._callback = callback
+        self._source_id = None
+
+        # ticks are never late, as they are not due at any time.
+        self.lateness = deque(maxlen=history)
+        self.missed_ticks = 0
+
+    def start(self):
+        """
+        Start the scheduler.
+        """
+        if self._source_id is None:
+            self._source_id = idle_add(self._fire)
+
+    def stop(self):
+        """
+        Stop the scheduler.
+        """
+        if self._source_id is not None:
+            source_remove(self._source_id)
+            self._source_id = None
+
+    def is_running(self):
+        """
+        Return whether the scheduler has been started.
+
+        @rtype: bool
+        """
+        return self._source_id is not None
+
+    def _fire(self):
+        """
+        Called by the main loop whenever it is idle.
+
+        @rtype: bool
+        @return: False to remove the idle handler once the callback
+            returns False.
+        """
+        if self._callback() is False:
+            self._source_id = None
+            return False
+
+        return True
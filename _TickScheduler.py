@@ -0,0 +1,206 @@
+"""
+Module containing the scheduler used to tick the clocks in step with
+the wall clock.
+"""
+
+
+# STDLIB IMPORTS
+from collections import deque
+from math import ceil, floor
+from time import time
+
+# THIRD PARTY IMPORTS
+from gobject import source_remove, timeout_add, timeout_add_seconds
+
+
+class TickScheduler(object):
+    """
+    Scheduler which calls a function on every boundary of an interval
+    of wall clock time, e.g. at the start of every second.
+
+    Rather than firing at a fixed period, which drifts by however long
+    each tick took to run, the delay until the next boundary is worked
+    out every time the scheduler fires. Any ticks missed whilst the main
+    loop was busy are coalesced into a single call, and how late each
+    tick fired is recorded.
+    """
+
+    # time, in seconds, to wait after a boundary before firing. Ensures
+    # the boundary has definitely passed by the time the callback reads
+    # the clock, as the main loop timers only have millisecond
+    # resolution.
+    _WAKE_MARGIN = 0.002
+
+    def __init__(self, callback, interval=1, history=60, coarse=False,
+                 offset_func=None, epoch=0):
+        """
+        Instantiate an instance of TickScheduler.
+
+        @type callback: callable
+        @param callback: Function called on every tick. If it returns
+            False the scheduler is stopped.
+
+        @type interval: int
+        @param interval: Number of seconds between each tick.
+            DEFAULT: 1
+
+        @type history: int
+        @param history: Number of ticks to keep the lateness of.
+            DEFAULT: 60
+
+        @type coarse: bool
+        @param coarse: If True, use a timer with a resolution of whole
+            seconds, which the main loop can fire together with other
+            such timers to save waking up the CPU. Ticks may then fire up
+            to a second late.
+            DEFAULT: False
+
+        @type offset_func: callable
+        @param offset_func: Function returning how many seconds the time
+            displayed is ahead of the local clock, e.g. once corrected
+            by a time server. Ticks are lined up with the boundaries of
+            the time displayed.
+            DEFAULT: None
+
+        @type epoch: float
+        @param epoch: Time, as seconds since the epoch, the boundaries
+            are counted from. Schedulers in different processes given
+            the same epoch tick together, whatever their interval.
+            DEFAULT: 0
+        """
+        self._callback = callback
+        self._interval = interval
+        self._coarse = coarse
+        self._offset_func = offset_func
+        self._epoch = epoch
+
+        self._running = False
+        self._source_id = None
+        self._due = None
+
+        # how late, in seconds, each of the most recent ticks fired.
+        self.lateness = deque(maxlen=history)
+        # number of ticks which were skipped because the scheduler
+        # fired more than an interval late.
+        self.missed_ticks = 0
+
+    def start(self):
+        """
+        Start the scheduler, the first tick will occur on the next
+        boundary.
+        """
+        if not self._running:
+            self._running = True
+            self._schedule(now=time())
+
+    def stop(self):
+        """
+        Stop the scheduler.
+        """
+        self._running = False
+
+        if self._source_id is not None:
+            source_remove(self._source_id)
+            self._source_id = None
+
+    def set_interval(self, interval, coarse=False):
+        """
+        Change the interval between ticks. If the scheduler is running
+        the next tick is moved to the next boundary of the new interval.
+
+        @type interval: int
+        @param interval: Number of seconds between each tick.
+
+        @type coarse: bool
+        @param coarse: If True, use a timer with a resolution of whole
+            seconds.
+            DEFAULT: False
+        """
+        self._interval = interval
+        self._coarse = coarse
+
+        if self._running:
+            self.stop()
+            self.start()
+
+    def is_running(self):
+        """
+        Return whether the scheduler has been started.
+
+        @rtype: bool
+        """
+        return self._running
+
+    def get_next_boundary(self, now):
+        """
+        Return the time of the next interval boundary.
+
+        @type now: float
+        @param now: Current time as seconds since the epoch.
+
+        @rtype: float
+        @return: Time of the next boundary as seconds since the epoch.
+        """
+        return self._epoch + (floor((now - self._epoch) / self._interval) +
+                              1) * self._interval
+
+    def _schedule(self, now):
+        """
+        Schedule the next tick for the next boundary after now.
+
+        @type now: float
+        @param now: Current time as seconds since the epoch.
+        """
+        offset = self._offset_func() if self._offset_func else 0
+
+        self._due = self.get_next_boundary(now=now + offset) - offset
+        self._arm(now=now)
+
+    def _arm(self, now):
+        """
+        Set a timer to fire when the next tick is due.
+
+        @type now: float
+        @param now: Current time as seconds since the epoch.
+        """
+        delay = self._due - now + self._WAKE_MARGIN
+
+        if self._coarse:
+            self._source_id = timeout_add_seconds(max(int(ceil(delay)), 1),
+                                                  self._fire)
+        else:
+            self._source_id = timeout_add(int(delay * 1000), self._fire)
+
+    def _fire(self):
+        """
+        Called by the timer. Run the callback if the tick is due and
+        schedule the next one.
+
+        @rtype: bool
+        @return: Always False, as each timer is only used once.
+        """
+        now = time()
+
+        # the timer can fire slightly early due to rounding, in which
+        # case wait for the remainder rather than ticking twice in the
+        # same interval.
+        if now < self._due:
+            self._arm(now=now)
+            return False
+
+        lateness = now - self._due
+        self.lateness.append(lateness)
+
+        # only one tick is run however late the timer fired, the
+        # clock just shows the current time.
+        self.missed_ticks += int(lateness / self._interval)
+
+        self._source_id = None
+        if self._callback() is False:
+            self._running = False
+
+        # the callback may have stopped the scheduler.
+        if self._running:
+            self._schedule(now=time())
+
+        return False
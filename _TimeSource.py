@@ -0,0 +1,238 @@
+"""
+Module containing the sources of the time displayed by the clocks.
+
+A clock asks its time source for the time on every tick, so swapping the
+source changes what is displayed without the clock knowing; the system
+time, the time at another offset from UTC, a replay of recorded times or
+a simulation which runs faster than real time.
+"""
+
+
+# STDLIB IMPORTS
+from datetime import datetime, timedelta
+
+
+class TimeSource(object):
+    """
+    Base class for the sources of the time displayed by a clock.
+    """
+
+    def now(self):
+        """
+        Return the time to display.
+
+        NEEDS IMPLEMENTING IN THE INHERITING CLASS.
+
+        @rtype: datetime.datetime
+        @return: Time to display, or None once the source has run out
+            of times.
+        """
+        raise NotImplementedError
+
+    def create_scheduler(self, callback):
+        """
+        Return a scheduler which ticks the clock at the pace of the
+        source, for sources which are independent of the wall clock.
+
+        @type callback: callable
+        @param callback: Function called on every tick. If it returns
+            False the scheduler is stopped.
+
+        @rtype: TickScheduler
+        @return: Scheduler with the same interface as TickScheduler, or
+            None to tick in step with the wall clock.
+        """
+        return None
+
+    def get_offset(self):
+        """
+        Return how far the time is ahead of the local clock, for
+        sources which correct it by a fraction of a second, so that
+        ticks can be lined up with the seconds of the time displayed
+        rather than those of the local clock.
+
+        @rtype: float
+        @return: Offset in seconds, 0 by default.
+        """
+        return 0.0
+
+    def get_sync_status(self):
+        """
+        Return the health of any synchronisation of the time with a
+        time server.
+
+        @rtype: dict[str, object]
+        @return: Status of the synchronisation, or None if the time is
+            not synchronised.
+        """
+        return None
+
+    def follows_wall_clock(self):
+        """
+        Return whether the time moves on with the wall clock, so that it
+        can be read at any moment rather than only once a tick.
+
+        @rtype: bool
+        @return: False by default.
+        """
+        return False
+
+
+class SystemTimeSource(TimeSource):
+    """
+    Time source returning the local time of the machine.
+    """
+
+    def now(self):
+        """
+        Return the local time.
+
+        @rtype: datetime.datetime
+        """
+        return datetime.now()
+
+    def follows_wall_clock(self):
+        """
+        Return whether the time moves on with the wall clock.
+
+        @rtype: bool
+        @return: Always True.
+        """
+        return True
+
+
+class OffsetTimeSource(TimeSource):
+    """
+    Time source returning the time at a fixed offset from UTC, i.e. the
+    time in another time zone.
+    """
+
+    def __init__(self, offset):
+        """
+        Instantiate an instance of OffsetTimeSource.
+
+        @type offset: datetime.timedelta
+        @param offset: Offset from UTC.
+        """
+        self._offset = offset
+
+    def now(self):
+        """
+        Return the time at the offset.
+
+        @rtype: datetime.datetime
+        """
+        return datetime.utcnow() + self._offset
+
+    def follows_wall_clock(self):
+        """
+        Return whether the time moves on with the wall clock.
+
+        @rtype: bool
+        @return: Always True.
+        """
+        return True
+
+
+class ReplayTimeSource(TimeSource):
+    """
+    Time source returning a list of recorded times in turn, one per
+    tick.
+    """
+
+    def __init__(self, times, loop=False):
+        """
+        Instantiate an instance of ReplayTimeSource.
+
+        @type times: [datetime.datetime]
+        @param times: Times to return.
+
+        @type loop: bool
+        @param loop: If True, start again from the first time once all
+            of them have been returned.
+            DEFAULT: False
+        """
+        self._times = list(times)
+        self._loop = loop
+        self._index = 0
+
+    def now(self):
+        """
+        Return the next recorded time.
+
+        @rtype: datetime.datetime
+        @return: Next time, or None once all of the times have been
+            returned.
+        """
+        if self._index == len(self._times):
+            if not (self._loop and self._times):
+                return None
+            self._index = 0
+
+        time = self._times[self._index]
+        self._index += 1
+
+        return time
+
+
+class SimulatedTimeSource(TimeSource):
+    """
+    Time source which steps through time by a fixed amount every tick,
+    as fast as the clock can be drawn. Used to check how the clock looks
+    at awkward times, e.g. midnight, and how many frames it can draw a
+    second.
+    """
+
+    def __init__(self, start, step=timedelta(seconds=1), end=None):
+        """
+        Instantiate an instance of SimulatedTimeSource.
+
+        @type start: datetime.datetime
+        @param start: First time to return.
+
+        @type step: datetime.timedelta
+        @param step: Time to step forward every tick.
+            DEFAULT: 1 second
+
+        @type end: datetime.datetime
+        @param end: Time after which the simulation stops, or None to
+            run forever.
+            DEFAULT: None
+        """
+        self._next = start
+        self._step = step
+        self._end = end
+
+        # number of times returned so far.
+        self.count = 0
+
+    def now(self):
+        """
+        Return the next simulated time.
+
+        @rtype: datetime.datetime
+        @return: Next time, or None once past the end.
+        """
+        if self._end is not None and self._next > self._end:
+            return None
+
+        time = self._next
+        self._next += self._step
+        self.count += 1
+
+        return time
+
+    def create_scheduler(self, callback):
+        """
+        Return a scheduler which ticks as fast as the clock can be
+        drawn.
+
+        @type callback: callable
+        @param callback: Function called on every tick.
+
+        @rtype: _IdleScheduler.IdleScheduler
+        """
+        # only imported when simulating, as it needs the main loop.
+        from _IdleScheduler import IdleScheduler
+
+        return IdleScheduler(callback=callback)
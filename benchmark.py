@@ -0,0 +1,311 @@
+#!/usr/bin/python
+
+"""
+Benchmark how quickly each of the clock interfaces draws.
+
+Each interface is drawn headlessly across a range of sizes, LED colours
+and times. The frames per second, per-frame latency and the memory
+blocks each frame leaves allocated are reported, and can be saved as
+JSON to compare against later runs.
+"""
+
+
+# STDLIB IMPORTS
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+import gc
+import json
+import platform
+import sys
+from timeit import default_timer
+
+# THIRD PARTY IMPORTS
+from cairo import (Context, FORMAT_ARGB32, ImageSurface, OPERATOR_CLEAR,
+                   OPERATOR_OVER)
+
+# LOCAL IMPORTS
+from headless import parse_colour
+from interfaces import get_interface_names, load_face
+
+
+# SIZES, AS (WIDTH, HEIGHT), TO BENCHMARK EACH INTERFACE AT BY DEFAULT.
+# A SIZE OF None IS THE DEFAULT SIZE OF THE INTERFACE.
+DEFAULT_SIZES = (None, (200, 200), (1920, 1080), (3840, 2160))
+
+DEFAULT_COLOURS = ("#FF0000", "#00FF00")
+
+
+def _percentile(samples, percent):
+    """
+    Return a percentile of a list of samples using the nearest-rank
+    method.
+
+    @type samples: [float]
+    @param samples: Sorted list of samples.
+
+    @type percent: float
+    @param percent: Percentile to return, between 0 and 100.
+
+    @rtype: float
+    """
+    rank = int(round(percent / 100.0 * (len(samples) - 1)))
+    return samples[rank]
+
+
+def _count_blocks():
+    """
+    Return the number of memory blocks currently allocated by Python.
+    Only blocks which are still allocated are counted, so the difference
+    between two counts is how many blocks were kept, not how many were
+    allocated in between.
+
+    Falls back to the number of objects tracked by the garbage collector
+    where Python does not report its allocated blocks.
+
+    @rtype: int
+    """
+    try:
+        return sys.getallocatedblocks()
+    except AttributeError:
+        return len(gc.get_objects())
+
+
+def _get_times(count, start):
+    """
+    Return a list of times spread evenly over a day, so that each frame
+    draws a different time.
+
+    @type count: int
+    @param count: Number of times to return.
+
+    @type start: datetime.datetime
+    @param start: First time to return.
+
+    @rtype: [datetime.datetime]
+    """
+    step = timedelta(seconds=86400.0 / count)
+    return [start + step * index for index in range(count)]
+
+
+def benchmark(interface, width, height, led_colour, times):
+    """
+    Benchmark drawing an interface.
+
+    @type interface: str
+    @param interface: Interface to benchmark.
+
+    @type width: int
+    @param width: Width to draw the interface at.
+        DEFAULT: Default width of the interface.
+
+    @type height: int
+    @param height: Height to draw the interface at.
+        DEFAULT: Default height of the interface.
+
+    @type led_colour: str
+    @param led_colour: Colour of the LEDs.
+
+    @type times: [datetime.datetime]
+    @param times: Time to draw in each frame.
+
+    @rtype: dict[str, object]
+    @return: Dictionary containing the results. retained_blocks_per_frame
+        is the number of memory blocks each frame leaves allocated, e.g.
+        by growing a cache; blocks allocated and freed again within a
+        frame are not counted.
+    """
+    face = load_face(name=interface)()
+    red, green, blue = parse_colour(spec=led_colour)
+    face.set_led_colour(red=red, green=green, blue=blue)
+
+    width = width or face._DEFAULT_WIDTH
+    height = height or face._DEFAULT_HEIGHT
+
+    surface = ImageSurface(FORMAT_ARGB32, width, height)
+
+    def new_context():
+        # each frame is drawn on to a fresh, cleared context, as it
+        # would be by an expose.
+        context = Context(surface)
+        context.set_operator(OPERATOR_CLEAR)
+        context.paint()
+        context.set_operator(OPERATOR_OVER)
+        return context
+
+    # the first frame renders anything the face caches, so is timed
+    # separately from the rest.
+    context = new_context()
+    start = default_timer()
+    face.render(context=context, time=times[0], width=width, height=height)
+    first_frame = default_timer() - start
+
+    latencies = []
+    gc.disable()
+    try:
+        blocks = _count_blocks()
+        for time in times:
+            context = new_context()
+
+            start = default_timer()
+            face.render(context=context, time=time, width=width,
+                        height=height)
+            latencies.append(default_timer() - start)
+
+        blocks = _count_blocks() - blocks
+    finally:
+        gc.enable()
+
+    latencies.sort()
+    total = sum(latencies)
+
+    return {"interface": interface,
+            "width": width,
+            "height": height,
+            "led_colour": led_colour,
+            "frames": len(latencies),
+            "fps": len(latencies) / total if total else None,
+            "mean_ms": total / len(latencies) * 1000,
+            "p50_ms": _percentile(latencies, 50) * 1000,
+            "p99_ms": _percentile(latencies, 99) * 1000,
+            "first_frame_ms": first_frame * 1000,
+            "retained_blocks_per_frame": float(blocks) / len(latencies)}
+
+
+def _result_key(result):
+    """
+    Return the key used to match up results between runs.
+
+    @type result: dict[str, object]
+    @param result: Result returned by benchmark.
+
+    @rtype: (str, int, int, str)
+    """
+    return (result["interface"], result["width"], result["height"],
+            result["led_colour"])
+
+
+def _print_results(results, previous=None):
+    """
+    Print a table of results.
+
+    @type results: [dict[str, object]]
+    @param results: Results returned by benchmark.
+
+    @type previous: [dict[str, object]]
+    @param previous: Results from a previous run to compare against.
+    """
+    previous = dict((_result_key(result), result)
+                    for result in previous or [])
+
+    sys.stdout.write("%-9s %11s %-8s %10s %9s %9s %9s %8s\n" % (
+        "interface", "size", "colour", "fps", "p50 ms", "p99 ms",
+        "first ms", "retained"))
+
+    for result in results:
+        line = "%-9s %11s %-8s %10.1f %9.3f %9.3f %9.3f %8.1f" % (
+            result["interface"],
+            "%dx%d" % (result["width"], result["height"]),
+            result["led_colour"], result["fps"], result["p50_ms"],
+            result["p99_ms"], result["first_frame_ms"],
+            result["retained_blocks_per_frame"])
+
+        old = previous.get(_result_key(result))
+        if old and old["fps"]:
+            line += "  (%+.1f%% fps)" % (
+                (result["fps"] / old["fps"] - 1) * 100)
+
+        sys.stdout.write(line + "\n")
+
+
+def _parse_size(value):
+    """
+    Parse a size given on the command line as WIDTHxHEIGHT.
+
+    @type value: str
+    @param value: Size to parse, or 'default'.
+
+    @rtype: (int, int)
+    @return: Width and height, or None for the default size.
+    """
+    if value == "default":
+        return None
+
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def _parse_arguments():
+    """
+    Parse the command line arguments.
+
+    @rtype: dict[str, object]
+    @return: Dictionary containing key/value pairs.
+    """
+    description = "Benchmark drawing the clock interfaces."
+    parser = ArgumentParser(description=description)
+
+    parser.add_argument("-i", "--interface", action="append",
+                        choices=get_interface_names(), dest="interfaces",
+                        help="Interface to benchmark. May be repeated. "
+                             "DEFAULT: all")
+
+    parser.add_argument("-s", "--size", action="append", type=_parse_size,
+                        dest="sizes",
+                        help="WIDTHxHEIGHT or 'default'. May be repeated.")
+
+    parser.add_argument("-l", "--led-colour", action="append",
+                        dest="led_colours",
+                        help="LED colour. May be repeated.")
+
+    parser.add_argument("-f", "--frames", default=200, type=int,
+                        help="Number of frames to draw per benchmark.")
+
+    parser.add_argument("-o", "--output",
+                        help="File to save the results to as JSON.")
+
+    parser.add_argument("-c", "--compare",
+                        help="JSON results of a previous run to compare "
+                             "against.")
+
+    _args = parser.parse_args()
+
+    return {'interfaces': _args.interfaces or get_interface_names(),
+            'sizes': _args.sizes or list(DEFAULT_SIZES),
+            'led_colours': _args.led_colours or list(DEFAULT_COLOURS),
+            'frames': _args.frames,
+            'output': _args.output,
+            'compare': _args.compare}
+
+
+if __name__ == "__main__":
+    args = _parse_arguments()
+
+    # start just before midnight so every field changes during the run.
+    times = _get_times(count=args.get("frames"),
+                       start=datetime(2000, 12, 31, 23, 59, 50))
+
+    results = []
+    for interface in args.get("interfaces"):
+        for size in args.get("sizes"):
+            width, height = size or (None, None)
+
+            for led_colour in args.get("led_colours"):
+                results.append(benchmark(interface=interface, width=width,
+                                         height=height,
+                                         led_colour=led_colour,
+                                         times=times))
+
+    previous = None
+    if args.get("compare"):
+        with open(args.get("compare")) as fobj:
+            previous = json.load(fobj).get("results")
+
+    _print_results(results=results, previous=previous)
+
+    if args.get("output"):
+        with open(args.get("output"), "w") as fobj:
+            json.dump({"created": datetime.now().isoformat(),
+                       "python": platform.python_version(),
+                       "platform": platform.platform(),
+                       "results": results},
+                      fobj, indent=2, sort_keys=True)
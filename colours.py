@@ -0,0 +1,39 @@
+"""
+Parsing of the colours given for the LEDs of the clocks.
+
+Nothing here depends on cairo or GTK, so it can be used wherever the
+clocks are displayed.
+"""
+
+
+def parse_colour(spec):
+    """
+    Parse a colour specification in to its RGB components.
+
+    @type spec: str
+    @param spec: Either a hex RGB (#FF00FF) or a valid X11 colour name.
+
+    @rtype: (float, float, float)
+    @return: Red, green and blue components of the colour, each between
+        0 and 1.
+
+    @raise ValueError: If the colour specification can not be parsed.
+    """
+    digits = spec[1:]
+    if spec.startswith("#") and len(digits) in (3, 6, 9, 12):
+        size = len(digits) // 3
+        try:
+            return tuple(int(digits[index:index + size], 16) /
+                         float(16 ** size - 1)
+                         for index in range(0, len(digits), size))
+        except ValueError:
+            pass
+
+    # colour names are looked up by pango, which unlike gtk does not
+    # need a display. It is only imported when needed, so hex colours
+    # can be used where pango is not installed.
+    from pango import Color
+
+    colour = Color(spec)
+    return (colour.red / 65535.0, colour.green / 65535.0,
+            colour.blue / 65535.0)
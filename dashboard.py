@@ -0,0 +1,65 @@
+#!/usr/bin/python
+
+"""
+Dashboard of clocks, in different time zones, using PyGTK2.
+"""
+
+
+# STDLIB IMPORTS
+import sys
+
+# THIRD PARTY IMPORTS
+from gtk.gdk import color_parse
+import gtk
+
+# LOCAL IMPORTS
+from _BasePyClock import BasePyClock
+from _DashboardFace import DashboardFace
+from interfaces import parse_tile
+
+
+class DashboardPyClock(DashboardFace, BasePyClock):
+    """
+    Class implementing a window containing a grid of clocks.
+
+    All of the clocks are driven by the one timer of the window, from a
+    single reading of the time, and are repainted together.
+    """
+
+    def __init__(self, tiles, led_colour="red", columns=None):
+        """
+        Instantiate an instance of DashboardPyClock.
+
+        @type tiles: [(str, datetime.timedelta)]
+        @param tiles: Interface and offset from UTC of each clock, as
+            returned by interfaces.parse_tile.
+
+        @type led_colour: str
+        @param led_colour: Colour of the LED's.
+            DEFAULT: red
+
+        @type columns: int
+        @param columns: Number of columns in the grid.
+            DEFAULT: Enough to make the grid roughly square.
+        """
+        columns, rows = self.get_grid_size(count=len(tiles),
+                                           columns=columns)
+
+        super(DashboardPyClock, self).__init__(
+            title="Dashboard PyClock",
+            init_width=columns * self._TILE_SIZE,
+            init_height=rows * self._TILE_SIZE)
+
+        colour_obj = color_parse(spec=led_colour)
+        self.set_led_colour(red=colour_obj.red / 65535.0,
+                            green=colour_obj.green / 65535.0,
+                            blue=colour_obj.blue / 65535.0)
+
+        self.set_tiles(tiles=tiles, columns=columns)
+
+
+if __name__ == "__main__":
+    DashboardPyClock(tiles=[parse_tile(spec) for spec in sys.argv[1:]] or
+                     [parse_tile("analogue")])
+
+    gtk.main()
@@ -0,0 +1,436 @@
+#!/usr/bin/python
+
+"""
+Record what the clock interfaces draw as display lists; the cairo
+operations issued to draw a frame, which can be replayed on to any
+cairo context.
+
+Recording a frame runs the face against a RecordingContext instead of a
+cairo context. Each display list is cached by what the face displays,
+so a frame which looks the same as one already recorded is replayed
+rather than drawn again.
+
+Run as a script to count the operations each interface draws a frame
+with.
+"""
+
+
+# STDLIB IMPORTS
+from argparse import ArgumentParser
+from collections import OrderedDict
+from datetime import datetime
+import sys
+
+# THIRD PARTY IMPORTS
+from cairo import FORMAT_ARGB32, ImageSurface, Matrix
+
+# LOCAL IMPORTS
+from interfaces import get_interface_names, load_face
+
+
+# OPERATIONS WHICH ARE RECORDED AS THEY ARE, WITHOUT THE RECORDING
+# CONTEXT KEEPING TRACK OF ANY STATE FOR THEM.
+_RECORDED = frozenset(["arc", "clip", "close_path", "fill", "fill_preserve",
+                       "line_to", "move_to", "new_path", "paint",
+                       "rectangle", "set_operator", "set_source_rgb",
+                       "set_source_rgba", "set_source_surface", "stroke"])
+
+# LINE WIDTH OF A NEW CAIRO CONTEXT.
+_DEFAULT_LINE_WIDTH = 2.0
+
+
+class DisplayList(object):
+    """
+    List of the cairo operations which draw a frame, each held as a
+    tuple of the name of the context method and its arguments.
+
+    Operations which paint a surface, e.g. the pre-rendered analogue
+    clock face, refer to the surface itself, so a display list can only
+    be replayed within the process which recorded it.
+    """
+
+    def __init__(self, width, height, operations=()):
+        """
+        Instantiate an instance of DisplayList.
+
+        @type width: int
+        @param width: Width of the frame.
+
+        @type height: int
+        @param height: Height of the frame.
+
+        @type operations: [(str, tuple)]
+        @param operations: Operations drawing the frame.
+            DEFAULT: ()
+        """
+        self.width = width
+        self.height = height
+        self.operations = list(operations)
+
+    def __len__(self):
+        """
+        Return the number of operations in the list.
+
+        @rtype: int
+        """
+        return len(self.operations)
+
+    def __eq__(self, other):
+        """
+        Return whether another display list draws exactly the same.
+
+        @rtype: bool
+        """
+        return (isinstance(other, DisplayList) and
+                (self.width, self.height, self.operations) ==
+                (other.width, other.height, other.operations))
+
+    def __ne__(self, other):
+        """
+        Return whether another display list draws anything differently.
+
+        @rtype: bool
+        """
+        return not self == other
+
+    # display lists are mutable whilst being recorded.
+    __hash__ = None
+
+    def replay(self, context):
+        """
+        Replay the operations on to a cairo context.
+
+        @type context: cairo.Context
+        @param context: Context to draw on to.
+        """
+        methods = {}
+        for name, args in self.operations:
+            method = methods.get(name)
+            if method is None:
+                method = methods[name] = getattr(context, name)
+            method(*args)
+
+    def diff(self, other):
+        """
+        Return the operations which differ from another display list,
+        e.g. the previous frame.
+
+        @type other: DisplayList
+        @param other: Display list to compare against.
+
+        @rtype: [(int, (str, tuple))]
+        @return: Index and operation of each operation in this list
+            which is not the same in the other list, including any past
+            the end of it.
+        """
+        changed = []
+        for index, operation in enumerate(self.operations):
+            if (index >= len(other.operations) or
+                    other.operations[index] != operation):
+                changed.append((index, operation))
+
+        return changed
+
+    def count_operations(self):
+        """
+        Return how many of each operation the list contains.
+
+        @rtype: dict[str, int]
+        """
+        counts = {}
+        for name, _ in self.operations:
+            counts[name] = counts.get(name, 0) + 1
+
+        return counts
+
+
+class RecordingContext(object):
+    """
+    Stand in for a cairo context which records the operations drawn on
+    to it in to a display list, rather than drawing them.
+
+    The faces read some state back from the context whilst drawing; the
+    line width, the transform and the clip. The line width and the
+    translation and scale of the transform are tracked, and the clip is
+    always reported as the whole frame, so everything is recorded.
+    Offscreen surfaces are created similar to a real target surface, so
+    that those the faces cache can be used on any context.
+    """
+
+    def __init__(self, display_list, target=None):
+        """
+        Instantiate an instance of RecordingContext.
+
+        @type display_list: DisplayList
+        @param display_list: Display list to record in to.
+
+        @type target: cairo.Surface
+        @param target: Surface any offscreen surfaces are created
+            similar to.
+            DEFAULT: A 1x1 ARGB32 image surface.
+        """
+        self._display_list = display_list
+        self._operations = display_list.operations
+        self._target = target or ImageSurface(FORMAT_ARGB32, 1, 1)
+
+        # line width and (scale x, scale y, translate x, translate y),
+        # with the values saved by each save.
+        self._line_width = _DEFAULT_LINE_WIDTH
+        self._transform = (1.0, 1.0, 0.0, 0.0)
+        self._saved = []
+
+    def __getattr__(self, name):
+        """
+        Return a function recording an operation which needs no state
+        tracking.
+
+        @raise AttributeError: If the operation is not supported.
+        """
+        if name not in _RECORDED:
+            raise AttributeError("%s can not be recorded" % name)
+
+        operations = self._operations
+
+        def record(*args):
+            operations.append((name, args))
+
+        return record
+
+    def get_target(self):
+        """
+        Return the surface offscreen surfaces are created similar to.
+
+        @rtype: cairo.Surface
+        """
+        return self._target
+
+    def save(self):
+        """
+        Record a save of the state.
+        """
+        self._saved.append((self._line_width, self._transform))
+        self._operations.append(("save", ()))
+
+    def restore(self):
+        """
+        Record a restore of the state.
+        """
+        self._line_width, self._transform = self._saved.pop()
+        self._operations.append(("restore", ()))
+
+    def get_line_width(self):
+        """
+        Return the current line width.
+
+        @rtype: float
+        """
+        return self._line_width
+
+    def set_line_width(self, width):
+        """
+        Record a change of the line width.
+
+        @type width: float
+        @param width: New line width.
+        """
+        self._line_width = width
+        self._operations.append(("set_line_width", (width,)))
+
+    def translate(self, x_pos, y_pos):
+        """
+        Record a translation of the transform.
+
+        @type x_pos: float
+        @param x_pos: Amount to translate along the X axis.
+
+        @type y_pos: float
+        @param y_pos: Amount to translate along the Y axis.
+        """
+        scale_x, scale_y, offset_x, offset_y = self._transform
+        self._transform = (scale_x, scale_y, offset_x + scale_x * x_pos,
+                           offset_y + scale_y * y_pos)
+        self._operations.append(("translate", (x_pos, y_pos)))
+
+    def scale(self, scale_x, scale_y):
+        """
+        Record a scale of the transform.
+
+        @type scale_x: float
+        @param scale_x: Scale along the X axis.
+
+        @type scale_y: float
+        @param scale_y: Scale along the Y axis.
+        """
+        old_x, old_y, offset_x, offset_y = self._transform
+        self._transform = (old_x * scale_x, old_y * scale_y, offset_x,
+                           offset_y)
+        self._operations.append(("scale", (scale_x, scale_y)))
+
+    def get_matrix(self):
+        """
+        Return the current transform.
+
+        @rtype: cairo.Matrix
+        """
+        scale_x, scale_y, offset_x, offset_y = self._transform
+        return Matrix(scale_x, 0, 0, scale_y, offset_x, offset_y)
+
+    def clip_extents(self):
+        """
+        Return the whole frame in user space, as the clip is not
+        tracked.
+
+        @rtype: (float, float, float, float)
+        @return: Tuple of (x1, y1, x2, y2).
+        """
+        scale_x, scale_y, offset_x, offset_y = self._transform
+        return (-offset_x / scale_x, -offset_y / scale_y,
+                (self._display_list.width - offset_x) / scale_x,
+                (self._display_list.height - offset_y) / scale_y)
+
+
+def record_face(face, time, width, height, target=None):
+    """
+    Record the operations which draw the whole of a face.
+
+    @type face: BaseFace
+    @param face: Face to record.
+
+    @type time: datetime.datetime
+    @param time: Time to display.
+
+    @type width: int
+    @param width: Width to draw the face at.
+
+    @type height: int
+    @param height: Height to draw the face at.
+
+    @type target: cairo.Surface
+    @param target: Surface any offscreen surfaces are created similar
+        to.
+        DEFAULT: A 1x1 ARGB32 image surface.
+
+    @rtype: DisplayList
+    """
+    display_list = DisplayList(width=width, height=height)
+    face.render(context=RecordingContext(display_list=display_list,
+                                         target=target),
+                time=time, width=width, height=height)
+
+    return display_list
+
+
+class FrameRecorder(object):
+    """
+    Class used to record the frames of a face, caching the display list
+    of each by what the face displays.
+    """
+
+    def __init__(self, face, max_frames=64, target=None):
+        """
+        Instantiate an instance of FrameRecorder.
+
+        @type face: BaseFace
+        @param face: Face to record.
+
+        @type max_frames: int
+        @param max_frames: Number of display lists to cache. The least
+            recently used are dropped.
+            DEFAULT: 64
+
+        @type target: cairo.Surface
+        @param target: Surface any offscreen surfaces are created
+            similar to.
+            DEFAULT: A 1x1 ARGB32 image surface.
+        """
+        self._face = face
+        self._max_frames = max_frames
+        self._target = target
+        self._frames = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, time, width, height):
+        """
+        Return the display list of a frame, only recording it if nothing
+        which looks the same has already been recorded.
+
+        @type time: datetime.datetime
+        @param time: Time to display.
+
+        @type width: int
+        @param width: Width of the frame.
+
+        @type height: int
+        @param height: Height of the frame.
+
+        @rtype: DisplayList
+        """
+        key = (width, height, self._face.get_visible_state(time))
+
+        display_list = self._frames.pop(key, None)
+        if display_list is None:
+            self.misses += 1
+            display_list = record_face(face=self._face, time=time,
+                                       width=width, height=height,
+                                       target=self._target)
+        else:
+            self.hits += 1
+
+        self._frames[key] = display_list
+        if len(self._frames) > self._max_frames:
+            self._frames.popitem(last=False)
+
+        return display_list
+
+    def clear(self):
+        """
+        Drop every cached display list, e.g. after the colour of the
+        face has been changed.
+        """
+        self._frames.clear()
+
+
+def _parse_arguments():
+    """
+    Parse the command line arguments.
+
+    @rtype: dict[str, str]
+    @return: Dictionary containing key/value pairs.
+    """
+    description = ("Count the cairo operations each interface draws a "
+                   "frame with.")
+    parser = ArgumentParser(description=description)
+
+    parser.add_argument("-i", "--interface", action="append",
+                        choices=get_interface_names(), dest="interfaces",
+                        help="Interface to count. May be repeated. "
+                             "DEFAULT: all")
+
+    parser.add_argument("--width", default=None, type=int)
+
+    parser.add_argument("--height", default=None, type=int)
+
+    _args = parser.parse_args()
+
+    return {'interfaces': _args.interfaces or get_interface_names(),
+            'width': _args.width,
+            'height': _args.height}
+
+
+if __name__ == "__main__":
+    args = _parse_arguments()
+
+    for interface in args.get("interfaces"):
+        face = load_face(name=interface)()
+        display_list = record_face(
+            face=face, time=datetime.now(),
+            width=args.get("width") or face._DEFAULT_WIDTH,
+            height=args.get("height") or face._DEFAULT_HEIGHT)
+
+        counts = display_list.count_operations()
+        sys.stdout.write("%-9s %5d  %s\n" % (
+            interface, len(display_list),
+            ", ".join("%s %d" % (name, counts[name])
+                      for name in sorted(counts))))
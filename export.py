@@ -0,0 +1,290 @@
+"""
+Export every frame of a clock interface over a range of time, e.g. to
+produce clock overlay footage.
+
+Frames are rendered headlessly across a pool of processes and written
+either as a numbered sequence of PNGs or as a stream of raw ARGB32
+frames. Both can be resumed if an export is interrupted.
+"""
+
+
+# STDLIB IMPORTS
+from multiprocessing import cpu_count, Pool
+import os
+import sys
+
+# LOCAL IMPORTS
+from headless import HeadlessRenderer
+
+
+# NAME OF EACH PNG FRAME, NUMBERED BY ITS POSITION WITHIN THE EXPORT.
+FRAME_NAME = "frame_%08d.png"
+
+# NUMBER OF FRAMES HANDED TO A WORKER PROCESS AT A TIME.
+_CHUNK_SIZE = 64
+
+# renderer belonging to the current worker process. Kept between frames
+# so that anything the face caches is only rendered once per process.
+_renderer = None
+
+
+def _init_worker(interface, width, height, led_colour):
+    """
+    Create the renderer used by a worker process.
+
+    @type interface: str
+    @param interface: Interface to render.
+
+    @type width: int
+    @param width: Width of each frame.
+
+    @type height: int
+    @param height: Height of each frame.
+
+    @type led_colour: str
+    @param led_colour: Colour of the LEDs.
+    """
+    global _renderer
+    _renderer = HeadlessRenderer(interface=interface, width=width,
+                                 height=height, led_colour=led_colour)
+
+
+def _render_png(task):
+    """
+    Render a frame to a PNG file.
+
+    The frame is written to a temporary file which is then renamed, so a
+    frame file only ever exists once it is complete.
+
+    @type task: (int, datetime.datetime, str)
+    @param task: Index, time and path of the frame.
+
+    @rtype: int
+    @return: Index of the rendered frame.
+    """
+    index, time, path = task
+
+    temp_path = path + ".part"
+    _renderer.render_to_png(time=time, fobj=temp_path)
+    os.rename(temp_path, path)
+
+    return index
+
+
+def _render_raw(task):
+    """
+    Render a frame to raw ARGB32 pixel data.
+
+    @type task: (int, datetime.datetime)
+    @param task: Index and time of the frame.
+
+    @rtype: bytes
+    @return: Pixel data of the frame.
+    """
+    _, time = task
+    return bytes(_renderer.render_to_buffer(time=time))
+
+
+def get_frame_times(start, end, step):
+    """
+    Return the time of every frame in a range.
+
+    @type start: datetime.datetime
+    @param start: Time of the first frame.
+
+    @type end: datetime.datetime
+    @param end: Time after which there are no more frames.
+
+    @type step: datetime.timedelta
+    @param step: Time between each frame.
+
+    @rtype: [datetime.datetime]
+    """
+    count = int((end - start).total_seconds() //
+                step.total_seconds()) + 1
+    return [start + step * index for index in range(max(count, 0))]
+
+
+def export_frames(interface, start, end, step, output, frame_format="png",
+                  width=None, height=None, led_colour="red", jobs=None,
+                  resume=False):
+    """
+    Export every frame of an interface over a range of time.
+
+    @type interface: str
+    @param interface: Interface to render.
+
+    @type start: datetime.datetime
+    @param start: Time of the first frame.
+
+    @type end: datetime.datetime
+    @param end: Time after which there are no more frames.
+
+    @type step: datetime.timedelta
+    @param step: Time between each frame.
+
+    @type output: str
+    @param output: Directory to write the PNG frames to, or the file to
+        write the raw frames to ('-' for stdout).
+
+    @type frame_format: str
+    @param frame_format: Either 'png' or 'raw'.
+        DEFAULT: png
+
+    @type width: int
+    @param width: Width of each frame.
+        DEFAULT: Default width of the interface.
+
+    @type height: int
+    @param height: Height of each frame.
+        DEFAULT: Default height of the interface.
+
+    @type led_colour: str
+    @param led_colour: Colour of the LEDs.
+        DEFAULT: red
+
+    @type jobs: int
+    @param jobs: Number of worker processes.
+        DEFAULT: Number of CPUs.
+
+    @type resume: bool
+    @param resume: If True, frames which have already been exported are
+        not rendered again.
+        DEFAULT: False
+
+    @rtype: int
+    @return: Number of frames rendered.
+    """
+    times = get_frame_times(start=start, end=end, step=step)
+
+    # the renderer fills in the default size of the interface, which
+    # every worker needs to agree on.
+    renderer = HeadlessRenderer(interface=interface, width=width,
+                                height=height, led_colour=led_colour)
+
+    pool = Pool(processes=jobs or cpu_count(), initializer=_init_worker,
+                initargs=(interface, renderer.width, renderer.height,
+                          led_colour))
+    try:
+        if frame_format == "raw":
+            frame_size = renderer.stride * renderer.height
+            rendered = _export_raw(pool=pool, times=times, output=output,
+                                   frame_size=frame_size, resume=resume)
+        else:
+            rendered = _export_png(pool=pool, times=times, output=output,
+                                   resume=resume)
+
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+    return rendered
+
+
+def _export_png(pool, times, output, resume):
+    """
+    Export frames as a numbered sequence of PNG files.
+
+    @type pool: multiprocessing.Pool
+    @param pool: Pool of worker processes.
+
+    @type times: [datetime.datetime]
+    @param times: Time of each frame.
+
+    @type output: str
+    @param output: Directory to write the frames to.
+
+    @type resume: bool
+    @param resume: If True, frames which already exist are skipped.
+
+    @rtype: int
+    @return: Number of frames rendered.
+    """
+    if not os.path.isdir(output):
+        os.makedirs(output)
+
+    existing = set(os.listdir(output)) if resume else set()
+
+    tasks = [(index, time, os.path.join(output, FRAME_NAME % index))
+             for index, time in enumerate(times)
+             if FRAME_NAME % index not in existing]
+
+    rendered = 0
+    for _ in pool.imap_unordered(_render_png, tasks, _CHUNK_SIZE):
+        rendered += 1
+        _report_progress(done=rendered, total=len(tasks))
+
+    return rendered
+
+
+def _export_raw(pool, times, output, frame_size, resume):
+    """
+    Export frames as a stream of raw ARGB32 frames, in order.
+
+    @type pool: multiprocessing.Pool
+    @param pool: Pool of worker processes.
+
+    @type times: [datetime.datetime]
+    @param times: Time of each frame.
+
+    @type output: str
+    @param output: File to write the frames to, or '-' for stdout.
+
+    @type frame_size: int
+    @param frame_size: Size, in bytes, of each frame.
+
+    @type resume: bool
+    @param resume: If True, frames already in the file are skipped. Any
+        partially written frame at the end of the file is discarded.
+
+    @rtype: int
+    @return: Number of frames rendered.
+    """
+    first = 0
+
+    if output == "-":
+        fobj = getattr(sys.stdout, "buffer", sys.stdout)
+    elif resume and os.path.exists(output):
+        fobj = open(output, "r+b")
+        first = os.path.getsize(output) // frame_size
+        fobj.truncate(first * frame_size)
+        fobj.seek(first * frame_size)
+    else:
+        fobj = open(output, "wb")
+
+    tasks = list(enumerate(times))[first:]
+
+    rendered = 0
+    try:
+        # imap returns the frames in order however the work is split
+        # between the workers.
+        for frame in pool.imap(_render_raw, tasks, _CHUNK_SIZE):
+            fobj.write(frame)
+            rendered += 1
+            _report_progress(done=rendered, total=len(tasks))
+    finally:
+        if output == "-":
+            fobj.flush()
+        else:
+            fobj.close()
+
+    return rendered
+
+
+def _report_progress(done, total):
+    """
+    Report the progress of an export on stderr.
+
+    @type done: int
+    @param done: Number of frames rendered so far.
+
+    @type total: int
+    @param total: Number of frames to render.
+    """
+    if done % 1000 == 0 or done == total:
+        sys.stderr.write("\r%d/%d frames" % (done, total))
+        if done == total:
+            sys.stderr.write("\n")
@@ -0,0 +1,372 @@
+"""
+Share the frames of a clock with other local processes through a
+memory mapped ring buffer.
+
+The file starts with a header describing the frames, followed by a
+number of slots, each holding a small header and the ARGB32 pixels of
+one frame:
+
+    file header (64 bytes):
+        magic      4s  b"PYCK"
+        version    H
+        slots      H   number of slots
+        latest     Q   sequence number of the latest complete frame,
+                       0 until the first frame has been written
+        width      I
+        height     I
+        stride     I   bytes between the start of each row
+
+    each slot (64 bytes + stride * height):
+        lock       Q   even whilst the slot is stable, odd whilst it is
+                       being written
+        sequence   Q   sequence number of the frame, from 1
+        timestamp  d   time displayed, as seconds since the epoch
+        width      I
+        height     I
+        stride     I
+        pixels         native endian, premultiplied ARGB32
+
+Frame n is written to slot n % slots. The lock of the slot is used as a
+sequence lock; a reader records it before reading a frame and checks it
+has not changed afterwards, so it never uses a frame which was being
+overwritten whilst it was read.
+"""
+
+
+# STDLIB IMPORTS
+from collections import namedtuple
+from ctypes import c_char
+import mmap
+import os
+import struct
+from time import mktime
+
+# THIRD PARTY IMPORTS
+from cairo import FORMAT_ARGB32, ImageSurface
+
+# LOCAL IMPORTS
+from headless import render_face
+
+
+MAGIC = b"PYCK"
+VERSION = 1
+
+_FILE_HEADER = struct.Struct("<4sHHQIII")
+_SLOT_HEADER = struct.Struct("<QQdIII")
+_LOCK = struct.Struct("<Q")
+
+# OFFSET OF THE LATEST SEQUENCE NUMBER WITHIN THE FILE HEADER.
+_LATEST_OFFSET = 8
+
+# SPACE RESERVED FOR THE FILE AND SLOT HEADERS, KEEPING THE PIXELS OF
+# EACH SLOT ALIGNED.
+_HEADER_SIZE = 64
+
+# NUMBER OF TIMES A READER TRIES TO READ A FRAME WHICH KEEPS BEING
+# OVERWRITTEN BEFORE GIVING UP.
+_READ_ATTEMPTS = 100
+
+
+# FRAME READ FROM THE RING. data IS EITHER A COPY OF THE PIXELS OR, FOR
+# FRAMES RETURNED BY FrameRingReader.view_latest, A VIEW OF THEM.
+Frame = namedtuple("Frame", ["sequence", "timestamp", "width", "height",
+                             "stride", "data"])
+
+
+def _get_slot_size(stride, height):
+    """
+    Return the size of each slot of a ring.
+
+    @type stride: int
+    @param stride: Bytes between the start of each row of a frame.
+
+    @type height: int
+    @param height: Height of each frame.
+
+    @rtype: int
+    """
+    return _HEADER_SIZE + stride * height
+
+
+def _get_view(memory_map, start, end):
+    """
+    Return a view of part of a memory map, without copying it.
+
+    @type memory_map: mmap.mmap
+    @param memory_map: Memory map to view.
+
+    @type start: int
+    @param start: Offset of the start of the view.
+
+    @type end: int
+    @param end: Offset of the end of the view.
+
+    @rtype: memoryview
+    """
+    try:
+        return memoryview(memory_map)[start:end]
+    except TypeError:
+        # memory maps only support the old buffer interface in Python 2.
+        return buffer(memory_map, start, end - start)
+
+
+class FrameRingWriter(object):
+    """
+    Class used to render frames of a clock in to a ring buffer.
+
+    Each slot of the ring is wrapped in a cairo surface, so frames are
+    rendered straight in to the shared memory without being copied.
+    Only one writer may use a ring at a time.
+    """
+
+    def __init__(self, path, width, height, slots=3):
+        """
+        Instantiate an instance of FrameRingWriter, creating the ring
+        buffer file. Any existing file is replaced, rather than
+        overwritten, so readers which still have it mapped keep reading
+        the old ring until they open the new one.
+
+        @type path: str
+        @param path: Path of the file, e.g. under /dev/shm.
+
+        @type width: int
+        @param width: Width of each frame.
+
+        @type height: int
+        @param height: Height of each frame.
+
+        @type slots: int
+        @param slots: Number of frames held in the ring. Readers have
+            until slots - 1 more frames have been written to use a frame
+            they are viewing without copying.
+            DEFAULT: 3
+        """
+        self.width = width
+        self.height = height
+        self.stride = ImageSurface.format_stride_for_width(FORMAT_ARGB32,
+                                                           width)
+        self._slots = slots
+        self._slot_size = _get_slot_size(stride=self.stride, height=height)
+        self._sequence = 0
+
+        size = _HEADER_SIZE + slots * self._slot_size
+
+        # truncating a file which is mapped by a reader would make the
+        # reader fault on the pages cut off, so the ring is created
+        # under another name in the same directory and renamed over the
+        # old one, with its header already written.
+        temp_path = "%s.%d.tmp" % (path, os.getpid())
+        try:
+            with open(temp_path, "w+b") as fobj:
+                fobj.truncate(size)
+                self._mmap = mmap.mmap(fobj.fileno(), size)
+
+            _FILE_HEADER.pack_into(self._mmap, 0, MAGIC, VERSION, slots, 0,
+                                   width, height, self.stride)
+            os.rename(temp_path, path)
+        except (IOError, OSError, mmap.error):
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        # the pixels of each slot, exposed through ctypes as both
+        # Python 2 and 3 versions of pycairo accept it as a writable
+        # buffer.
+        self._buffers = [
+            (c_char * (self.stride * height)).from_buffer(
+                self._mmap, self._get_slot_offset(slot) + _HEADER_SIZE)
+            for slot in range(slots)]
+        self._surfaces = [
+            ImageSurface.create_for_data(buf, FORMAT_ARGB32, width, height,
+                                         self.stride)
+            for buf in self._buffers]
+
+    def _get_slot_offset(self, slot):
+        """
+        Return the offset of a slot within the file.
+
+        @type slot: int
+        @param slot: Index of the slot.
+
+        @rtype: int
+        """
+        return _HEADER_SIZE + slot * self._slot_size
+
+    def write_frame(self, face, time):
+        """
+        Render a face in to the next slot of the ring.
+
+        @type face: BaseFace
+        @param face: Face to render.
+
+        @type time: datetime.datetime
+        @param time: Time to display.
+
+        @rtype: int
+        @return: Sequence number of the frame.
+        """
+        self._sequence += 1
+        slot = self._sequence % self._slots
+        offset = self._get_slot_offset(slot)
+
+        # the lock is odd for as long as the slot is being written.
+        lock = _LOCK.unpack_from(self._mmap, offset)[0]
+        _LOCK.pack_into(self._mmap, offset, lock + 1)
+
+        render_face(face=face, surface=self._surfaces[slot], time=time,
+                    width=self.width, height=self.height)
+
+        timestamp = mktime(time.timetuple()) + time.microsecond / 1e6
+        _SLOT_HEADER.pack_into(self._mmap, offset, lock + 1, self._sequence,
+                               timestamp, self.width, self.height,
+                               self.stride)
+        _LOCK.pack_into(self._mmap, offset, lock + 2)
+
+        _LOCK.pack_into(self._mmap, _LATEST_OFFSET, self._sequence)
+
+        return self._sequence
+
+    def close(self):
+        """
+        Close the ring. The file is left for any readers still using it.
+        """
+        for surface in self._surfaces:
+            surface.finish()
+
+        # the memory map can only be closed once nothing refers to it.
+        self._surfaces = []
+        self._buffers = []
+        self._mmap.close()
+
+
+class FrameRingReader(object):
+    """
+    Class used to read the frames written to a ring buffer by another
+    process.
+    """
+
+    def __init__(self, path):
+        """
+        Instantiate an instance of FrameRingReader.
+
+        @type path: str
+        @param path: Path of the ring buffer file.
+
+        @raise ValueError: If the file is not a ring buffer.
+        """
+        with open(path, "rb") as fobj:
+            self._mmap = mmap.mmap(fobj.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self._slots, _, self.width, self.height, \
+            self.stride = _FILE_HEADER.unpack_from(self._mmap, 0)
+
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError("not a frame ring: %s" % path)
+
+        self._slot_size = _get_slot_size(stride=self.stride,
+                                         height=self.height)
+
+    def get_latest_sequence(self):
+        """
+        Return the sequence number of the latest complete frame.
+
+        @rtype: int
+        @return: Sequence number, or 0 if no frame has been written.
+        """
+        return _LOCK.unpack_from(self._mmap, _LATEST_OFFSET)[0]
+
+    def read_latest(self):
+        """
+        Return a copy of the latest complete frame.
+
+        @rtype: Frame
+        @return: Latest frame, or None if no frame has been written.
+
+        @raise IOError: If a complete frame could not be read, because
+            the writer kept overwriting it.
+        """
+        return self._read_latest(copy=True)
+
+    def view_latest(self):
+        """
+        Return the latest complete frame without copying its pixels.
+
+        The data of the frame is a view of the shared memory, which the
+        writer will overwrite once the ring has gone all the way round.
+        Once finished with the frame check is_valid; if it returns False
+        the frame was overwritten whilst it was being used.
+
+        @rtype: Frame
+        @return: Latest frame, or None if no frame has been written.
+
+        @raise IOError: If a complete frame could not be read, because
+            the writer kept overwriting it.
+        """
+        return self._read_latest(copy=False)
+
+    def is_valid(self, frame):
+        """
+        Return whether a frame is still held in the ring unchanged.
+
+        @type frame: Frame
+        @param frame: Frame returned by view_latest or read_latest.
+
+        @rtype: bool
+        """
+        offset = self._get_slot_offset(frame.sequence % self._slots)
+        lock, sequence = _SLOT_HEADER.unpack_from(self._mmap, offset)[:2]
+
+        return lock % 2 == 0 and sequence == frame.sequence
+
+    def close(self):
+        """
+        Close the ring. Any views of its frames must have been released.
+        """
+        self._mmap.close()
+
+    def _get_slot_offset(self, slot):
+        """
+        Return the offset of a slot within the file.
+
+        @type slot: int
+        @param slot: Index of the slot.
+
+        @rtype: int
+        """
+        return _HEADER_SIZE + slot * self._slot_size
+
+    def _read_latest(self, copy):
+        """
+        Read the latest complete frame.
+
+        @type copy: bool
+        @param copy: If True, copy the pixels of the frame.
+
+        @rtype: Frame
+        """
+        for _ in range(_READ_ATTEMPTS):
+            sequence = self.get_latest_sequence()
+            if not sequence:
+                return None
+
+            offset = self._get_slot_offset(sequence % self._slots)
+            header = _SLOT_HEADER.unpack_from(self._mmap, offset)
+            lock = header[0]
+
+            # the slot is being written, or has already been reused for
+            # a later frame.
+            if lock % 2 or header[1] != sequence:
+                continue
+
+            start = offset + _HEADER_SIZE
+            end = start + self.stride * self.height
+            if copy:
+                data = self._mmap[start:end]
+            else:
+                data = _get_view(self._mmap, start, end)
+
+            if _LOCK.unpack_from(self._mmap, offset)[0] == lock:
+                return Frame(*header[1:] + (data,))
+
+        raise IOError("frame kept being overwritten whilst reading")
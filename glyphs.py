@@ -0,0 +1,136 @@
+"""
+What the digital and binary clocks display, independent of how it is
+drawn; the segments lit for each digit of the digital clock and the
+values shown by each row of LEDs of the binary clock, along with where
+each segment and LED is on the face at its default size.
+
+Nothing here depends on cairo, so displays without it, e.g. the
+terminal or the NumPy renderer, can draw the same clocks as the faces.
+"""
+
+
+# TUPLE CONTAINING A BITMASK FOR EACH NUMBER DETAILING WHICH SEGMENTS
+# WILL NEED TO BE 'ON' TO DISPLAY IT. BIT 0 IS SEGMENT 'a' THROUGH TO
+# BIT 6 FOR SEGMENT 'g'.
+SEGMENTS = (
+    0x3F,  # Number 0: a, b, c, d, e, f
+    0x06,  # Number 1: b, c
+    0x5B,  # Number 2: a, b, d, e, g
+    0x4F,  # Number 3: a, b, c, d, g
+    0x66,  # Number 4: b, c, f, g
+    0x6D,  # Number 5: a, c, d, f, g
+    0x7D,  # Number 6: a, c, d, e, f, g
+    0x07,  # Number 7: a, b, c
+    0x7F,  # Number 8: a, b, c, d, e, f, g
+    0x67)  # Number 9: a, b, c, f, g
+
+# SIZE OF THE DIGITAL CLOCK BEFORE IT IS SCALED TO FIT, AS (WIDTH,
+# HEIGHT).
+DIGITAL_SIZE = (640, 160)
+
+# SEGMENT NAMES IN THE ORDER OF THEIR BITS WITHIN SEGMENTS.
+SEGMENT_NAMES = "abcdefg"
+
+SEGMENT_ORIENTATION = {"a": 'h',
+                       "b": 'v',
+                       "c": 'v',
+                       "d": 'h',
+                       "e": 'v',
+                       "f": 'v',
+                       "g": 'h'}
+
+# SEGMENT OFFSETS FOR DRAWING THE SEVEN SEGMENT DISPLAY.
+SEGMENT_OFFSETS = {"a": (5, 0),
+                   "b": (60, 5),
+                   "c": (60, 65),
+                   "d": (5, 120),
+                   "e": (0, 65),
+                   "f": (0, 5),
+                   "g": (5, 60)}
+
+# POINT TO START DRAWING EACH SEVEN SEGMENT DISPLAY FROM, IN THE ORDER
+# HOUR TENS, HOUR UNITS, MINUTE TENS, MINUTE UNITS, SECOND TENS AND
+# SECOND UNITS.
+DIGIT_POSITIONS = ((20, 20), (115, 20),
+                   (240, 20), (335, 20),
+                   (460, 20), (555, 20))
+
+# CENTER POINT ALONG THE X AXIS OF EACH PAIR OF DOUBLE DOTS, THE CENTER
+# POINT ALONG THE Y AXIS OF THE TOP AND BOTTOM DOT, AND THEIR RADIUS.
+DOT_X_POSITIONS = (210, 425)
+DOT_Y_POSITIONS = (50, 110)
+DOT_RADIUS = 10
+
+# NUMBER OF LEDS IN EACH ROW OF THE BINARY CLOCK, ENOUGH FOR THE YEAR.
+NUM_LEDS = 11
+
+# SIZE OF THE BINARY CLOCK BEFORE IT IS SCALED TO FIT, AS (WIDTH,
+# HEIGHT).
+BINARY_SIZE = (440, 240)
+
+LED_RADIUS = 10
+
+# CENTER POINT ALONG THE Y AXIS OF EACH ROW OF LEDS, IN THE ORDER YEAR,
+# MONTH, DAY, HOUR, MINUTE AND SECOND.
+ROW_Y_POSITIONS = (20, 60, 100, 140, 180, 220)
+
+
+def get_led_points(orientation, start_x, start_y):
+    """
+    Return the corners of the polygon outlining a segment of the digital
+    clock.
+
+    @type orientation: str
+    @param orientation: Either 'h' for a horizontal LED, or 'v' for
+        a vertical LED.
+
+    @type start_x: int
+    @param start_x: Point on the X axis to start drawing the LED
+        from.
+
+    @type start_y: int
+    @param start_y: Point on the Y axis to start drawing the LED
+        from.
+
+    @rtype: ( (int, int) )
+    @return: Tuple containing tuples of X and Y coordinates, ending
+        at the start point.
+    """
+    if orientation == 'h':
+        return ((start_x + 10, start_y + 10),
+                (start_x + 40, start_y + 10),
+                (start_x + 50, start_y), (start_x + 40, start_y - 10),
+                (start_x + 10, start_y - 10), (start_x, start_y))
+
+    return ((start_x + 10, start_y + 10), (start_x + 10, start_y + 40),
+            (start_x, start_y + 50), (start_x - 10, start_y + 40),
+            (start_x - 10, start_y + 10), (start_x, start_y))
+
+
+def get_led_x_pos(led_pos):
+    """
+    Return the X position of an LED in a row of the binary clock.
+
+    @type led_pos: int
+    @param led_pos: LED position
+
+    @rtype: int
+    @return: Center point of the LED along the X axis.
+    """
+    return (led_pos * LED_RADIUS * 4) + (LED_RADIUS * 2)
+
+
+def get_row_values(time):
+    """
+    Return the value displayed by each row of LEDs of the binary clock
+    for a particular time.
+
+    @type time: datetime.datetime
+    @param time: Time to get the row values for.
+
+    @rtype: (int, int, int, int, int, int)
+    @return: Tuple containing the year, month, day, hour, minute and
+        second, from the top row down.
+    """
+    return (time.year, time.month, time.day, time.hour, time.minute,
+            time.second)
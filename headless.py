@@ -0,0 +1,240 @@
+#!/usr/bin/python
+
+"""
+Render the clock interfaces without a display or the GTK main loop.
+
+The faces of the analogue, binary and digital clocks are drawn straight
+on to cairo surfaces, e.g. ARGB image buffers, PNG files or SVG files,
+for any given time and size.
+"""
+
+
+# STDLIB IMPORTS
+from argparse import ArgumentParser
+from datetime import datetime
+
+# THIRD PARTY IMPORTS
+from cairo import (Context, FORMAT_ARGB32, ImageSurface, OPERATOR_CLEAR,
+                   SVGSurface)
+
+# LOCAL IMPORTS
+from colours import parse_colour
+from interfaces import get_interface_names, load_face
+
+
+def render_face(face, surface, time, width, height):
+    """
+    Render the whole of a face on to a surface, clearing anything
+    already on it.
+
+    @type face: BaseFace
+    @param face: Face to render.
+
+    @type surface: cairo.Surface
+    @param surface: Surface to render on to.
+
+    @type time: datetime.datetime
+    @param time: Time to display.
+
+    @type width: int
+    @param width: Width to render the face at.
+
+    @type height: int
+    @param height: Height to render the face at.
+    """
+    context = Context(surface)
+
+    context.save()
+    context.set_operator(OPERATOR_CLEAR)
+    context.paint()
+    context.restore()
+
+    face.render(context=context, time=time, width=width, height=height)
+    surface.flush()
+
+
+class HeadlessRenderer(object):
+    """
+    Class used to render a clock interface on to cairo surfaces.
+
+    The face is kept between renders, so anything it caches, such as
+    the pre-rendered analogue clock face, is only rendered once.
+    """
+
+    def __init__(self, interface, width=None, height=None,
+                 led_colour="red"):
+        """
+        Instantiate an instance of HeadlessRenderer.
+
+        @type interface: str
+        @param interface: Interface to render. Valid options: analogue,
+            binary, digital.
+
+        @type width: int
+        @param width: Width of the rendered clock.
+            DEFAULT: Default width of the interface.
+
+        @type height: int
+        @param height: Height of the rendered clock.
+            DEFAULT: Default height of the interface.
+
+        @type led_colour: str
+        @param led_colour: Colour of the LEDs for the binary and digital
+            interfaces.
+            DEFAULT: red
+        """
+        self._face = load_face(name=interface)()
+
+        red, green, blue = parse_colour(spec=led_colour)
+        self._face.set_led_colour(red=red, green=green, blue=blue)
+
+        self.width = width or self._face._DEFAULT_WIDTH
+        self.height = height or self._face._DEFAULT_HEIGHT
+
+        self._surface = None
+
+    @property
+    def stride(self):
+        """
+        Number of bytes between the start of each row of the buffer
+        returned by render_to_buffer.
+
+        @rtype: int
+        """
+        return self._get_image_surface().get_stride()
+
+    def _get_image_surface(self):
+        """
+        Return the image surface used when rendering to a buffer,
+        creating it on first use.
+
+        @rtype: cairo.ImageSurface
+        """
+        if self._surface is None:
+            self._surface = ImageSurface(FORMAT_ARGB32, self.width,
+                                         self.height)
+
+        return self._surface
+
+    def render(self, time, surface=None):
+        """
+        Render the clock on to a surface.
+
+        @type time: datetime.datetime
+        @param time: Time to display.
+
+        @type surface: cairo.Surface
+        @param surface: Surface to render on to. Anything already on the
+            surface is cleared.
+            DEFAULT: ARGB image surface owned by the renderer, which is
+                reused between renders.
+
+        @rtype: cairo.Surface
+        @return: Surface the clock was rendered on to.
+        """
+        if surface is None:
+            surface = self._get_image_surface()
+
+        render_face(face=self._face, surface=surface, time=time,
+                    width=self.width, height=self.height)
+
+        return surface
+
+    def get_visible_state(self, time):
+        """
+        Return what the clock displays for a particular time. Two times
+        with the same visible state render identically.
+
+        @type time: datetime.datetime
+        @param time: Time to get the visible state for.
+
+        @rtype: tuple
+        """
+        return self._face.get_visible_state(time)
+
+    def render_to_buffer(self, time):
+        """
+        Render the clock and return the ARGB pixel buffer.
+
+        The buffer is not copied; it belongs to the renderer and is
+        overwritten by the next render. Rows are stride bytes apart.
+
+        @type time: datetime.datetime
+        @param time: Time to display.
+
+        @rtype: buffer
+        @return: Native endian ARGB32 pixel data.
+        """
+        return self.render(time=time).get_data()
+
+    def render_to_png(self, time, fobj):
+        """
+        Render the clock as a PNG.
+
+        @type time: datetime.datetime
+        @param time: Time to display.
+
+        @type fobj: str or file
+        @param fobj: Filename or file object to write the PNG to.
+        """
+        self.render(time=time).write_to_png(fobj)
+
+    def render_to_svg(self, time, fobj):
+        """
+        Render the clock as an SVG.
+
+        @type time: datetime.datetime
+        @param time: Time to display.
+
+        @type fobj: str or file
+        @param fobj: Filename or file object to write the SVG to.
+        """
+        surface = SVGSurface(fobj, self.width, self.height)
+        self.render(time=time, surface=surface)
+        surface.finish()
+
+
+def _parse_arguments():
+    """
+    Parse the command line arguments.
+
+    @rtype: dict[str, str]
+    @return: Dictionary containing key/value pairs.
+    """
+    description = "Render a clock interface to a PNG or SVG file."
+    parser = ArgumentParser(description=description)
+
+    parser.add_argument("output", help="File to write; .png or .svg")
+
+    parser.add_argument("-i", "--interface", choices=get_interface_names(),
+                        default='analogue')
+
+    parser.add_argument("-l", "--led-colour", default='red', type=str)
+
+    parser.add_argument("-W", "--width", default=None, type=int)
+
+    parser.add_argument("-H", "--height", default=None, type=int)
+
+    _args = parser.parse_args()
+
+    return {'output': _args.output,
+            'interface': _args.interface,
+            'led_colour': _args.led_colour,
+            'width': _args.width,
+            'height': _args.height}
+
+
+if __name__ == "__main__":
+    args = _parse_arguments()
+
+    renderer = HeadlessRenderer(interface=args.get("interface"),
+                                width=args.get("width"),
+                                height=args.get("height"),
+                                led_colour=args.get("led_colour"))
+
+    output = args.get("output")
+
+    if output.lower().endswith(".svg"):
+        renderer.render_to_svg(time=datetime.now(), fobj=output)
+    else:
+        renderer.render_to_png(time=datetime.now(), fobj=output)
@@ -0,0 +1,149 @@
+"""
+Registry of the clock interfaces.
+
+Interfaces are listed by the modules they live in, so they can be found
+without importing them, or GTK, until one is actually used.
+"""
+
+
+# STDLIB IMPORTS
+from collections import namedtuple
+from datetime import timedelta
+from importlib import import_module
+
+
+# DETAILS OF AN INTERFACE:
+#   window - module and class of the GTK window displaying it.
+#   face   - module and class of the face drawing it, which only
+#            depends on cairo.
+#   leds   - whether it has LEDs which can be coloured.
+Interface = namedtuple("Interface", ["window", "face", "leds"])
+
+INTERFACES = {
+    "analogue": Interface(window=("analogue", "AnaloguePyClock"),
+                          face=("_AnalogueFace", "AnalogueFace"),
+                          leds=False),
+    "binary": Interface(window=("binary", "BinaryPyClock"),
+                        face=("_BinaryFace", "BinaryFace"),
+                        leds=True),
+    "digital": Interface(window=("digital", "DigitalPyClock"),
+                         face=("_DigitalFace", "DigitalFace"),
+                         leds=True)}
+
+
+def get_interface_names():
+    """
+    Return the names of the registered interfaces.
+
+    @rtype: [str]
+    """
+    return sorted(INTERFACES)
+
+
+def _load(module_name, class_name):
+    """
+    Import a module and return a class from it.
+
+    @type module_name: str
+    @param module_name: Name of the module to import.
+
+    @type class_name: str
+    @param class_name: Name of the class within the module.
+
+    @rtype: type
+    """
+    return getattr(import_module(module_name), class_name)
+
+
+def load_window(name):
+    """
+    Import and return the window class of an interface. Imports GTK.
+
+    @type name: str
+    @param name: Name of the interface.
+
+    @rtype: type
+    @raise KeyError: If the interface is not registered.
+    """
+    return _load(*INTERFACES[name].window)
+
+
+def load_face(name):
+    """
+    Import and return the face class of an interface.
+
+    @type name: str
+    @param name: Name of the interface.
+
+    @rtype: type
+    @raise KeyError: If the interface is not registered.
+    """
+    return _load(*INTERFACES[name].face)
+
+
+def parse_tile(spec):
+    """
+    Parse the specification of a dashboard tile.
+
+    @type spec: str
+    @param spec: Tile specification; INTERFACE[@OFFSET], where OFFSET
+        is the offset from UTC in hours, e.g. digital@+5:30 or
+        analogue@-8. Without an offset the tile shows the local time.
+
+    @rtype: (str, datetime.timedelta)
+    @return: Name of the interface and the offset from UTC, or None for
+        the local time.
+
+    @raise ValueError: If the specification can not be parsed.
+    """
+    interface, _, offset = spec.partition("@")
+
+    if interface not in INTERFACES:
+        raise ValueError("unknown interface: %s" % interface)
+
+    if not offset:
+        return interface, None
+
+    return interface, parse_offset(spec=offset)
+
+
+def format_tile(interface, offset=None):
+    """
+    Format the specification of a dashboard tile, as parsed by
+    parse_tile.
+
+    @type interface: str
+    @param interface: Name of the interface.
+
+    @type offset: datetime.timedelta
+    @param offset: Offset from UTC, or None for the local time.
+        DEFAULT: None
+
+    @rtype: str
+    """
+    if offset is None:
+        return interface
+
+    minutes = int(offset.total_seconds() // 60)
+    hours, minutes = divmod(abs(minutes), 60)
+
+    return "%s@%s%d:%02d" % (interface, "-" if offset < timedelta(0) else
+                             "+", hours, minutes)
+
+
+def parse_offset(spec):
+    """
+    Parse an offset from UTC.
+
+    @type spec: str
+    @param spec: Offset in hours, optionally with minutes, e.g. +5:30 or
+        -8.
+
+    @rtype: datetime.timedelta
+
+    @raise ValueError: If the offset can not be parsed.
+    """
+    sign = -1 if spec.startswith("-") else 1
+    hours, _, minutes = spec.lstrip("+-").partition(":")
+
+    return sign * timedelta(hours=int(hours), minutes=int(minutes or 0))
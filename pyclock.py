@@ -2,20 +2,268 @@
 
 
 """
+Command line entry point for PyClock.
 
+The arguments are parsed before anything else is imported; GTK and the
+chosen interface are only imported once they are known to be needed.
 """
 
 
 # STDLIB IMPORTS
-from argparse import ArgumentParser
-
-# THIRD PARTY IMPORTS
-from gtk import main
+from argparse import ArgumentParser, ArgumentTypeError
+from datetime import datetime, time as datetime_time, timedelta
+import logging
+import os
+import sys
+from timeit import default_timer
 
 # LOCAL IMPORTS
-from analogue import AnaloguePyClock
-from binary import BinaryPyClock
-from digital import DigitalPyClock
+from interfaces import get_interface_names, INTERFACES, load_window, \
+    parse_offset, parse_tile
+
+
+def _get_process_age():
+    """
+    Return how long ago the process started, including the time taken
+    to start Python itself.
+
+    @rtype: float
+    @return: Age of the process in seconds, or None if it can not be
+        read from /proc.
+    """
+    try:
+        with open("/proc/self/stat") as fobj:
+            # the start time is the 22nd field, counted in clock ticks
+            # since boot. The 2nd field is the command name, which may
+            # contain spaces, so count from the bracket which ends it.
+            start_ticks = float(fobj.read().rsplit(")", 1)[1].split()[19])
+
+        with open("/proc/uptime") as fobj:
+            uptime = float(fobj.read().split()[0])
+    except (IOError, OSError, IndexError, ValueError):
+        return None
+
+    return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+
+
+class _StartupTimer(object):
+    """
+    Records how long each stage of starting the clock took, up to the
+    first paint.
+    """
+
+    def __init__(self):
+        """
+        Instantiate an instance of _StartupTimer.
+        """
+        self._start = default_timer()
+        self._process_age = _get_process_age()
+        self._stages = []
+
+    def mark(self, stage):
+        """
+        Mark the end of a stage.
+
+        @type stage: str
+        @param stage: Description of the stage.
+        """
+        self._stages.append((stage, default_timer()))
+
+    def report(self):
+        """
+        Write how long each stage took to stderr.
+        """
+        if self._process_age is not None:
+            sys.stderr.write("%-24s %8.1f ms\n" % (
+                "interpreter started", self._process_age * 1000))
+
+        previous = self._start
+        for stage, end in self._stages:
+            sys.stderr.write("%-24s %8.1f ms\n" % (
+                stage, (end - previous) * 1000))
+            previous = end
+
+        total = previous - self._start + (self._process_age or 0)
+        sys.stderr.write("%-24s %8.1f ms\n" % ("total", total * 1000))
+
+
+def _parse_time(value):
+    """
+    Parse a time given on the command line.
+
+    @type value: str
+    @param value: Either YYYY-MM-DDTHH:MM:SS, or HH:MM:SS for a time
+        today.
+
+    @rtype: datetime.datetime
+    """
+    for time_format in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"):
+        try:
+            return datetime.strptime(value, time_format)
+        except ValueError:
+            pass
+
+    try:
+        time = datetime.strptime(value, "%H:%M:%S").time()
+    except ValueError:
+        raise ArgumentTypeError("invalid time: %s" % value)
+
+    return datetime.combine(datetime.now().date(), time)
+
+
+def _parse_step(value):
+    """
+    Parse the seconds between each exported or simulated frame.
+
+    @type value: str
+    @param value: Number of seconds, greater than 0.
+
+    @rtype: float
+    """
+    try:
+        step = float(value)
+    except ValueError:
+        raise ArgumentTypeError("invalid step: %s" % value)
+
+    # also rejects nan and inf, which no frame can be stepped by.
+    if not 0 < step < float("inf"):
+        raise ArgumentTypeError("step must be greater than 0")
+
+    return step
+
+
+def _load_replay(path):
+    """
+    Load the times recorded in a file, one per line, either as seconds
+    since the epoch or in any format accepted by _parse_time. Blank
+    lines are ignored.
+
+    @type path: str
+    @param path: Path of the file.
+
+    @rtype: [datetime.datetime]
+    """
+    times = []
+
+    try:
+        with open(path) as fobj:
+            for line in fobj:
+                line = line.strip()
+                if not line:
+                    continue
+
+                try:
+                    times.append(datetime.fromtimestamp(float(line)))
+                except ValueError:
+                    times.append(_parse_time(line))
+    except IOError as error:
+        raise ArgumentTypeError(str(error))
+
+    if not times:
+        raise ArgumentTypeError("no times recorded in %s" % path)
+
+    return times
+
+
+def _parse_alarm(value):
+    """
+    Parse an alarm given on the command line or in an alarms file.
+
+    @type value: str
+    @param value: TIME[/EVERY][=LABEL]; the time the alarm fires, in any
+        format accepted by _parse_time, how many seconds it repeats
+        every and a description of it. A time without a date fires at
+        its next occurrence.
+
+    @rtype: (object, datetime.timedelta, str)
+    @return: Time the alarm fires, either as a datetime.datetime or a
+        datetime.time without a date, the interval it repeats at or
+        None, and the label or None.
+    """
+    value, _, label = value.partition("=")
+    value, _, repeat = value.partition("/")
+
+    try:
+        time = datetime.strptime(value, "%H:%M:%S").time()
+    except ValueError:
+        time = _parse_time(value)
+
+    if repeat:
+        try:
+            repeat = timedelta(seconds=float(repeat))
+        except ValueError:
+            raise ArgumentTypeError("invalid repeat: %s" % repeat)
+        if repeat <= timedelta(0):
+            raise ArgumentTypeError("repeat must be greater than 0")
+
+    return time, repeat or None, label or None
+
+
+def _parse_countdown(value):
+    """
+    Parse a countdown given on the command line.
+
+    @type value: str
+    @param value: SECONDS[=LABEL]; seconds from the start until the
+        countdown fires, and a description of it.
+
+    @rtype: (datetime.timedelta, None, str)
+    @return: Time from the start, no repeat and the label or None.
+    """
+    value, _, label = value.partition("=")
+
+    try:
+        return timedelta(seconds=float(value)), None, label or None
+    except ValueError:
+        raise ArgumentTypeError("invalid countdown: %s" % value)
+
+
+def _load_alarms(path):
+    """
+    Load alarms from a file, one per line in the format accepted by
+    _parse_alarm. Blank lines and lines starting with # are ignored.
+
+    @type path: str
+    @param path: Path of the file.
+
+    @rtype: [(object, datetime.timedelta, str)]
+    """
+    alarms = []
+
+    try:
+        with open(path) as fobj:
+            for number, line in enumerate(fobj, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+
+                try:
+                    alarms.append(_parse_alarm(line))
+                except ArgumentTypeError as error:
+                    raise ArgumentTypeError("%s:%d: %s" % (path, number,
+                                                           error))
+    except IOError as error:
+        raise ArgumentTypeError(str(error))
+
+    return alarms
+
+
+def _parse_server(value):
+    """
+    Parse the address of an SNTP server given on the command line,
+    importing timesync only once one is given.
+
+    @type value: str
+    @param value: SERVER[:PORT].
+
+    @rtype: (str, int)
+    """
+    from timesync import parse_server
+
+    try:
+        return parse_server(spec=value)
+    except ValueError:
+        raise ArgumentTypeError("invalid SNTP server: %s" % value)
 
 
 def _parse_arguments():
@@ -28,30 +276,423 @@ def _parse_arguments():
     description = "Variety of clocks interfaces implemented in Python."
     parser = ArgumentParser(description=description)
 
-    clock_interfaces = ['analogue', 'binary', 'digital']
-
-    parser.add_argument("-i", "--interface", choices=clock_interfaces,
-                        default='analogue')
+    parser.add_argument("-i", "--interface",
+                        choices=get_interface_names(), default='analogue')
 
     parser.add_argument("-l", "--led-colour", default='red', type=str)
 
+    parser.add_argument("-d", "--dashboard", nargs="+", type=parse_tile,
+                        metavar="INTERFACE[@OFFSET]",
+                        help="Display a grid of clocks in one window. "
+                             "OFFSET is the offset from UTC in hours, "
+                             "e.g. digital@+5:30")
+
+    parser.add_argument("-c", "--columns", default=None, type=int,
+                        help="Number of columns in the dashboard, or in "
+                             "each dashboard of the video wall.")
+
+    parser.add_argument("--wall", nargs="+", type=parse_tile,
+                        metavar="INTERFACE[@OFFSET]",
+                        help="Display a video wall of clocks, shared "
+                             "between worker processes by how long each "
+                             "takes to draw.")
+
+    parser.add_argument("--workers", default=None, type=int,
+                        help="Number of worker processes of the video "
+                             "wall. DEFAULT: the number of CPUs")
+
+    parser.add_argument("--wall-tiles", action="store_true",
+                        help="Show the clocks of each worker of the video "
+                             "wall as the tiles of one dashboard.")
+
+    parser.add_argument("-e", "--export", nargs=2, type=_parse_time,
+                        metavar=("START", "END"),
+                        help="Render every frame between two times "
+                             "instead of displaying the clock.")
+
+    parser.add_argument("--step", default=1.0, type=_parse_step,
+                        help="Seconds between each exported or simulated "
+                             "frame.")
+
+    parser.add_argument("-o", "--output", default="frames",
+                        help="Directory for exported PNG frames, or the "
+                             "file for raw frames ('-' for stdout).")
+
+    parser.add_argument("--format", default="png", choices=["png", "raw"],
+                        dest="frame_format",
+                        help="Format of exported frames.")
+
+    parser.add_argument("-j", "--jobs", default=None, type=int,
+                        help="Number of processes to export with.")
+
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip frames already exported.")
+
+    parser.add_argument("--width", default=None, type=int,
+                        help="Width of exported frames, and of frames in "
+                             "the frame ring.")
+
+    parser.add_argument("--height", default=None, type=int,
+                        help="Height of exported frames, and of frames in "
+                             "the frame ring.")
+
+    parser.add_argument("--low-power", action="store_true",
+                        help="Hide the seconds and only update the clock "
+                             "once a minute.")
+
+    parser.add_argument("--sweep", nargs="?", const=30.0, default=None,
+                        type=float, metavar="FPS",
+                        help="Sweep the hands of the analogue clock "
+                             "smoothly, drawing up to FPS frames a "
+                             "second (default 30).")
+
+    time_group = parser.add_mutually_exclusive_group()
+
+    time_group.add_argument("--utc-offset", default=None, type=parse_offset,
+                            metavar="OFFSET",
+                            help="Show the time at an offset from UTC in "
+                                 "hours, e.g. +5:30, rather than the "
+                                 "local time.")
+
+    time_group.add_argument("--replay", default=None, type=_load_replay,
+                            metavar="FILE",
+                            help="Show the times recorded in a file, one "
+                                 "per tick.")
+
+    time_group.add_argument("--simulate", nargs="+", default=None,
+                            type=_parse_time, metavar="START [END]",
+                            help="Step through time from START, by --step "
+                                 "seconds a frame, as fast as the clock "
+                                 "can be drawn.")
+
+    parser.add_argument("--sntp", default=None, type=_parse_server,
+                        metavar="SERVER[:PORT]",
+                        help="Correct the time displayed by the offset "
+                             "of the local clock from an SNTP server, "
+                             "queried in the background.")
+
+    parser.add_argument("--sntp-interval", default=64.0, type=float,
+                        metavar="SECONDS",
+                        help="Seconds between each query of the SNTP "
+                             "server.")
+
+    parser.add_argument("--alarm", action="append", default=[],
+                        type=_parse_alarm, metavar="TIME[/EVERY][=LABEL]",
+                        help="Flash the clock at a time, optionally "
+                             "repeating every EVERY seconds. May be "
+                             "given more than once.")
+
+    parser.add_argument("--countdown", action="append", default=[],
+                        type=_parse_countdown, metavar="SECONDS[=LABEL]",
+                        help="Flash the clock SECONDS after it starts. "
+                             "May be given more than once.")
+
+    parser.add_argument("--alarms", default=None, type=_load_alarms,
+                        metavar="FILE",
+                        help="Load alarms from a file, one "
+                             "TIME[/EVERY][=LABEL] per line.")
+
+    parser.add_argument("--alarm-command", default=None, metavar="COMMAND",
+                        help="Shell command run whenever an alarm fires, "
+                             "with the alarm in PYCLOCK_ALARM_LABEL and "
+                             "PYCLOCK_ALARM_TIME.")
+
+    parser.add_argument("--display-lists", action="store_true",
+                        help="Record each frame as a list of drawing "
+                             "operations and replay it, only drawing "
+                             "frames which look different.")
+
+    parser.add_argument("--broadcast", default=None, metavar="PATH",
+                        help="Broadcast the state of the clock on every "
+                             "tick to thin clients connecting to a Unix "
+                             "socket, see statecast.py.")
+
+    parser.add_argument("--frame-ring", default=None, metavar="PATH",
+                        help="Also render every frame in to a shared "
+                             "memory ring buffer, e.g. /dev/shm/pyclock.")
+
+    parser.add_argument("--overlay", action="store_true",
+                        help="Show the frame rate and timings on the "
+                             "clock.")
+
+    parser.add_argument("--log-stats", default=None, type=float,
+                        metavar="SECONDS",
+                        help="Log the frame timings every SECONDS.")
+
+    parser.add_argument("--startup-time", action="store_true",
+                        help="Report how long the clock took to start, "
+                             "up to its first paint, then exit.")
+
     _args = parser.parse_args()
 
+    if _args.wall and _args.dashboard:
+        parser.error("--wall cannot be used with --dashboard")
+
+    if _args.workers is not None and _args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    if _args.broadcast and _args.dashboard:
+        parser.error("--broadcast is not supported by the dashboard")
+
+    if _args.simulate and len(_args.simulate) > 2:
+        parser.error("--simulate takes a START and optional END time")
+
+    if _args.sntp and (_args.replay or _args.simulate):
+        parser.error("--sntp can only correct the local time")
+
+    if _args.sweep is not None:
+        if _args.interface != "analogue" or _args.dashboard:
+            parser.error("--sweep is only supported by the analogue clock")
+        if _args.low_power:
+            parser.error("--sweep cannot be used with --low-power")
+        if _args.sweep <= 0:
+            parser.error("--sweep FPS must be greater than 0")
+
     return {'interface': _args.interface,
-            'led_colour': _args.led_colour}
+            'led_colour': _args.led_colour,
+            'dashboard': _args.dashboard,
+            'columns': _args.columns,
+            'wall': _args.wall,
+            'workers': _args.workers,
+            'wall_tiles': _args.wall_tiles,
+            'export': _args.export,
+            'step': timedelta(seconds=_args.step),
+            'output': _args.output,
+            'frame_format': _args.frame_format,
+            'jobs': _args.jobs,
+            'resume': _args.resume,
+            'width': _args.width,
+            'height': _args.height,
+            'low_power': _args.low_power,
+            'sweep': _args.sweep,
+            'utc_offset': _args.utc_offset,
+            'sntp': _args.sntp,
+            'sntp_interval': _args.sntp_interval,
+            'replay': _args.replay,
+            'simulate': _args.simulate,
+            'alarms': _args.alarm + _args.countdown + (_args.alarms or []),
+            'alarm_command': _args.alarm_command,
+            'display_lists': _args.display_lists,
+            'broadcast': _args.broadcast,
+            'frame_ring': _args.frame_ring,
+            'overlay': _args.overlay,
+            'log_stats': _args.log_stats,
+            'startup_time': _args.startup_time}
+
+
+def _create_clock(args):
+    """
+    Create the clock window chosen by the command line arguments,
+    importing only what it needs.
+
+    @type args: dict[str, object]
+    @param args: Parsed command line arguments.
+
+    @rtype: BasePyClock
+    """
+    if args.get("dashboard"):
+        from dashboard import DashboardPyClock
+
+        return DashboardPyClock(tiles=args.get("dashboard"),
+                                led_colour=args.get("led_colour"),
+                                columns=args.get("columns"))
+
+    interface = args.get("interface")
+    window_class = load_window(name=interface)
+
+    if INTERFACES[interface].leds:
+        return window_class(led_colour=args.get("led_colour"))
+
+    return window_class()
+
+
+def _get_start_time(args):
+    """
+    Return the time the clock shows when it starts, which countdowns
+    and alarms without a date are relative to.
+
+    @type args: dict[str, object]
+    @param args: Parsed command line arguments.
+
+    @rtype: datetime.datetime
+    """
+    if args.get("simulate"):
+        return args.get("simulate")[0]
+
+    if args.get("replay"):
+        return args.get("replay")[0]
+
+    if args.get("utc_offset") is not None:
+        return datetime.utcnow() + args.get("utc_offset")
+
+    return datetime.now()
+
+
+def _add_alarms(clock, alarms, start):
+    """
+    Add the alarms given on the command line to a clock.
+
+    @type clock: BasePyClock
+    @param clock: Clock to add the alarms to.
+
+    @type alarms: [(object, datetime.timedelta, str)]
+    @param alarms: Alarms as returned by _parse_alarm and
+        _parse_countdown.
+
+    @type start: datetime.datetime
+    @param start: Time the clock starts at.
+    """
+    for time, repeat, label in alarms:
+        if isinstance(time, timedelta):
+            time = start + time
+        elif isinstance(time, datetime_time):
+            # a time without a date fires at its next occurrence.
+            time = datetime.combine(start.date(), time)
+            if time < start:
+                time += timedelta(days=1)
+
+        clock.add_alarm(time=time, label=label, repeat=repeat)
+
+
+def _create_time_source(args):
+    """
+    Create the source of the time chosen by the command line arguments.
+
+    @type args: dict[str, object]
+    @param args: Parsed command line arguments.
+
+    @rtype: _TimeSource.TimeSource
+    @return: Time source, or None for the system time.
+    """
+    from _TimeSource import (OffsetTimeSource, ReplayTimeSource,
+                             SimulatedTimeSource)
+
+    if args.get("utc_offset") is not None:
+        return OffsetTimeSource(offset=args.get("utc_offset"))
+
+    if args.get("replay"):
+        return ReplayTimeSource(times=args.get("replay"))
+
+    if args.get("simulate"):
+        simulate = args.get("simulate")
+        return SimulatedTimeSource(start=simulate[0], step=args.get("step"),
+                                   end=simulate[1] if len(simulate) > 1
+                                   else None)
+
+    return None
+
+
+def _create_synced_time_source(args, time_source):
+    """
+    Correct a time source by the offset of the local clock from the SNTP
+    server chosen by the command line arguments, starting to query the
+    server in the background.
+
+    @type args: dict[str, object]
+    @param args: Parsed command line arguments.
+
+    @type time_source: _TimeSource.TimeSource
+    @param time_source: Source to correct, or None for the system time.
+
+    @rtype: timesync.SyncedTimeSource
+    """
+    from timesync import SyncedTimeSource, TimeSynchroniser
+
+    host, port = args.get("sntp")
+    synchroniser = TimeSynchroniser(server=host, port=port,
+                                    interval=args.get("sntp_interval"))
+    synchroniser.start()
+
+    return SyncedTimeSource(synchroniser=synchroniser, source=time_source)
 
 
 if __name__ == "__main__":
+    startup = _StartupTimer()
+
     args = _parse_arguments()
+    startup.mark("arguments parsed")
 
-    interface = args.get("interface")
+    if args.get("export"):
+        from export import export_frames
+
+        start, end = args.get("export")
+        export_frames(interface=args.get("interface"), start=start,
+                      end=end, step=args.get("step"),
+                      output=args.get("output"),
+                      frame_format=args.get("frame_format"),
+                      width=args.get("width"), height=args.get("height"),
+                      led_colour=args.get("led_colour"),
+                      jobs=args.get("jobs"), resume=args.get("resume"))
+        raise SystemExit
+
+    if args.get("wall"):
+        from wall import run_wall
+
+        logging.basicConfig(level=logging.INFO,
+                            format="%(asctime)s %(message)s")
+        run_wall(tiles=args.get("wall"), workers=args.get("workers"),
+                 led_colour=args.get("led_colour"),
+                 dashboard=args.get("wall_tiles"),
+                 columns=args.get("columns"))
+        raise SystemExit
+
+    from gtk import main, main_quit
+    startup.mark("gtk imported")
+
+    clock = _create_clock(args=args)
+    startup.mark("window created")
+
+    if args.get("low_power"):
+        clock.set_seconds_visible(visible=False)
+
+    if args.get("sweep"):
+        clock.set_sweep(sweep=True)
+        clock.set_frame_rate(fps=args.get("sweep"))
+
+    time_source = _create_time_source(args=args)
+    if args.get("sntp"):
+        time_source = _create_synced_time_source(args=args,
+                                                 time_source=time_source)
+
+    if time_source is not None:
+        clock.set_time_source(time_source=time_source)
+
+    _add_alarms(clock=clock, alarms=args.get("alarms"),
+                start=_get_start_time(args=args))
+    clock.set_alarm_command(command=args.get("alarm_command"))
+
+    clock.set_overlay_visible(visible=args.get("overlay"))
+
+    if args.get("display_lists"):
+        clock.set_display_lists(enabled=True)
+
+    if args.get("frame_ring"):
+        from framering import FrameRingWriter
+
+        clock.set_frame_ring(frame_ring=FrameRingWriter(
+            path=args.get("frame_ring"),
+            width=args.get("width") or clock._DEFAULT_WIDTH,
+            height=args.get("height") or clock._DEFAULT_HEIGHT))
+
+    if args.get("broadcast"):
+        from statecast import StateBroadcaster
+
+        clock.set_state_broadcaster(broadcaster=StateBroadcaster(
+            path=args.get("broadcast"), interface=args.get("interface")))
+
+    # a simulation logs the frame timings once it has finished.
+    if args.get("log_stats") or args.get("simulate"):
+        logging.basicConfig(level=logging.INFO,
+                            format="%(asctime)s %(message)s")
+        clock.set_stats_log_interval(seconds=args.get("log_stats"))
+
+    if args.get("startup_time"):
+        def _first_paint(*_):
+            startup.mark("first paint")
+            startup.report()
+            main_quit()
 
-    if interface == "binary":
-        clock = BinaryPyClock(led_colour=args.get("led_colour"))
-    elif interface == "digital":
-        clock = DigitalPyClock(led_colour=args.get("led_colour"))
-    else:
-        clock = AnaloguePyClock()
+        clock.get_draw_area().connect_after("expose-event", _first_paint)
 
     try:
         main()
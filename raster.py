@@ -0,0 +1,504 @@
+"""
+Render the digital and binary clocks for many times at once with NumPy.
+
+Rather than drawing each LED with cairo, the LEDs of a face are
+rasterised once in to a map of which LED covers each pixel, along with
+the colour of each pixel with its LEDs on or off. A whole batch of
+frames is then produced with a handful of array operations, selecting
+the colour of every pixel from the bits of the times being displayed.
+
+The faces are laid out from the same tables in glyphs as they are drawn
+from, so cairo is not needed.
+"""
+
+
+# THIRD PARTY IMPORTS
+import numpy
+
+# LOCAL IMPORTS
+from colours import parse_colour
+from glyphs import (BINARY_SIZE, DIGIT_POSITIONS, DIGITAL_SIZE, DOT_RADIUS,
+                    DOT_X_POSITIONS, DOT_Y_POSITIONS, get_led_points,
+                    get_led_x_pos, LED_RADIUS, NUM_LEDS, ROW_Y_POSITIONS,
+                    SEGMENT_NAMES, SEGMENT_OFFSETS, SEGMENT_ORIENTATION,
+                    SEGMENTS)
+
+
+# BITMASK OF THE SEGMENTS OF EACH NUMBER, INDEXED BY THE NUMBER.
+_SEGMENT_MASKS = numpy.array(SEGMENTS, dtype=numpy.uint8)
+
+# HALF THE WIDTH OF THE OUTLINE AROUND EACH LED, IN THE COORDINATES OF
+# THE FACE; CAIRO'S DEFAULT LINE WIDTH IS 2.
+_OUTLINE = 1.0
+
+
+class RasterRenderer(object):
+    """
+    Class used to render batches of frames of the digital or binary
+    clock as a single array.
+
+    Each LED is given a label, numbered from 1, in the order of the bits
+    it displays; for the digital clock the seven segments of each digit
+    in turn and for the binary clock the LEDs of each row in turn. Each
+    pixel records the (up to) two labels covering the most of it, and
+    its colour for each combination of those LEDs being on or off.
+    """
+
+    def __init__(self, interface, width=None, height=None,
+                 led_colour="red", supersample=4):
+        """
+        Instantiate an instance of RasterRenderer.
+
+        The face is scaled to fit within the size of the frames, keeping
+        its aspect ratio, and centered.
+
+        @type interface: str
+        @param interface: Interface to render. Valid options: binary,
+            digital.
+
+        @type width: int
+        @param width: Width of each frame.
+            DEFAULT: Default width of the interface.
+
+        @type height: int
+        @param height: Height of each frame.
+            DEFAULT: Default height of the interface.
+
+        @type led_colour: str
+        @param led_colour: Colour of the LEDs.
+            DEFAULT: red
+
+        @type supersample: int
+        @param supersample: Number of samples taken along each axis of a
+            pixel when rasterising the LEDs, for antialiasing.
+            DEFAULT: 4
+
+        @raise ValueError: If the interface can not be rasterised.
+        """
+        if interface == "digital":
+            default_width, default_height = DIGITAL_SIZE
+            self._get_bits = self._get_digital_bits
+            shapes = self._get_digital_shapes()
+        elif interface == "binary":
+            default_width, default_height = BINARY_SIZE
+            self._get_bits = self._get_binary_bits
+            shapes = self._get_binary_shapes()
+        else:
+            raise ValueError("can not rasterise %s" % interface)
+
+        self.width = width or default_width
+        self.height = height or default_height
+
+        # the face is laid out the same as when it is drawn by cairo;
+        # scaled to fit whilst keeping its aspect ratio, and centered.
+        self._scale = min(float(self.width) / default_width,
+                          float(self.height) / default_height)
+        self._x_offset = (self.width - default_width * self._scale) / 2
+        self._y_offset = (self.height - default_height * self._scale) / 2
+
+        self._supersample = supersample
+
+        self._labels, self._colours = self._rasterise(
+            shapes=shapes, colour=parse_colour(spec=led_colour))
+
+    def render_frames(self, times):
+        """
+        Render a frame for each of a number of times.
+
+        @type times: [datetime.datetime] or numpy.ndarray
+        @param times: Times to display, either as datetimes or as a
+            numpy datetime64 array. Anything smaller than a second is
+            ignored.
+
+        @rtype: numpy.ndarray
+        @return: Array of uint8 with the shape (len(times), height,
+            width, 4) containing the frames as native endian,
+            premultiplied ARGB32 pixels; the same layout as
+            HeadlessRenderer.render_to_buffer.
+        """
+        times = numpy.asarray(times, dtype="datetime64[s]").ravel()
+
+        # column 0 is for pixels without an LED, which are never on.
+        bits = numpy.zeros((len(times), self._label_count + 1),
+                           dtype=numpy.uint8)
+        bits[:, 1:] = self._get_bits(times=times)
+
+        # index, from 0 to 3, of the colour of each pixel of each frame,
+        # from whether the two LEDs covering it are on.
+        first, second = self._labels
+        state = bits[:, first] | bits[:, second] << 1
+
+        frames = numpy.choose(state, self._colours)
+
+        return frames.view(numpy.uint8).reshape(
+            len(times), self.height, self.width, 4)
+
+    @staticmethod
+    def _get_fields(times):
+        """
+        Return the fields of an array of times.
+
+        @type times: numpy.ndarray
+        @param times: Array of datetime64 with a resolution of seconds.
+
+        @rtype: (numpy.ndarray, ...)
+        @return: Arrays of the year, month, day, hour, minute and second.
+        """
+        years = times.astype("datetime64[Y]")
+        months = times.astype("datetime64[M]")
+        days = times.astype("datetime64[D]")
+        seconds = (times - days).astype(int)
+
+        return ((years.astype(int) + 1970),
+                (months - years).astype(int) + 1,
+                (days - months).astype(int) + 1,
+                seconds // 3600, seconds // 60 % 60, seconds % 60)
+
+    def _get_digital_bits(self, times):
+        """
+        Return whether each segment of each digit is on for an array of
+        times.
+
+        @type times: numpy.ndarray
+        @param times: Array of datetime64 with a resolution of seconds.
+
+        @rtype: numpy.ndarray
+        @return: Array of shape (len(times), 6 * 7) containing 1 for each
+            segment which is on, in the order of their labels.
+        """
+        hours, minutes, seconds = self._get_fields(times=times)[3:]
+
+        digits = numpy.stack([hours // 10, hours % 10, minutes // 10,
+                              minutes % 10, seconds // 10, seconds % 10],
+                             axis=1)
+
+        shifts = numpy.arange(len(SEGMENT_NAMES), dtype=numpy.uint8)
+        bits = _SEGMENT_MASKS[digits][:, :, None] >> shifts & 1
+
+        return bits.reshape(len(times), -1)
+
+    def _get_binary_bits(self, times):
+        """
+        Return whether each LED of each row is on for an array of times.
+
+        @type times: numpy.ndarray
+        @param times: Array of datetime64 with a resolution of seconds.
+
+        @rtype: numpy.ndarray
+        @return: Array of shape (len(times), 6 * NUM_LEDS) containing 1
+            for each LED which is on, in the order of their labels.
+        """
+        values = numpy.stack(self._get_fields(times=times), axis=1)
+
+        # most significant bit first, as on the face.
+        shifts = numpy.arange(NUM_LEDS - 1, -1, -1)
+        bits = values[:, :, None] >> shifts & 1
+
+        return bits.reshape(len(times), -1).astype(numpy.uint8)
+
+    def _get_digital_shapes(self):
+        """
+        Return the shapes making up the digital face.
+
+        @rtype: [(int, float, callable, (float, float, float, float))]
+        @return: List containing the label, brightness when off, signed
+            distance function and bounding box of each shape, in the
+            order they are drawn. Shapes which are always on have the
+            label 0 and a brightness of 1.
+        """
+        shapes = []
+
+        for start_x, start_y in DIGIT_POSITIONS:
+            for segment in SEGMENT_NAMES:
+                x_offset, y_offset = SEGMENT_OFFSETS[segment]
+                points = get_led_points(
+                    orientation=SEGMENT_ORIENTATION[segment],
+                    start_x=start_x + x_offset, start_y=start_y + y_offset)
+
+                shapes.append((len(shapes) + 1, 0.4) +
+                              _get_polygon(points=points))
+
+        self._label_count = len(shapes)
+
+        for x_pos in DOT_X_POSITIONS:
+            for y_pos in DOT_Y_POSITIONS:
+                shapes.append((0, 1.0) + _get_circle(
+                    x_pos=x_pos, y_pos=y_pos, radius=DOT_RADIUS))
+
+        return shapes
+
+    def _get_binary_shapes(self):
+        """
+        Return the shapes making up the binary face.
+
+        @rtype: [(int, float, callable, (float, float, float, float))]
+        @return: List as returned by _get_digital_shapes.
+        """
+        shapes = []
+
+        for y_pos in ROW_Y_POSITIONS:
+            for led_pos in range(NUM_LEDS):
+                shapes.append((len(shapes) + 1, 0.325) + _get_circle(
+                    x_pos=get_led_x_pos(led_pos=led_pos), y_pos=y_pos,
+                    radius=LED_RADIUS))
+
+        self._label_count = len(shapes)
+
+        return shapes
+
+    def _rasterise(self, shapes, colour):
+        """
+        Rasterise the shapes of a face.
+
+        @type shapes: [(int, float, callable, (float, float, float, float))]
+        @param shapes: Shapes as returned by _get_digital_shapes.
+
+        @type colour: (float, float, float)
+        @param colour: Red, green and blue components of the LED colour.
+
+        @rtype: (numpy.ndarray, numpy.ndarray)
+        @return: Array of shape (2, height * width) containing the two
+            labels covering the most of each pixel, and array of shape
+            (4, height * width) containing the ARGB32 colour of each
+            pixel with neither, the first, the second or both LEDs on.
+        """
+        samples = self._supersample
+        sample_height = self.height * samples
+        sample_width = self.width * samples
+
+        # what each sample is covered by; 0 for nothing, -1 for an
+        # outline, otherwise 1 + the index of the shape it is inside.
+        coverage = numpy.zeros((sample_height, sample_width),
+                               dtype=numpy.int32)
+        areas = []
+
+        for index, (_, _, distance, bounds) in enumerate(shapes):
+            rows, columns = self._get_sample_area(bounds=bounds)
+            if rows.start >= rows.stop or columns.start >= columns.stop:
+                areas.append(None)
+                continue
+
+            x_pos, y_pos = self._get_sample_points(rows=rows,
+                                                   columns=columns)
+            inside = distance(x_pos=x_pos, y_pos=y_pos)
+
+            # each shape is drawn over anything drawn before it.
+            area = coverage[rows, columns]
+            area[inside > -_OUTLINE] = -1
+            area[inside >= _OUTLINE] = index + 1
+            areas.append((rows, columns))
+
+        # from here on work in pixels, from how many samples of each
+        # pixel are covered by each shape.
+        alpha = _to_pixels(samples_array=(coverage != 0), samples=samples)
+        brightness = numpy.zeros((self.height, self.width))
+        labels = numpy.zeros((2, self.height, self.width), dtype=numpy.intp)
+        lit = numpy.zeros((2, self.height, self.width))
+        best = numpy.zeros((2, self.height, self.width))
+
+        for index, (label, off, _, _) in enumerate(shapes):
+            if areas[index] is None:
+                continue
+
+            rows, columns = areas[index]
+            pixel_rows = slice(rows.start // samples, rows.stop // samples)
+            pixel_columns = slice(columns.start // samples,
+                                  columns.stop // samples)
+
+            covered = _to_pixels(
+                samples_array=(coverage[rows, columns] == index + 1),
+                samples=samples)
+
+            brightness[pixel_rows, pixel_columns] += covered * off
+            if not label:
+                continue
+
+            # keep the two labels covering the most of each pixel, and
+            # how much brighter each makes it when on.
+            extra = covered * (1.0 - off)
+            area_labels = labels[:, pixel_rows, pixel_columns]
+            area_lit = lit[:, pixel_rows, pixel_columns]
+            area_best = best[:, pixel_rows, pixel_columns]
+
+            is_first = covered > area_best[0]
+            is_second = ~is_first & (covered > area_best[1])
+
+            # a new first label pushes the previous first in to second.
+            for view in (area_labels, area_lit, area_best):
+                view[1][is_first] = view[0][is_first]
+
+            for target, mask in ((0, is_first), (1, is_second)):
+                area_labels[target][mask] = label
+                area_lit[target][mask] = extra[mask]
+                area_best[target][mask] = covered[mask]
+
+        colours = numpy.stack(
+            [_pack_argb(alpha=alpha, brightness=brightness + on_first *
+                        lit[0] + on_second * lit[1], colour=colour)
+             for on_first, on_second in ((0, 0), (1, 0), (0, 1), (1, 1))])
+
+        return (labels.reshape(2, -1),
+                colours.reshape(4, -1))
+
+    def _get_sample_area(self, bounds):
+        """
+        Return the samples covering a bounding box of the face, rounded
+        out to whole pixels.
+
+        @type bounds: (float, float, float, float)
+        @param bounds: Left, top, right and bottom of the box, in the
+            coordinates of the face.
+
+        @rtype: (slice, slice)
+        @return: Rows and columns of samples.
+        """
+        left, top, right, bottom = bounds
+        samples = self._supersample
+
+        # the outline is drawn either side of the edge of the shape.
+        left = int(numpy.floor((left - _OUTLINE) * self._scale +
+                               self._x_offset))
+        top = int(numpy.floor((top - _OUTLINE) * self._scale +
+                              self._y_offset))
+        right = int(numpy.ceil((right + _OUTLINE) * self._scale +
+                               self._x_offset))
+        bottom = int(numpy.ceil((bottom + _OUTLINE) * self._scale +
+                                self._y_offset))
+
+        return (slice(max(top, 0) * samples,
+                      min(bottom, self.height) * samples),
+                slice(max(left, 0) * samples,
+                      min(right, self.width) * samples))
+
+    def _get_sample_points(self, rows, columns):
+        """
+        Return the position of samples in the coordinates of the face.
+
+        @type rows: slice
+        @param rows: Rows of samples.
+
+        @type columns: slice
+        @param columns: Columns of samples.
+
+        @rtype: (numpy.ndarray, numpy.ndarray)
+        @return: X positions as a row and Y positions as a column, which
+            broadcast together to the position of every sample.
+        """
+        samples = float(self._supersample)
+
+        x_pos = ((numpy.arange(columns.start, columns.stop) + 0.5) /
+                 samples - self._x_offset) / self._scale
+        y_pos = ((numpy.arange(rows.start, rows.stop) + 0.5) /
+                 samples - self._y_offset) / self._scale
+
+        return x_pos[None, :], y_pos[:, None]
+
+
+def _get_polygon(points):
+    """
+    Return the signed distance function and bounding box of a convex
+    polygon.
+
+    @type points: ( (int, int) )
+    @param points: Corners of the polygon, in order.
+
+    @rtype: (callable, (float, float, float, float))
+    @return: Function returning the distance of points inside the
+        polygon from its edge, negative for points outside, and the
+        left, top, right and bottom of the polygon.
+    """
+    x_points = [float(x_pos) for x_pos, _ in points]
+    y_points = [float(y_pos) for _, y_pos in points]
+    edges = list(zip(x_points, y_points, x_points[1:] + x_points[:1],
+                     y_points[1:] + y_points[:1]))
+
+    # the winding of the polygon decides which side of each edge is
+    # inside.
+    area = sum(x1 * y2 - x2 * y1 for x1, y1, x2, y2 in edges)
+    winding = 1.0 if area > 0 else -1.0
+
+    def distance(x_pos, y_pos):
+        result = None
+        for x1, y1, x2, y2 in edges:
+            length = numpy.hypot(x2 - x1, y2 - y1)
+            if not length:
+                continue
+
+            edge = winding * ((x2 - x1) * (y_pos - y1) -
+                              (y2 - y1) * (x_pos - x1)) / length
+            result = edge if result is None else numpy.minimum(result, edge)
+
+        return result
+
+    return distance, (min(x_points), min(y_points), max(x_points),
+                      max(y_points))
+
+
+def _get_circle(x_pos, y_pos, radius):
+    """
+    Return the signed distance function and bounding box of a circle.
+
+    @type x_pos: float
+    @param x_pos: Center point of the circle along the X axis.
+
+    @type y_pos: float
+    @param y_pos: Center point of the circle along the Y axis.
+
+    @type radius: float
+    @param radius: Radius of the circle.
+
+    @rtype: (callable, (float, float, float, float))
+    @return: As returned by _get_polygon.
+    """
+    center_x, center_y = x_pos, y_pos
+
+    def distance(x_pos, y_pos):
+        return radius - numpy.hypot(x_pos - center_x, y_pos - center_y)
+
+    return distance, (center_x - radius, center_y - radius,
+                      center_x + radius, center_y + radius)
+
+
+def _to_pixels(samples_array, samples):
+    """
+    Return the proportion of the samples of each pixel which are set.
+
+    @type samples_array: numpy.ndarray
+    @param samples_array: Boolean array of samples, whose sides are
+        multiples of samples.
+
+    @type samples: int
+    @param samples: Number of samples along each axis of a pixel.
+
+    @rtype: numpy.ndarray
+    """
+    height, width = samples_array.shape
+    return samples_array.reshape(height // samples, samples,
+                                 width // samples, samples).mean(axis=(1, 3))
+
+
+def _pack_argb(alpha, brightness, colour):
+    """
+    Pack the coverage and brightness of pixels in to premultiplied
+    ARGB32.
+
+    @type alpha: numpy.ndarray
+    @param alpha: Proportion of each pixel which is covered, from 0 to 1.
+
+    @type brightness: numpy.ndarray
+    @param brightness: Brightness of the LED colour in each pixel, from
+        0 to 1, already multiplied by its coverage.
+
+    @type colour: (float, float, float)
+    @param colour: Red, green and blue components of the LED colour.
+
+    @rtype: numpy.ndarray
+    @return: Array of uint32 pixels.
+    """
+    pixels = numpy.round(alpha * 255).astype(numpy.uint32) << 24
+
+    for shift, component in zip((16, 8, 0), colour):
+        pixels |= numpy.round(numpy.minimum(brightness, 1.0) * component *
+                              255).astype(numpy.uint32) << shift
+
+    return pixels
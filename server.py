@@ -0,0 +1,479 @@
+#!/usr/bin/python
+
+"""
+Serve renders of the clock interfaces over HTTP, on a TCP port or a Unix
+socket.
+
+    GET /render?interface=digital&width=320&height=80&colour=%2300FF00
+        &time=2024-01-01T12:00:00&format=png
+
+Every parameter is optional; the time defaults to now, the size to the
+default size of the interface and the format to png. Raw frames are
+native endian, premultiplied ARGB32, with their size and stride given
+in the X-Width, X-Height and X-Stride headers.
+
+Renders are cached by what they display rather than the time asked for,
+e.g. the digits of the digital clock, so a frame which looks the same as
+one already rendered is never rendered again. Concurrent requests for a
+frame which is not yet cached wait for a single render.
+"""
+
+
+# STDLIB IMPORTS
+from argparse import ArgumentParser
+from collections import OrderedDict
+from datetime import datetime
+from hashlib import sha1
+from io import BytesIO
+import os
+from threading import Event, Lock
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn, UnixStreamServer
+    from urllib.parse import parse_qs, urlparse
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn, UnixStreamServer
+    from urlparse import parse_qs, urlparse
+
+# LOCAL IMPORTS
+from colours import parse_colour
+from headless import HeadlessRenderer
+from interfaces import get_interface_names
+
+
+# NUMBER OF RENDERERS, ONE PER INTERFACE, SIZE AND COLOUR, KEPT BETWEEN
+# REQUESTS.
+_MAX_RENDERERS = 32
+
+# LARGEST FRAME WHICH CAN BE REQUESTED, IN PIXELS ALONG EITHER SIDE.
+_MAX_SIZE = 4096
+
+_CONTENT_TYPES = {"png": "image/png", "raw": "application/octet-stream"}
+
+
+class _PendingRender(object):
+    """
+    Render which is in progress, which other requests for the same frame
+    wait on.
+    """
+
+    def __init__(self):
+        """
+        Instantiate an instance of _PendingRender.
+        """
+        self.done = Event()
+        self.value = None
+        self.error = None
+
+
+class FrameCache(object):
+    """
+    Least recently used cache of rendered frames, bounded by the number
+    of bytes it holds.
+
+    Only one render of a key happens at a time; anyone asking for a key
+    which is being rendered waits for that render rather than starting
+    another.
+    """
+
+    def __init__(self, max_bytes):
+        """
+        Instantiate an instance of FrameCache.
+
+        @type max_bytes: int
+        @param max_bytes: Most bytes of frames to hold. The least
+            recently used frames are evicted to stay within it.
+        """
+        self._max_bytes = max_bytes
+        self._size = 0
+        self._frames = OrderedDict()
+        self._pending = {}
+        self._lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, render_func):
+        """
+        Return the frame for a key, rendering it if it is not cached.
+
+        @type key: tuple
+        @param key: Key of the frame.
+
+        @type render_func: callable
+        @param render_func: Function returning the frame as a tuple
+            whose first item is the data, called if the frame needs
+            rendering.
+
+        @rtype: tuple
+        @return: Frame as returned by render_func.
+        """
+        with self._lock:
+            value = self._frames.get(key)
+            if value is not None:
+                # move the frame to the most recently used end.
+                del self._frames[key]
+                self._frames[key] = value
+                self.hits += 1
+                return value
+
+            pending = self._pending.get(key)
+            rendering = pending is None
+            if rendering:
+                pending = self._pending[key] = _PendingRender()
+                self.misses += 1
+
+        if not rendering:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+
+        try:
+            pending.value = render_func()
+        except Exception as error:
+            pending.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._pending[key]
+                if pending.error is None:
+                    self._add(key=key, value=pending.value)
+            pending.done.set()
+
+        return pending.value
+
+    def _add(self, key, value):
+        """
+        Add a frame to the cache, evicting the least recently used
+        frames to make room for it. Must be called with the lock held.
+
+        @type key: tuple
+        @param key: Key of the frame.
+
+        @type value: tuple
+        @param value: Frame, whose first item is the data.
+        """
+        size = len(value[0])
+        if size > self._max_bytes:
+            return
+
+        self._frames[key] = value
+        self._size += size
+
+        while self._size > self._max_bytes:
+            _, evicted = self._frames.popitem(last=False)
+            self._size -= len(evicted[0])
+            self.evictions += 1
+
+
+class FrameServer(object):
+    """
+    Class used to render and cache the frames served.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        """
+        Instantiate an instance of FrameServer.
+
+        @type max_bytes: int
+        @param max_bytes: Most bytes of rendered frames to cache.
+            DEFAULT: 64MB
+        """
+        self.cache = FrameCache(max_bytes=max_bytes)
+
+        # renderers and the locks used to render with each of them from
+        # one thread at a time.
+        self._renderers = OrderedDict()
+        self._renderers_lock = Lock()
+
+    def get_frame(self, interface, width=None, height=None,
+                  led_colour="red", time=None, frame_format="png"):
+        """
+        Return a frame, rendering it only if nothing which looks the
+        same has already been rendered.
+
+        @type interface: str
+        @param interface: Interface to render.
+
+        @type width: int
+        @param width: Width of the frame.
+            DEFAULT: Default width of the interface.
+
+        @type height: int
+        @param height: Height of the frame.
+            DEFAULT: Default height of the interface.
+
+        @type led_colour: str
+        @param led_colour: Colour of the LEDs.
+            DEFAULT: red
+
+        @type time: datetime.datetime
+        @param time: Time to display.
+            DEFAULT: now
+
+        @type frame_format: str
+        @param frame_format: Either 'png' or 'raw'.
+            DEFAULT: png
+
+        @rtype: (bytes, tuple, (int, int, int))
+        @return: Frame data, the key it is cached under and the width,
+            height and stride of the frame.
+
+        @raise ValueError: If the colour can not be parsed.
+        """
+        # keyed on the colour itself, so that the names and hex values
+        # of one colour share their renders.
+        colour = parse_colour(spec=led_colour)
+
+        renderer, lock = self._get_renderer(interface=interface,
+                                            width=width, height=height,
+                                            led_colour=led_colour,
+                                            colour=colour)
+        time = time or datetime.now()
+
+        key = (interface, renderer.width, renderer.height, colour,
+               frame_format, renderer.get_visible_state(time))
+
+        def render():
+            with lock:
+                if frame_format == "raw":
+                    data = bytes(renderer.render_to_buffer(time=time))
+                else:
+                    fobj = BytesIO()
+                    renderer.render_to_png(time=time, fobj=fobj)
+                    data = fobj.getvalue()
+
+                return data, (renderer.width, renderer.height,
+                              renderer.stride)
+
+        data, size = self.cache.get(key=key, render_func=render)
+
+        return data, key, size
+
+    def _get_renderer(self, interface, width, height, led_colour, colour):
+        """
+        Return the renderer for an interface, size and colour, creating
+        it if needed.
+
+        @type colour: (float, float, float)
+        @param colour: Colour of the LEDs as parsed from led_colour,
+            which the renderer is looked up by.
+
+        @rtype: (HeadlessRenderer, threading.Lock)
+        """
+        renderer_key = (interface, width, height, colour)
+
+        with self._renderers_lock:
+            value = self._renderers.pop(renderer_key, None)
+            if value is None:
+                value = (HeadlessRenderer(interface=interface, width=width,
+                                          height=height,
+                                          led_colour=led_colour), Lock())
+
+            self._renderers[renderer_key] = value
+            if len(self._renderers) > _MAX_RENDERERS:
+                self._renderers.popitem(last=False)
+
+        return value
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """
+    Handler for requests made to the frame server.
+    """
+
+    def do_GET(self):
+        """
+        Handle a GET request.
+        """
+        url = urlparse(self.path)
+        if url.path != "/render":
+            self.send_error(404)
+            return
+
+        try:
+            kwargs = _parse_query(query=parse_qs(url.query))
+            data, key, (width, height, stride) = \
+                self.server.frame_server.get_frame(**kwargs)
+        except ValueError as error:
+            self.send_error(400, str(error))
+            return
+
+        etag = '"%s"' % sha1(repr(key).encode("utf-8")).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type",
+                         _CONTENT_TYPES[kwargs["frame_format"]])
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", etag)
+        self.send_header("X-Width", str(width))
+        self.send_header("X-Height", str(height))
+        self.send_header("X-Stride", str(stride))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self):
+        """
+        Return the address of the client, which is empty for clients
+        connected to a Unix socket.
+
+        @rtype: str
+        """
+        return self.client_address[0] if self.client_address else "unix"
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    """
+    HTTP server handling each request in its own thread.
+    """
+
+    daemon_threads = True
+
+
+class _ThreadingUnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    """
+    HTTP server on a Unix socket, handling each request in its own
+    thread.
+    """
+
+    daemon_threads = True
+
+
+def _parse_query(query):
+    """
+    Parse the query parameters of a render request.
+
+    @type query: dict[str, [str]]
+    @param query: Query parameters, as returned by parse_qs.
+
+    @rtype: dict[str, object]
+    @return: Keyword arguments for FrameServer.get_frame.
+
+    @raise ValueError: If a parameter is not valid.
+    """
+    def get(name, default=None):
+        return query.get(name, [default])[0]
+
+    interface = get("interface", "analogue")
+    if interface not in get_interface_names():
+        raise ValueError("unknown interface: %s" % interface)
+
+    frame_format = get("format", "png")
+    if frame_format not in _CONTENT_TYPES:
+        raise ValueError("unknown format: %s" % frame_format)
+
+    sizes = []
+    for name in ("width", "height"):
+        value = get(name)
+        if value is not None:
+            value = int(value)
+            if not 0 < value <= _MAX_SIZE:
+                raise ValueError("%s must be from 1 to %d" % (name,
+                                                              _MAX_SIZE))
+        sizes.append(value)
+
+    time = get("time")
+    if time is not None:
+        try:
+            seconds = float(time)
+        except ValueError:
+            time = datetime.strptime(time, "%Y-%m-%dT%H:%M:%S")
+        else:
+            try:
+                time = datetime.fromtimestamp(seconds)
+            except (OverflowError, OSError, ValueError):
+                raise ValueError("time out of range: %s" % time)
+
+    return {"interface": interface,
+            "width": sizes[0],
+            "height": sizes[1],
+            "led_colour": get("colour", "red"),
+            "time": time,
+            "frame_format": frame_format}
+
+
+def create_server(frame_server, port=None, host="127.0.0.1", socket=None):
+    """
+    Create an HTTP server serving frames, either on a TCP port or a Unix
+    socket.
+
+    @type frame_server: FrameServer
+    @param frame_server: Renders and caches the frames served.
+
+    @type port: int
+    @param port: TCP port to listen on.
+
+    @type host: str
+    @param host: Address to listen on.
+        DEFAULT: 127.0.0.1
+
+    @type socket: str
+    @param socket: Path of a Unix socket to listen on instead of a TCP
+        port. Any existing file at the path is replaced.
+
+    @rtype: SocketServer.BaseServer
+    """
+    if socket:
+        if os.path.exists(socket):
+            os.remove(socket)
+        server = _ThreadingUnixHTTPServer(socket, _RequestHandler)
+    else:
+        server = _ThreadingHTTPServer((host, port), _RequestHandler)
+
+    server.frame_server = frame_server
+
+    return server
+
+
+def _parse_arguments():
+    """
+    Parse the command line arguments.
+
+    @rtype: dict[str, str]
+    @return: Dictionary containing key/value pairs.
+    """
+    description = "Serve renders of the clock interfaces over HTTP."
+    parser = ArgumentParser(description=description)
+
+    parser.add_argument("-p", "--port", default=8080, type=int)
+
+    parser.add_argument("--host", default="127.0.0.1")
+
+    parser.add_argument("-u", "--socket", default=None,
+                        help="Listen on a Unix socket instead of a port.")
+
+    parser.add_argument("-m", "--cache-mb", default=64, type=int,
+                        help="Megabytes of rendered frames to cache.")
+
+    _args = parser.parse_args()
+
+    return {'port': _args.port,
+            'host': _args.host,
+            'socket': _args.socket,
+            'cache_mb': _args.cache_mb}
+
+
+if __name__ == "__main__":
+    args = _parse_arguments()
+
+    server = create_server(
+        frame_server=FrameServer(
+            max_bytes=args.get("cache_mb") * 1024 * 1024),
+        port=args.get("port"), host=args.get("host"),
+        socket=args.get("socket"))
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
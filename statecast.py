@@ -0,0 +1,605 @@
+#!/usr/bin/python
+
+"""
+Broadcast the state of a clock to thin clients over a Unix socket. The
+clients draw the clock themselves with the same interfaces, so only a
+few bytes are sent each tick rather than frames.
+
+    python pyclock.py -i digital --broadcast /tmp/pyclock.sock
+    python statecast.py /tmp/pyclock.sock
+
+Every message is a byte giving its type followed by a fixed size body,
+all little endian:
+
+    hello (type 0), sent first on every connection:
+        magic      4s  b"PYCS"
+        version    B
+    config (type 1), sent on connecting and whenever it changes:
+        interface  16s name of the interface, NUL padded
+        red        B
+        green      B   colour of the LEDs
+        blue       B
+        width      H
+        height     H   size the clock is laid out at
+        flags      B   bit 0 set whilst the seconds are shown
+    tick (type 2), sent on every tick:
+        year       H
+        month      B
+        day        B
+        hour       B
+        minute     B
+        second     B
+        microsecond I
+
+Clients which disconnect, or fall so far behind that a message can not
+be sent to them whole, are dropped. They are sent the config and the
+latest tick again when they reconnect.
+"""
+
+
+# STDLIB IMPORTS
+from argparse import ArgumentParser
+from collections import deque, namedtuple
+from datetime import datetime
+import errno
+import logging
+import os
+import socket
+import struct
+
+# THIRD PARTY IMPORTS
+from gobject import (IO_ERR, IO_HUP, IO_IN, io_add_watch, source_remove,
+                     timeout_add)
+
+# LOCAL IMPORTS
+from _TimeSource import TimeSource
+from interfaces import INTERFACES, load_window
+
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"PYCS"
+VERSION = 1
+
+_HELLO = 0
+_CONFIG = 1
+_TICK = 2
+
+# BODY OF EACH TYPE OF MESSAGE. WITH THE TYPE BYTE, A HELLO IS 6 BYTES,
+# A CONFIG 25 BYTES AND A TICK 12 BYTES.
+_BODIES = {_HELLO: struct.Struct("<4sB"),
+           _CONFIG: struct.Struct("<16sBBBHHB"),
+           _TICK: struct.Struct("<HBBBBBI")}
+
+# BIT OF THE CONFIG FLAGS SET WHILST THE SECONDS ARE SHOWN.
+_SHOW_SECONDS = 1
+
+# MILLISECONDS BETWEEN ATTEMPTS TO RECONNECT TO THE BROADCASTER.
+_RECONNECT_INTERVAL = 1000
+
+
+# STATE OF THE CLOCK, OTHER THAN THE TIME. led_colour IS A TUPLE OF THE
+# RED, GREEN AND BLUE COMPONENTS, BETWEEN 0 AND 1.
+Config = namedtuple("Config", ["interface", "led_colour", "width", "height",
+                               "show_seconds"])
+
+
+def _pack(message_type, *values):
+    """
+    Pack a message.
+
+    @type message_type: int
+    @param message_type: Type of the message.
+
+    @rtype: bytes
+    """
+    return struct.pack("<B", message_type) + \
+        _BODIES[message_type].pack(*values)
+
+
+def pack_config(config):
+    """
+    Pack a config message.
+
+    @type config: Config
+    @param config: State of the clock.
+
+    @rtype: bytes
+    """
+    red, green, blue = [int(round(component * 255))
+                        for component in config.led_colour]
+
+    return _pack(_CONFIG, config.interface.encode("ascii"), red, green,
+                 blue, config.width, config.height,
+                 _SHOW_SECONDS if config.show_seconds else 0)
+
+
+def pack_tick(time):
+    """
+    Pack a tick message.
+
+    @type time: datetime.datetime
+    @param time: Time displayed.
+
+    @rtype: bytes
+    """
+    return _pack(_TICK, time.year, time.month, time.day, time.hour,
+                 time.minute, time.second, time.microsecond)
+
+
+class MessageReader(object):
+    """
+    Class used to split the data received from a broadcaster in to
+    messages, however it was split up when it was received.
+    """
+
+    def __init__(self):
+        """
+        Instantiate an instance of MessageReader.
+        """
+        self._buffer = b""
+        self._greeted = False
+
+    def feed(self, data):
+        """
+        Add data received from the broadcaster, returning any messages
+        which are now complete.
+
+        @type data: bytes
+        @param data: Data received.
+
+        @rtype: [Config or datetime.datetime]
+        @return: The config of each config message and the time of each
+            tick, in the order they were received.
+
+        @raise ValueError: If the data is not from a broadcaster.
+        """
+        self._buffer += data
+        messages = []
+
+        offset = 0
+        while offset < len(self._buffer):
+            message_type = struct.unpack_from("<B", self._buffer, offset)[0]
+            body = _BODIES.get(message_type)
+            if body is None:
+                raise ValueError("unknown message type: %d" % message_type)
+
+            if (message_type == _HELLO) == self._greeted:
+                raise ValueError("connection not started with a hello")
+
+            if offset + 1 + body.size > len(self._buffer):
+                break
+
+            values = body.unpack_from(self._buffer, offset + 1)
+            offset += 1 + body.size
+
+            if message_type == _HELLO:
+                if values != (MAGIC, VERSION):
+                    raise ValueError("not a state broadcast")
+                self._greeted = True
+            elif message_type == _CONFIG:
+                messages.append(Config(
+                    interface=values[0].rstrip(b"\0").decode("ascii"),
+                    led_colour=tuple(value / 255.0 for value in values[1:4]),
+                    width=values[4], height=values[5],
+                    show_seconds=bool(values[6] & _SHOW_SECONDS)))
+            else:
+                messages.append(datetime(*values))
+
+        self._buffer = self._buffer[offset:]
+
+        return messages
+
+
+class StateBroadcaster(object):
+    """
+    Class used to broadcast the state of a clock to every client
+    connected to a Unix socket.
+
+    The socket is never blocked on; clients are accepted by
+    accept_clients, which should be called whenever the socket is
+    readable, and are sent each message straight away or dropped.
+    """
+
+    def __init__(self, path, interface):
+        """
+        Instantiate an instance of StateBroadcaster, listening on a Unix
+        socket. Any existing file at the path is replaced.
+
+        @type path: str
+        @param path: Path of the socket.
+
+        @type interface: str
+        @param interface: Name of the interface broadcast.
+        """
+        if os.path.exists(path):
+            os.remove(path)
+
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.bind(path)
+        self._socket.listen(socket.SOMAXCONN)
+        self._socket.setblocking(False)
+
+        self._interface = interface
+        self._clients = []
+
+        # the latest config and tick sent, which new clients are sent
+        # to bring them up to date.
+        self._config = None
+        self._tick = None
+
+    def fileno(self):
+        """
+        Return the file descriptor of the listening socket.
+
+        @rtype: int
+        """
+        return self._socket.fileno()
+
+    def get_client_count(self):
+        """
+        Return the number of connected clients.
+
+        @rtype: int
+        """
+        return len(self._clients)
+
+    def accept_clients(self):
+        """
+        Accept every client waiting to connect, and bring each up to
+        date.
+        """
+        while True:
+            try:
+                client = self._socket.accept()[0]
+            except socket.error as error:
+                if error.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    return
+                raise
+
+            client.setblocking(False)
+            self._clients.append(client)
+
+            self._send(client=client, data=_pack(_HELLO, MAGIC, VERSION) +
+                       (self._config or b"") + (self._tick or b""))
+
+    def broadcast(self, face, time, width, height):
+        """
+        Send the time displayed by a face to every client, along with
+        its config if that has changed.
+
+        @type face: BaseFace
+        @param face: Face whose state is broadcast.
+
+        @type time: datetime.datetime
+        @param time: Time displayed.
+
+        @type width: int
+        @param width: Width the face is laid out at.
+
+        @type height: int
+        @param height: Height the face is laid out at.
+        """
+        self.accept_clients()
+
+        data = b""
+
+        config = pack_config(Config(interface=self._interface,
+                                    led_colour=face.get_led_colour(),
+                                    width=width, height=height,
+                                    show_seconds=face.is_seconds_visible()))
+        if config != self._config:
+            self._config = config
+            data += config
+
+        self._tick = pack_tick(time=time)
+        data += self._tick
+
+        # iterate over a copy, as clients which can not keep up are
+        # dropped.
+        for client in list(self._clients):
+            self._send(client=client, data=data)
+
+    def close(self):
+        """
+        Disconnect every client and stop listening.
+        """
+        for client in self._clients:
+            client.close()
+
+        self._clients = []
+        self._socket.close()
+
+    def _send(self, client, data):
+        """
+        Send data to a client, dropping the client if it can not be sent
+        whole without blocking.
+
+        @type client: socket.socket
+        @param client: Client to send to.
+
+        @type data: bytes
+        @param data: Data to send.
+        """
+        try:
+            sent = client.send(data)
+        except socket.error:
+            sent = 0
+
+        if sent != len(data):
+            self._clients.remove(client)
+            client.close()
+
+
+class _RemoteScheduler(object):
+    """
+    Scheduler which ticks a clock whenever a tick is received from the
+    broadcaster. Has the same interface as TickScheduler, so that the
+    two can be swapped.
+    """
+
+    def __init__(self, source, callback, history=60):
+        """
+        Instantiate an instance of _RemoteScheduler.
+
+        @type source: RemoteTimeSource
+        @param source: Source receiving the ticks.
+
+        @type callback: callable
+        @param callback: Function called on every tick. If it returns
+            False the scheduler is stopped.
+
+        @type history: int
+        @param history: Kept for compatibility with TickScheduler.
+            DEFAULT: 60
+        """
+        self._source = source
+        self._callback = callback
+
+        # ticks are never late, as they are run as they are received.
+        self.lateness = deque(maxlen=history)
+        self.missed_ticks = 0
+
+    def start(self):
+        """
+        Start the scheduler.
+        """
+        if not self.is_running():
+            self._source._subscribers.append(self._callback)
+
+    def stop(self):
+        """
+        Stop the scheduler.
+        """
+        if self.is_running():
+            self._source._subscribers.remove(self._callback)
+
+    def is_running(self):
+        """
+        Return whether the scheduler has been started.
+
+        @rtype: bool
+        """
+        return self._callback in self._source._subscribers
+
+
+class RemoteTimeSource(TimeSource):
+    """
+    Time source returning the time received from a broadcaster, which
+    ticks the clock as each tick is received.
+
+    The source keeps trying to reconnect to the broadcaster whilst it is
+    not connected. Until the first tick is received the local time is
+    returned; after that the last time received is, so a clock which has
+    lost its broadcaster stops.
+    """
+
+    def __init__(self, path, config_callback=None):
+        """
+        Instantiate an instance of RemoteTimeSource.
+
+        @type path: str
+        @param path: Path of the broadcaster's socket.
+
+        @type config_callback: callable
+        @param config_callback: Function called with the Config whenever
+            one is received.
+            DEFAULT: None
+        """
+        self._path = path
+        self._config_callback = config_callback
+
+        self._socket = None
+        self._reader = None
+        self._watch_id = None
+        self._time = None
+
+        # callbacks of the schedulers which are running.
+        self._subscribers = []
+
+        # latest config received.
+        self.config = None
+
+    def connect(self):
+        """
+        Connect to the broadcaster, retrying until it succeeds.
+
+        @rtype: bool
+        @return: Always False, so that it can be used as a timer which
+            fires once.
+        """
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            client.connect(self._path)
+        except socket.error as error:
+            client.close()
+            _LOGGER.debug("can not connect to %s: %s", self._path, error)
+            timeout_add(_RECONNECT_INTERVAL, self.connect)
+            return False
+
+        client.setblocking(False)
+        self._socket = client
+        self._reader = MessageReader()
+        self._watch_id = io_add_watch(client.fileno(),
+                                      IO_IN | IO_HUP | IO_ERR, self._receive)
+
+        return False
+
+    def disconnect(self):
+        """
+        Disconnect from the broadcaster, without reconnecting.
+        """
+        if self._watch_id is not None:
+            source_remove(self._watch_id)
+            self._watch_id = None
+
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def now(self):
+        """
+        Return the latest time received.
+
+        @rtype: datetime.datetime
+        """
+        return self._time or datetime.now()
+
+    def create_scheduler(self, callback):
+        """
+        Return a scheduler which ticks the clock as each tick is
+        received.
+
+        @type callback: callable
+        @param callback: Function called on every tick.
+
+        @rtype: _RemoteScheduler
+        """
+        return _RemoteScheduler(source=self, callback=callback)
+
+    def _receive(self, fileno, condition):
+        """
+        Called by the main loop when data can be read from the
+        broadcaster, or the connection has been lost.
+
+        @rtype: bool
+        @return: False to remove the watch once the connection has been
+            lost.
+        """
+        try:
+            data = self._socket.recv(4096)
+            messages = self._reader.feed(data)
+        except (socket.error, ValueError) as error:
+            _LOGGER.warning("lost %s: %s", self._path, error)
+            data = None
+
+        if not data:
+            self._watch_id = None
+            self.disconnect()
+            timeout_add(_RECONNECT_INTERVAL, self.connect)
+            return False
+
+        ticked = False
+        for message in messages:
+            if isinstance(message, Config):
+                self.config = message
+                if self._config_callback is not None:
+                    self._config_callback(message)
+            else:
+                self._time = message
+                ticked = True
+
+        # however many ticks were received, the clocks are only brought
+        # up to date once.
+        if ticked:
+            for callback in list(self._subscribers):
+                if callback() is False:
+                    self._subscribers.remove(callback)
+
+        return True
+
+
+class _Viewer(object):
+    """
+    Class used to display the clock received from a broadcaster, in a
+    window of the interface it is configured with.
+    """
+
+    def __init__(self, path):
+        """
+        Instantiate an instance of _Viewer.
+
+        @type path: str
+        @param path: Path of the broadcaster's socket.
+        """
+        self._source = RemoteTimeSource(path=path,
+                                        config_callback=self._configure)
+        self._windows = {}
+        self._clock = None
+
+    def start(self):
+        """
+        Start connecting to the broadcaster.
+        """
+        self._source.connect()
+
+    def _configure(self, config):
+        """
+        Called with each config received. Shows a window of the
+        configured interface, creating it the first time it is needed.
+
+        @type config: Config
+        @param config: Config received.
+        """
+        if config.interface not in INTERFACES:
+            _LOGGER.warning("unknown interface: %s", config.interface)
+            return
+
+        clock = self._windows.get(config.interface)
+        if clock is None:
+            clock = load_window(name=config.interface)()
+            clock.resize(width=config.width, height=config.height)
+            clock.set_time_source(time_source=self._source)
+            self._windows[config.interface] = clock
+
+        red, green, blue = config.led_colour
+        clock.set_led_colour(red=red, green=green, blue=blue)
+        if clock.is_seconds_visible() != config.show_seconds:
+            clock.set_seconds_visible(visible=config.show_seconds)
+
+        if clock is not self._clock:
+            if self._clock is not None:
+                self._clock.hide()
+            clock.show_all()
+            self._clock = clock
+
+
+def _parse_arguments():
+    """
+    Parse the command line arguments.
+
+    @rtype: dict[str, str]
+    @return: Dictionary containing key/value pairs.
+    """
+    description = "Display a clock broadcast by another PyClock."
+    parser = ArgumentParser(description=description)
+
+    parser.add_argument("socket",
+                        help="Path of the socket the clock is broadcast on.")
+
+    _args = parser.parse_args()
+
+    return {'socket': _args.socket}
+
+
+if __name__ == "__main__":
+    from gtk import main
+
+    args = _parse_arguments()
+
+    _Viewer(path=args.get("socket")).start()
+
+    try:
+        main()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,325 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Display the digital and binary clocks as text in a terminal.
+
+After the first frame only the character cells which have changed are
+written, using the shortest cursor movements available, so the clock
+stays cheap to display over slow connections and does not flicker.
+"""
+
+
+# STDLIB IMPORTS
+from argparse import ArgumentParser
+from datetime import datetime
+import signal
+import sys
+from time import sleep, time
+
+# LOCAL IMPORTS
+from colours import parse_colour
+from glyphs import get_row_values, NUM_LEDS, SEGMENTS
+
+
+# CONTROL SEQUENCES.
+_CLEAR_SCREEN = u"\x1b[H\x1b[2J"
+_HIDE_CURSOR = u"\x1b[?25l"
+_SHOW_CURSOR = u"\x1b[?25h"
+_RESET_COLOUR = u"\x1b[0m"
+
+# CHARACTERS USED FOR A CELL WHICH IS ON OR OFF.
+_DIGITAL_CELLS = (u" ", u"█")
+_BINARY_CELLS = (u"○", u"●")
+
+# SIZE OF EACH SEVEN SEGMENT DIGIT, IN CHARACTER CELLS.
+_DIGIT_WIDTH = 5
+_DIGIT_HEIGHT = 5
+
+# CELLS, AS (ROW, COLUMN), COVERED BY EACH SEGMENT IN THE ORDER OF THEIR
+# BITS WITHIN SEGMENTS. SEGMENTS WHICH MEET SHARE THE CELL AT THE CORNER.
+_SEGMENT_CELLS = (
+    [(0, column) for column in range(5)],  # a
+    [(row, 4) for row in range(3)],        # b
+    [(row, 4) for row in range(2, 5)],     # c
+    [(4, column) for column in range(5)],  # d
+    [(row, 0) for row in range(2, 5)],     # e
+    [(row, 0) for row in range(3)],        # f
+    [(2, column) for column in range(5)])  # g
+
+
+def _get_digit_cells(number):
+    """
+    Return the rows of cells of a seven segment digit.
+
+    @type number: int
+    @param number: Number to display on the seven segment.
+
+    @rtype: [unicode]
+    """
+    cells = [[0] * _DIGIT_WIDTH for _ in range(_DIGIT_HEIGHT)]
+
+    for bit, segment_cells in enumerate(_SEGMENT_CELLS):
+        if SEGMENTS[number] >> bit & 1:
+            for row, column in segment_cells:
+                cells[row][column] = 1
+
+    return [u"".join(_DIGITAL_CELLS[cell] for cell in row) for row in cells]
+
+
+# ROWS OF CELLS FOR EACH NUMBER, AND FOR THE DOTS BETWEEN EACH PAIR OF
+# DIGITS.
+_DIGIT_GLYPHS = tuple(_get_digit_cells(number=number)
+                      for number in range(len(SEGMENTS)))
+_DOTS_GLYPH = (u"   ", u" █ ", u"   ", u" █ ", u"   ")
+
+
+class TerminalRenderer(object):
+    """
+    Class used to render the digital or binary clock as text, producing
+    the control sequences to update a terminal from one frame to the
+    next.
+    """
+
+    def __init__(self, interface, led_colour="red", show_seconds=True):
+        """
+        Instantiate an instance of TerminalRenderer.
+
+        @type interface: str
+        @param interface: Interface to render. Valid options: binary,
+            digital.
+
+        @type led_colour: str
+        @param led_colour: Colour of the LEDs, displayed using 24 bit
+            colour.
+            DEFAULT: red
+
+        @type show_seconds: bool
+        @param show_seconds: If True, show the seconds.
+            DEFAULT: True
+
+        @raise ValueError: If the interface can not be displayed in a
+            terminal.
+        """
+        if interface == "digital":
+            self._get_cells = self._get_digital_cells
+        elif interface == "binary":
+            self._get_cells = self._get_binary_cells
+        else:
+            raise ValueError("can not display %s in a terminal" % interface)
+
+        red, green, blue = parse_colour(spec=led_colour)
+        self._colour = u"\x1b[38;2;%d;%d;%dm" % (
+            round(red * 255), round(green * 255), round(blue * 255))
+
+        self.show_seconds = show_seconds
+
+        # rows of cells written by the previous render, None until the
+        # whole screen has been drawn.
+        self._previous = None
+
+    def reset(self):
+        """
+        Forget what has been written, so the next render redraws the
+        whole screen, e.g. after the terminal has been resized.
+        """
+        self._previous = None
+
+    def get_cells(self, time):
+        """
+        Return the rows of character cells displaying a time.
+
+        @type time: datetime.datetime
+        @param time: Time to display.
+
+        @rtype: [unicode]
+        """
+        return self._get_cells(time=time)
+
+    def render(self, time):
+        """
+        Return the text to write to the terminal to display a time.
+
+        The first render clears the screen and writes every cell, after
+        that only the cells which differ from the previous render are
+        written.
+
+        @type time: datetime.datetime
+        @param time: Time to display.
+
+        @rtype: unicode
+        """
+        current = self.get_cells(time=time)
+
+        if self._previous is None:
+            output = [_CLEAR_SCREEN, self._colour, u"\r\n".join(current)]
+        else:
+            output = [self._diff_row(row=row, previous=previous,
+                                     current=cells)
+                      for row, (previous, cells)
+                      in enumerate(zip(self._previous, current))]
+
+        self._previous = current
+
+        return u"".join(output)
+
+    def _get_digital_cells(self, time):
+        """
+        Return the rows of cells displaying a time as seven segment
+        digits, separated by dots.
+
+        @type time: datetime.datetime
+        @param time: Time to display.
+
+        @rtype: [unicode]
+        """
+        values = [time.hour, time.minute]
+        if self.show_seconds:
+            values.append(time.second)
+
+        glyphs = []
+        for value in values:
+            if glyphs:
+                glyphs.append(_DOTS_GLYPH)
+
+            tens, units = divmod(value, 10)
+            glyphs.extend((_DIGIT_GLYPHS[tens], _DIGIT_GLYPHS[units]))
+
+        return [u" ".join(glyph[row] for glyph in glyphs)
+                for row in range(_DIGIT_HEIGHT)]
+
+    def _get_binary_cells(self, time):
+        """
+        Return the rows of cells displaying the year, month, day, hour,
+        minute and second as rows of LEDs.
+
+        @type time: datetime.datetime
+        @param time: Time to display.
+
+        @rtype: [unicode]
+        """
+        values = get_row_values(time)
+        if not self.show_seconds:
+            values = values[:-1]
+
+        return [u" ".join(_BINARY_CELLS[value >> (NUM_LEDS - 1 - led_pos) & 1]
+                          for led_pos in range(NUM_LEDS))
+                for value in values]
+
+    @staticmethod
+    def _diff_row(row, previous, current):
+        """
+        Return the text to update one row of cells.
+
+        Each run of changed cells is written after moving the cursor to
+        it. Between two runs on the same row the cursor is either moved
+        forwards or the unchanged cells are written again, whichever
+        takes fewer bytes.
+
+        @type row: int
+        @param row: Index of the row.
+
+        @type previous: unicode
+        @param previous: Cells of the row as previously written.
+
+        @type current: unicode
+        @param current: Cells of the row to write.
+
+        @rtype: unicode
+        """
+        output = []
+        # column the cursor is at, None until it has been moved on to
+        # this row.
+        cursor = None
+
+        for column, (old, new) in enumerate(zip(previous, current)):
+            if old == new:
+                continue
+
+            if cursor is None:
+                output.append(u"\x1b[%d;%dH" % (row + 1, column + 1))
+            elif cursor < column:
+                skipped = current[cursor:column]
+                move = u"\x1b[%dC" % (column - cursor)
+                if len(skipped.encode("utf-8")) < len(move):
+                    output.append(skipped)
+                else:
+                    output.append(move)
+
+            output.append(new)
+            cursor = column + 1
+
+        return u"".join(output)
+
+
+def _write(text):
+    """
+    Write text to the terminal straight away.
+
+    @type text: unicode
+    @param text: Text to write.
+    """
+    fobj = getattr(sys.stdout, "buffer", sys.stdout)
+    fobj.write(text.encode("utf-8"))
+    fobj.flush()
+
+
+def run(renderer):
+    """
+    Display the clock in the terminal until interrupted, updating it on
+    every second boundary, or every minute boundary if the seconds are
+    hidden.
+
+    @type renderer: TerminalRenderer
+    @param renderer: Renderer of the clock to display.
+    """
+    interval = 1 if renderer.show_seconds else 60
+
+    # the whole screen is redrawn when the terminal is resized, as it
+    # may have been cleared or reflowed.
+    if hasattr(signal, "SIGWINCH"):
+        signal.signal(signal.SIGWINCH, lambda *_: renderer.reset())
+
+    _write(_HIDE_CURSOR)
+    try:
+        while True:
+            _write(renderer.render(time=datetime.now()))
+            sleep(interval - time() % interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        _write(_RESET_COLOUR + _SHOW_CURSOR + u"\r\n")
+
+
+def _parse_arguments():
+    """
+    Parse the command line arguments.
+
+    @rtype: dict[str, str]
+    @return: Dictionary containing key/value pairs.
+    """
+    description = "Display a clock interface in the terminal."
+    parser = ArgumentParser(description=description)
+
+    parser.add_argument("-i", "--interface", choices=["binary", "digital"],
+                        default='digital')
+
+    parser.add_argument("-l", "--led-colour", default='red', type=str)
+
+    parser.add_argument("--low-power", action="store_true",
+                        help="Hide the seconds and only update the clock "
+                             "once a minute.")
+
+    _args = parser.parse_args()
+
+    return {'interface': _args.interface,
+            'led_colour': _args.led_colour,
+            'low_power': _args.low_power}
+
+
+if __name__ == "__main__":
+    args = _parse_arguments()
+
+    run(renderer=TerminalRenderer(interface=args.get("interface"),
+                                  led_colour=args.get("led_colour"),
+                                  show_seconds=not args.get("low_power")))
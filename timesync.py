@@ -0,0 +1,469 @@
+#!/usr/bin/python
+
+"""
+Keep the time displayed by a clock in step with an SNTP server, however
+far the clock of the local machine has drifted.
+
+A background thread queries the server periodically, working out how
+far the local clock is from the server and the round trip delay of each
+query. The offset of the query with the smallest delay among the most
+recent ones is used, as it is the one least affected by the network.
+
+    python timesync.py pool.ntp.org
+    python timesync.py --serve 12300 --offset 2.5
+
+The first queries a server and prints the offset and delay. The second
+serves the local time plus an offset, as a stand-in server for testing.
+"""
+
+
+# STDLIB IMPORTS
+from argparse import ArgumentParser
+from collections import deque
+from datetime import timedelta
+import logging
+import socket
+import struct
+import sys
+from threading import Event, Lock, Thread
+from time import time
+
+# LOCAL IMPORTS
+from _TimeSource import SystemTimeSource, TimeSource
+
+
+_LOGGER = logging.getLogger(__name__)
+
+# SECONDS BETWEEN 1900, THE NTP EPOCH, AND 1970.
+_NTP_EPOCH_OFFSET = 2208988800
+
+# LEAP INDICATOR 0, VERSION 3 AND THE MODE OF THE CLIENT AND SERVER.
+_CLIENT_MODE = 3
+_SERVER_MODE = 4
+_VERSION = 3
+
+# FIRST BYTE, STRATUM, POLL, PRECISION, ROOT DELAY, ROOT DISPERSION,
+# REFERENCE ID AND THE REFERENCE, ORIGINATE, RECEIVE AND TRANSMIT
+# TIMESTAMPS, EACH AS SECONDS AND A FRACTION.
+_PACKET = struct.Struct("!BBbbIII8I")
+
+# SECONDS BEFORE RETRYING A FAILED QUERY, DOUBLED FOR EACH FURTHER
+# FAILURE UP TO THE INTERVAL BETWEEN QUERIES.
+_RETRY_INTERVAL = 4
+
+
+def _to_ntp(timestamp):
+    """
+    Convert seconds since the epoch in to an NTP timestamp.
+
+    @type timestamp: float
+    @param timestamp: Seconds since the epoch.
+
+    @rtype: (int, int)
+    @return: Seconds since 1900 and the fraction of a second, in units
+        of 1 / 2 ** 32.
+    """
+    seconds = timestamp + _NTP_EPOCH_OFFSET
+    whole = int(seconds)
+
+    return whole, int((seconds - whole) * 2 ** 32) & 0xFFFFFFFF
+
+
+def _from_ntp(seconds, fraction):
+    """
+    Convert an NTP timestamp in to seconds since the epoch.
+
+    @type seconds: int
+    @param seconds: Seconds since 1900.
+
+    @type fraction: int
+    @param fraction: Fraction of a second, in units of 1 / 2 ** 32.
+
+    @rtype: float
+    """
+    return seconds - _NTP_EPOCH_OFFSET + float(fraction) / 2 ** 32
+
+
+def query(server, port=123, timeout=1.0):
+    """
+    Query an SNTP server for how far the local clock is from it.
+
+    @type server: str
+    @param server: Host name or address of the server.
+
+    @type port: int
+    @param port: Port of the server.
+        DEFAULT: 123
+
+    @type timeout: float
+    @param timeout: Seconds to wait for a reply.
+        DEFAULT: 1.0
+
+    @rtype: (float, float)
+    @return: Seconds to add to the local clock to get the server's time,
+        and the round trip delay of the query in seconds.
+
+    @raise IOError: If the server can not be reached, or its reply is not
+        valid.
+    """
+    address = socket.getaddrinfo(server, port, 0, socket.SOCK_DGRAM)[0]
+    sock = socket.socket(address[0], socket.SOCK_DGRAM)
+    sock.settimeout(timeout)
+
+    try:
+        originate = _to_ntp(time())
+        sock.sendto(_PACKET.pack(_VERSION << 3 | _CLIENT_MODE, 0, 0, 0, 0, 0,
+                                 0, 0, 0, 0, 0, 0, 0, *originate),
+                    address[4])
+
+        while True:
+            data, sender = sock.recvfrom(1024)
+            received = time()
+            # ignore anything which is not a reply to this query.
+            if sender[:2] == address[4][:2] and len(data) >= _PACKET.size:
+                break
+    except socket.timeout:
+        raise IOError("no reply from %s" % server)
+    finally:
+        sock.close()
+
+    fields = _PACKET.unpack_from(data)
+    mode = fields[0] & 0x7
+    stratum = fields[1]
+
+    if mode != _SERVER_MODE or fields[9:11] != originate:
+        raise IOError("invalid reply from %s" % server)
+
+    # a stratum of 0 is a 'kiss of death'; the server is telling the
+    # client to go away.
+    if stratum == 0 or not any(fields[13:15]):
+        raise IOError("%s is not synchronised" % server)
+
+    sent = _from_ntp(*originate)
+    server_received = _from_ntp(*fields[11:13])
+    server_sent = _from_ntp(*fields[13:15])
+
+    offset = ((server_received - sent) + (server_sent - received)) / 2
+    delay = (received - sent) - (server_sent - server_received)
+
+    return offset, delay
+
+
+def parse_server(spec):
+    """
+    Parse the address of an SNTP server.
+
+    @type spec: str
+    @param spec: HOST[:PORT].
+
+    @rtype: (str, int)
+    @return: Host and port, 123 if not given.
+
+    @raise ValueError: If the port is not a number.
+    """
+    host, _, port = spec.partition(":")
+
+    return host, int(port or 123)
+
+
+class TimeSynchroniser(object):
+    """
+    Class used to keep track of how far the local clock is from an SNTP
+    server, by querying it from a background thread.
+
+    Nothing which reads the offset ever waits on the network; it is only
+    updated once each query has completed.
+    """
+
+    def __init__(self, server, port=123, interval=64, samples=8,
+                 timeout=1.0):
+        """
+        Instantiate an instance of TimeSynchroniser.
+
+        @type server: str
+        @param server: Host name or address of the server.
+
+        @type port: int
+        @param port: Port of the server.
+            DEFAULT: 123
+
+        @type interval: float
+        @param interval: Seconds between each query.
+            DEFAULT: 64
+
+        @type samples: int
+        @param samples: Number of the most recent queries the offset is
+            chosen from.
+            DEFAULT: 8
+
+        @type timeout: float
+        @param timeout: Seconds to wait for each reply.
+            DEFAULT: 1.0
+        """
+        self._server = server
+        self._port = port
+        self._interval = interval
+        self._timeout = timeout
+
+        # (offset, delay) of the most recent successful queries.
+        self._samples = deque(maxlen=samples)
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread = None
+
+        self._offset = 0.0
+        self._delay = None
+        self._last_sync = None
+        self._failures = 0
+
+    def start(self):
+        """
+        Start querying the server in the background.
+        """
+        if self._thread is None:
+            # each thread has its own event, so a thread which is still
+            # finishing a query when stopped can never be restarted by
+            # a later start.
+            self._stop = Event()
+            self._thread = Thread(target=self._run, args=(self._stop,),
+                                  name="TimeSynchroniser")
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self):
+        """
+        Stop querying the server, waiting for a query in progress to
+        finish. The offset last worked out is kept.
+        """
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join(self._timeout + 1)
+            self._thread = None
+
+    def get_offset(self):
+        """
+        Return how far the local clock is from the server.
+
+        @rtype: float
+        @return: Seconds to add to the local clock to get the server's
+            time, or 0 until the server has replied.
+        """
+        return self._offset
+
+    def get_status(self):
+        """
+        Return the health of the synchronisation.
+
+        @rtype: dict[str, object]
+        @return: Dictionary of:
+            server       - address of the server.
+            synchronised - whether the server has replied within the
+                           last few intervals.
+            offset       - seconds added to the local clock.
+            delay        - round trip delay of the query the offset is
+                           from, or None.
+            last_sync    - time of the last successful query, as seconds
+                           since the epoch, or None.
+            failures     - number of queries which have failed in a row.
+            samples      - number of queries the offset is chosen from.
+        """
+        with self._lock:
+            last_sync = self._last_sync
+            synchronised = (last_sync is not None and
+                            time() - last_sync < 4 * self._interval)
+
+            return {"server": "%s:%d" % (self._server, self._port),
+                    "synchronised": synchronised,
+                    "offset": self._offset,
+                    "delay": self._delay,
+                    "last_sync": last_sync,
+                    "failures": self._failures,
+                    "samples": len(self._samples)}
+
+    def sync(self):
+        """
+        Query the server once, updating the offset if it replies.
+
+        @rtype: bool
+        @return: Whether the server replied.
+        """
+        try:
+            sample = query(server=self._server, port=self._port,
+                           timeout=self._timeout)
+        except (IOError, socket.error) as error:
+            with self._lock:
+                self._failures += 1
+                failures = self._failures
+
+            # only the first of a run of failures is logged.
+            if failures == 1:
+                _LOGGER.warning("time sync with %s failed: %s",
+                                self._server, error)
+            return False
+
+        with self._lock:
+            if self._failures:
+                _LOGGER.info("time sync with %s recovered", self._server)
+
+            self._samples.append(sample)
+            self._offset, self._delay = min(self._samples,
+                                            key=lambda item: item[1])
+            self._last_sync = time()
+            self._failures = 0
+
+        return True
+
+    def _run(self, stop):
+        """
+        Query the server until stopped, retrying failed queries sooner
+        than the interval.
+
+        @type stop: threading.Event
+        @param stop: Event set to stop the thread.
+        """
+        while not stop.is_set():
+            if self.sync():
+                wait = self._interval
+            else:
+                wait = min(self._interval,
+                           _RETRY_INTERVAL * 2 ** (self._failures - 1))
+
+            stop.wait(wait)
+
+
+class SyncedTimeSource(TimeSource):
+    """
+    Time source correcting the time of another source by the offset of
+    the local clock from an SNTP server.
+    """
+
+    def __init__(self, synchroniser, source=None):
+        """
+        Instantiate an instance of SyncedTimeSource.
+
+        @type synchroniser: TimeSynchroniser
+        @param synchroniser: Keeps track of the offset of the local
+            clock.
+
+        @type source: _TimeSource.TimeSource
+        @param source: Source whose time is corrected, which must be
+            based on the local clock.
+            DEFAULT: The system time.
+        """
+        self._synchroniser = synchroniser
+        self._source = source or SystemTimeSource()
+
+    def now(self):
+        """
+        Return the corrected time.
+
+        @rtype: datetime.datetime
+        """
+        time = self._source.now()
+        if time is None:
+            return None
+
+        return time + timedelta(seconds=self._synchroniser.get_offset())
+
+    def get_offset(self):
+        """
+        Return how far the time is ahead of the local clock.
+
+        @rtype: float
+        """
+        return self._synchroniser.get_offset()
+
+    def get_sync_status(self):
+        """
+        Return the health of the synchronisation.
+
+        @rtype: dict[str, object]
+        @return: Dictionary as returned by TimeSynchroniser.get_status.
+        """
+        return self._synchroniser.get_status()
+
+    def follows_wall_clock(self):
+        """
+        Return whether the time moves on with the wall clock, as the
+        corrected source does.
+
+        @rtype: bool
+        """
+        return self._source.follows_wall_clock()
+
+
+def serve(port, offset=0.0, host="127.0.0.1"):
+    """
+    Answer SNTP queries with the local time plus an offset, forever. A
+    stand-in server for testing.
+
+    @type port: int
+    @param port: Port to listen on.
+
+    @type offset: float
+    @param offset: Seconds to add to the local time.
+        DEFAULT: 0.0
+
+    @type host: str
+    @param host: Address to listen on.
+        DEFAULT: 127.0.0.1
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((host, port))
+
+    while True:
+        data, client = sock.recvfrom(1024)
+        received = _to_ntp(time() + offset)
+        if len(data) < _PACKET.size:
+            continue
+
+        originate = _PACKET.unpack_from(data)[13:15]
+        sock.sendto(_PACKET.pack(
+            _VERSION << 3 | _SERVER_MODE, 1, 0, 0, 0, 0, 0, 0, 0,
+            originate[0], originate[1], received[0], received[1],
+            *_to_ntp(time() + offset)), client)
+
+
+def _parse_arguments():
+    """
+    Parse the command line arguments.
+
+    @rtype: dict[str, str]
+    @return: Dictionary containing key/value pairs.
+    """
+    description = ("Query an SNTP server, or serve the local time as a "
+                   "stand-in for one.")
+    parser = ArgumentParser(description=description)
+
+    parser.add_argument("server", nargs="?", default=None,
+                        help="SERVER[:PORT] to query.")
+
+    parser.add_argument("--serve", default=None, type=int, metavar="PORT",
+                        help="Serve the local time on a port.")
+
+    parser.add_argument("--offset", default=0.0, type=float,
+                        help="Seconds added to the time served.")
+
+    _args = parser.parse_args()
+
+    if not (_args.server or _args.serve):
+        parser.error("either a server or --serve is required")
+
+    return {'server': _args.server,
+            'serve': _args.serve,
+            'offset': _args.offset}
+
+
+if __name__ == "__main__":
+    args = _parse_arguments()
+
+    if args.get("serve"):
+        try:
+            serve(port=args.get("serve"), offset=args.get("offset"))
+        except KeyboardInterrupt:
+            pass
+    else:
+        host, port = parse_server(spec=args.get("server"))
+        offset, delay = query(server=host, port=port)
+        sys.stdout.write("offset %+.6f s, delay %.6f s\n" % (offset, delay))
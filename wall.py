@@ -0,0 +1,513 @@
+#!/usr/bin/python
+
+"""
+Video wall of clocks, spread across a pool of worker processes so that
+drawing them is shared between the cores of the machine.
+
+How long each interface takes to draw a frame is measured first, and
+the clocks are handed out so that every worker has roughly the same
+amount of drawing to do. Each worker is given the same epoch, which its
+clocks count their ticks from, so the clocks of every worker tick
+together however long each took to start. The supervisor restarts any
+worker which dies.
+
+    python pyclock.py --wall digital analogue@+9 binary@-5 --workers 2
+
+Run as a script, this is the entry point of a worker, which displays
+the clocks it is given.
+"""
+
+
+# STDLIB IMPORTS
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+import heapq
+import logging
+from math import ceil
+from multiprocessing import cpu_count
+import os
+import subprocess
+import sys
+from time import sleep, time
+
+# LOCAL IMPORTS
+from interfaces import format_tile, INTERFACES, load_window, parse_tile
+
+
+_LOGGER = logging.getLogger(__name__)
+
+# NUMBER OF FRAMES DRAWN OF EACH INTERFACE TO MEASURE ITS COST.
+_SAMPLE_FRAMES = 20
+
+# SECONDS BETWEEN EACH CHECK ON THE WORKERS.
+_POLL_INTERVAL = 1.0
+
+# SECONDS BEFORE RESTARTING A WORKER WHICH DIED, DOUBLED FOR EACH
+# FURTHER DEATH UP TO _MAX_RESTART_DELAY. A WORKER WHICH RAN FOR AT
+# LEAST _STABLE_TIME IS RESTARTED AFTER _RESTART_DELAY AGAIN.
+_RESTART_DELAY = 1.0
+_MAX_RESTART_DELAY = 60.0
+_STABLE_TIME = 60.0
+
+# SCRIPT RUN BY EACH WORKER.
+_WORKER_SCRIPT = os.path.abspath(__file__).replace(".pyc", ".py")
+
+
+def measure_costs(tiles, led_colour, frames=_SAMPLE_FRAMES):
+    """
+    Measure how long each interface of a list of clocks takes to draw a
+    frame.
+
+    @type tiles: [(str, datetime.timedelta)]
+    @param tiles: Interface and offset from UTC of each clock, as
+        returned by interfaces.parse_tile.
+
+    @type led_colour: str
+    @param led_colour: Colour of the LEDs.
+
+    @type frames: int
+    @param frames: Number of frames to draw of each interface.
+        DEFAULT: 20
+
+    @rtype: dict[str, float]
+    @return: Mean milliseconds taken to draw a frame, by interface, or
+        an empty dictionary if any of them could not be drawn, so that
+        the clocks are shared out by number alone.
+    """
+    # only imported when measuring, as it needs cairo.
+    from benchmark import benchmark
+
+    # start just before midnight so every field changes.
+    start = datetime(2000, 12, 31, 23, 59, 50)
+    step = timedelta(seconds=86400.0 / frames)
+    times = [start + step * index for index in range(frames)]
+
+    costs = {}
+    for interface, _ in tiles:
+        if interface in costs:
+            continue
+
+        # the wall is still worth showing if a face can not be drawn
+        # headlessly, e.g. a colour name without pango.
+        try:
+            result = benchmark(interface=interface, width=None, height=None,
+                               led_colour=led_colour, times=times)
+        except Exception as error:
+            _LOGGER.warning("could not measure %s, sharing the clocks out "
+                            "evenly: %s", interface, error)
+            return {}
+
+        costs[interface] = result["mean_ms"]
+
+    return costs
+
+
+def assign_clocks(tiles, costs, workers):
+    """
+    Share a list of clocks between workers, so that the total cost of
+    the clocks given to each is as even as possible. Each clock, most
+    costly first, goes to the worker with the least to draw so far.
+
+    @type tiles: [(str, datetime.timedelta)]
+    @param tiles: Interface and offset from UTC of each clock.
+
+    @type costs: dict[str, float]
+    @param costs: Cost of drawing each interface, as returned by
+        measure_costs.
+
+    @type workers: int
+    @param workers: Number of workers.
+
+    @rtype: [[(str, datetime.timedelta)]]
+    @return: Clocks of each worker, in the order they were given. There
+        are never more workers than clocks.
+    """
+    workers = max(1, min(workers, len(tiles)))
+    assignments = [[] for _ in range(workers)]
+
+    # heap of (total cost, worker index) of every worker.
+    loads = [(0.0, index) for index in range(workers)]
+
+    order = sorted(range(len(tiles)),
+                   key=lambda index: -costs.get(tiles[index][0], 0.0))
+    for index in order:
+        load, worker = heapq.heappop(loads)
+        assignments[worker].append(index)
+        heapq.heappush(loads,
+                       (load + costs.get(tiles[index][0], 0.0), worker))
+
+    return [[tiles[index] for index in sorted(indexes)]
+            for indexes in assignments]
+
+
+class WallSupervisor(object):
+    """
+    Class used to run a worker process for each share of the clocks of
+    a video wall, restarting any which die.
+
+    A worker which exits cleanly, i.e. because all of its windows were
+    closed, is not restarted.
+    """
+
+    def __init__(self, assignments, led_colour="red", dashboard=False,
+                 columns=None, epoch=None):
+        """
+        Instantiate an instance of WallSupervisor.
+
+        @type assignments: [[(str, datetime.timedelta)]]
+        @param assignments: Clocks of each worker, as returned by
+            assign_clocks.
+
+        @type led_colour: str
+        @param led_colour: Colour of the LEDs.
+            DEFAULT: red
+
+        @type dashboard: bool
+        @param dashboard: If True, each worker shows its clocks as the
+            tiles of a dashboard rather than in a window each.
+            DEFAULT: False
+
+        @type columns: int
+        @param columns: Number of columns in each dashboard.
+            DEFAULT: Enough to make the grid roughly square.
+
+        @type epoch: float
+        @param epoch: Time, as seconds since the epoch, the workers
+            count their ticks from.
+            DEFAULT: The start of the second the wall is started in.
+        """
+        self._assignments = assignments
+        self._led_colour = led_colour
+        self._dashboard = dashboard
+        self._columns = columns
+        self._cpus = cpu_count()
+
+        self.epoch = epoch
+        self._processes = [None] * len(assignments)
+        self._started = [None] * len(assignments)
+        self._restart_at = [None] * len(assignments)
+        self._restart_delay = [_RESTART_DELAY] * len(assignments)
+
+        # number of times each worker has been restarted.
+        self.restarts = [0] * len(assignments)
+
+    def start(self):
+        """
+        Start every worker.
+        """
+        if self.epoch is None:
+            self.epoch = float(ceil(time()))
+
+        for index in range(len(self._assignments)):
+            self._spawn(index=index)
+
+    def poll(self):
+        """
+        Check on the workers, restarting any which died once their
+        restart delay has passed.
+
+        @rtype: int
+        @return: Number of workers which are running, or waiting to be
+            restarted.
+        """
+        now = time()
+        alive = 0
+
+        for index, process in enumerate(self._processes):
+            if self._restart_at[index] is not None:
+                if now >= self._restart_at[index]:
+                    self.restarts[index] += 1
+                    self._spawn(index=index)
+                alive += 1
+                continue
+
+            if process is None:
+                continue
+
+            code = process.poll()
+            if code is None:
+                alive += 1
+            elif code == 0:
+                _LOGGER.info("worker %d exited", index)
+                self._processes[index] = None
+            else:
+                alive += 1
+                self._schedule_restart(index=index, code=code, now=now)
+
+        return alive
+
+    def run(self):
+        """
+        Start the workers and supervise them until they have all exited
+        or the supervisor is interrupted, then stop them.
+        """
+        self.start()
+
+        try:
+            while self.poll():
+                sleep(_POLL_INTERVAL)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        """
+        Stop every worker, waiting for them to exit.
+        """
+        for process in self._processes:
+            if process is not None and process.poll() is None:
+                process.terminate()
+
+        for process in self._processes:
+            if process is not None:
+                process.wait()
+
+        self._restart_at = [None] * len(self._assignments)
+
+    def get_command(self, index):
+        """
+        Return the command line which starts a worker.
+
+        @type index: int
+        @param index: Index of the worker.
+
+        @rtype: [str]
+        """
+        command = [sys.executable, _WORKER_SCRIPT,
+                   "--epoch", repr(self.epoch),
+                   "--led-colour", self._led_colour,
+                   "--cpu", str(index % self._cpus)]
+
+        if self._dashboard:
+            command.append("--dashboard")
+            if self._columns:
+                command.extend(["--columns", str(self._columns)])
+
+        command.extend(format_tile(interface=interface, offset=offset)
+                       for interface, offset in self._assignments[index])
+
+        return command
+
+    def _spawn(self, index):
+        """
+        Start a worker.
+
+        @type index: int
+        @param index: Index of the worker.
+        """
+        self._processes[index] = subprocess.Popen(
+            self.get_command(index=index))
+        self._started[index] = time()
+        self._restart_at[index] = None
+
+        _LOGGER.info("worker %d started, pid %d: %s", index,
+                     self._processes[index].pid,
+                     " ".join(format_tile(*tile)
+                              for tile in self._assignments[index]))
+
+    def _schedule_restart(self, index, code, now):
+        """
+        Schedule a worker which died to be restarted.
+
+        @type index: int
+        @param index: Index of the worker.
+
+        @type code: int
+        @param code: Exit code of the worker, negative if it was killed
+            by a signal.
+
+        @type now: float
+        @param now: Current time, as seconds since the epoch.
+        """
+        if now - self._started[index] >= _STABLE_TIME:
+            self._restart_delay[index] = _RESTART_DELAY
+
+        delay = self._restart_delay[index]
+        self._restart_delay[index] = min(delay * 2, _MAX_RESTART_DELAY)
+        self._restart_at[index] = now + delay
+
+        _LOGGER.warning("worker %d died with code %d, restarting in %.1f s",
+                        index, code, delay)
+
+
+def run_wall(tiles, workers=None, led_colour="red", dashboard=False,
+             columns=None):
+    """
+    Display a video wall of clocks across a pool of workers, until
+    interrupted.
+
+    @type tiles: [(str, datetime.timedelta)]
+    @param tiles: Interface and offset from UTC of each clock, as
+        returned by interfaces.parse_tile.
+
+    @type workers: int
+    @param workers: Number of workers.
+        DEFAULT: The number of CPUs.
+
+    @type led_colour: str
+    @param led_colour: Colour of the LEDs.
+        DEFAULT: red
+
+    @type dashboard: bool
+    @param dashboard: If True, each worker shows its clocks as the
+        tiles of a dashboard rather than in a window each.
+        DEFAULT: False
+
+    @type columns: int
+    @param columns: Number of columns in each dashboard.
+        DEFAULT: Enough to make the grid roughly square.
+    """
+    costs = measure_costs(tiles=tiles, led_colour=led_colour)
+    for interface in sorted(costs):
+        _LOGGER.info("%s draws in %.3f ms", interface, costs[interface])
+
+    assignments = assign_clocks(tiles=tiles, costs=costs,
+                                workers=workers or cpu_count())
+
+    WallSupervisor(assignments=assignments, led_colour=led_colour,
+                   dashboard=dashboard, columns=columns).run()
+
+
+def run_worker(tiles, epoch, led_colour="red", dashboard=False,
+               columns=None, cpu=None):
+    """
+    Display the clocks of a worker until all of its windows are closed.
+
+    @type tiles: [(str, datetime.timedelta)]
+    @param tiles: Interface and offset from UTC of each clock.
+
+    @type epoch: float
+    @param epoch: Time, as seconds since the epoch, the clocks count
+        their ticks from.
+
+    @type led_colour: str
+    @param led_colour: Colour of the LEDs.
+        DEFAULT: red
+
+    @type dashboard: bool
+    @param dashboard: If True, show the clocks as the tiles of a
+        dashboard rather than in a window each.
+        DEFAULT: False
+
+    @type columns: int
+    @param columns: Number of columns in the dashboard.
+        DEFAULT: Enough to make the grid roughly square.
+
+    @type cpu: int
+    @param cpu: CPU to run the worker on, where the platform supports
+        it.
+        DEFAULT: Any
+    """
+    if cpu is not None and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, [cpu])
+        except OSError as error:
+            _LOGGER.warning("could not run on CPU %d: %s", cpu, error)
+
+    from gtk import main, main_quit
+
+    from _TimeSource import OffsetTimeSource
+
+    windows = []
+
+    if dashboard:
+        from dashboard import DashboardPyClock
+
+        clock = DashboardPyClock(tiles=tiles, led_colour=led_colour,
+                                 columns=columns)
+        clock.set_tick_epoch(epoch=epoch)
+        windows.append(clock)
+    else:
+        for interface, offset in tiles:
+            window_class = load_window(name=interface)
+            if INTERFACES[interface].leds:
+                clock = window_class(led_colour=led_colour)
+            else:
+                clock = window_class()
+
+            clock.set_tick_epoch(epoch=epoch)
+            if offset is not None:
+                clock.set_time_source(
+                    time_source=OffsetTimeSource(offset=offset))
+            windows.append(clock)
+
+    # closing a window quits the main loop, which would end the worker
+    # with the rest of its clocks; it is only quit once the last one has
+    # been closed.
+    for window in windows:
+        window.disconnect_by_func(main_quit)
+        window.connect("destroy", _window_closed, windows)
+
+    try:
+        main()
+    except KeyboardInterrupt:
+        pass
+
+
+def _window_closed(window, windows):
+    """
+    Called when a window of a worker is closed, to quit the main loop
+    once the last of them has been.
+
+    @type window: _BasePyClock.BasePyClock
+    @param window: Window which has been closed.
+
+    @type windows: [_BasePyClock.BasePyClock]
+    @param windows: Windows of the worker which are still open.
+    """
+    from gtk import main_quit
+
+    windows.remove(window)
+
+    if not windows:
+        main_quit()
+
+
+def _parse_arguments():
+    """
+    Parse the command line arguments.
+
+    @rtype: dict[str, object]
+    @return: Dictionary containing key/value pairs.
+    """
+    description = ("Display a share of the clocks of a video wall. Started "
+                   "by pyclock.py --wall.")
+    parser = ArgumentParser(description=description)
+
+    parser.add_argument("tiles", nargs="+", type=parse_tile,
+                        metavar="INTERFACE[@OFFSET]")
+
+    parser.add_argument("--epoch", required=True, type=float,
+                        help="Time, as seconds since the epoch, the "
+                             "clocks count their ticks from.")
+
+    parser.add_argument("-l", "--led-colour", default="red")
+
+    parser.add_argument("--dashboard", action="store_true",
+                        help="Show the clocks as the tiles of a "
+                             "dashboard.")
+
+    parser.add_argument("-c", "--columns", default=None, type=int,
+                        help="Number of columns in the dashboard.")
+
+    parser.add_argument("--cpu", default=None, type=int,
+                        help="CPU to run on.")
+
+    _args = parser.parse_args()
+
+    return {'tiles': _args.tiles,
+            'epoch': _args.epoch,
+            'led_colour': _args.led_colour,
+            'dashboard': _args.dashboard,
+            'columns': _args.columns,
+            'cpu': _args.cpu}
+
+
+if __name__ == "__main__":
+    args = _parse_arguments()
+
+    run_worker(tiles=args.get("tiles"), epoch=args.get("epoch"),
+               led_colour=args.get("led_colour"),
+               dashboard=args.get("dashboard"),
+               columns=args.get("columns"), cpu=args.get("cpu"))